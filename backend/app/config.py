@@ -3,13 +3,40 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     jellyfin_url: str = "http://localhost:8096"
+    jellyfin_api_key: str = ""  # used by background jobs before admin session tokens
+    jellyfin_service_user_id: str = ""  # user the API key acts for; defaults to the first admin
+    jellyfin_token_check_interval: int = 600
+    jellyfin_measure_payloads: bool = False  # log and collect Jellyfin response sizes per call site
+    jellyfin_max_connections: int = 32  # pooled connections to Jellyfin, shared by all requests
     tmdb_api_key: str = ""
     tmdb_base_url: str = "https://api.themoviedb.org/3"
+    openlibrary_base_url: str = "https://openlibrary.org"
     secret_key: str = "change-me"
     database_url: str = "sqlite:///./mediamanager.db"
     cors_origins: str = "http://localhost:5173"
     ngrok_authtoken: str = ""
     ngrok_domain: str = ""
+    tunnel_enabled: bool = True
+    health_check_interval: int = 30
+    tmdb_rate_limit: float = 20.0
+    tmdb_rate_burst: int = 20
+    tmdb_max_connections: int = 16  # pooled connections to TMDB, shared by all requests
+    openlibrary_rate_limit: float = 3.0
+    openlibrary_rate_burst: int = 5
+    rate_limit_backend: str = "memory"  # "memory" or "sqlite" (shared across workers)
+    rate_limit_search_per_minute: int = 30
+    rate_limit_suggest_per_minute: int = 120
+    rate_limit_requests_per_minute: int = 10
+    library_cache_ttl: int = 60
+    library_catalog_path: str = ""  # defaults to library_catalog.bin next to the database
+    library_catalog_max_age: int = 900  # 0 disables the catalog
+    library_catalog_episodes: bool = True  # also index per-season episode counts of every series
+    bulk_import_max_titles: int = 500
+    bulk_import_concurrency: int = 8  # TMDB lookups in flight per import
+    db_group_commit_ms: float = 2.0  # how long the writer waits to batch more writes into a commit
+    db_writer_max_batch: int = 64
+    history_retention_days: int = 180  # 0 disables archival
+    history_archive_interval: int = 86400
 
     @property
     def cors_origin_list(self) -> list[str]:
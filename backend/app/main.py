@@ -1,101 +1,263 @@
 import asyncio
+import importlib
 import logging
 from contextlib import asynccontextmanager
+from functools import partial
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from app.startup import startup_profiler
 
-from app.config import settings
-from app.database import init_db, get_db_connection
-from app.routers import auth, tmdb, requests, jellyfin, admin, backlog, tunnel, books
-from app.services.jellyfin_client import jellyfin_client
-from app.services.request_service import get_open_requests, auto_fulfill_request
+with startup_profiler.phase("import:framework"):
+    import httpx
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+
+with startup_profiler.phase("import:core"):
+    from app.config import settings
+    from app.database import init_db, get_db_connection
+    from app.middleware import RateLimitMiddleware
+    from app.services.circuit_breaker import CircuitOpenError
+
+# Service modules build their upstream clients, breakers and limiters on import
+with startup_profiler.phase("clients"):
+    from app.services.db_writer import db_writer
+    from app.services.health_monitor import health_monitor
+    from app.services.jellyfin_client import MATCH_FIELDS, jellyfin_client
+    from app.services.jellyfin_credentials import credential_manager
+    from app.services.library_catalog import library_catalog
+    from app.services.prefetch import prefetch_warmer
+    from app.services.request_history import run_archiver
+    from app.services.request_service import get_open_titles, auto_fulfill_titles
+    from app.services.suggest_index import suggest_index
+    from app.services.title_matching import tmdb_match_fields
+    from app.services.tv_availability import library_status, season_availability
+    from app.services.tmdb_client import tmdb_client
+    from app.services import tmdb_metadata
+    from app.services.rate_limiter import PRIORITY_BACKGROUND
 
 logger = logging.getLogger(__name__)
 
 LIBRARY_CHECK_INTERVAL = 300  # 5 minutes
+# From this many open titles on, one streamed pass over the library is cheaper
+# than a search per title
+FULL_SCAN_MIN_TITLES = 50
+# TMDB detail lookups in flight when checking titles against their TMDB details
+MATCH_CONCURRENCY = 8
+
+
+def _jellyfin_type(media_type: str) -> str:
+    return "Movie" if media_type == "movie" else "Series"
+
+
+async def _search_title(credential, title: dict) -> list[dict]:
+    """Search the library for one title; returns ``[title]`` if it is there."""
+    data = await jellyfin_client.get_items(
+        user_id=credential.user_id,
+        token=credential.token,
+        include_item_types=_jellyfin_type(title["media_type"]),
+        search_term=title["title"],
+        limit=10,
+        fields=MATCH_FIELDS,
+        enable_images=False,
+        enable_user_data=False,
+        site="fulfillment",
+    )
+    for item in data.get("Items", []):
+        if str(item.get("ProviderIds", {}).get("Tmdb", "")) == str(title["tmdb_id"]):
+            return [title]
+    return []
+
+
+async def _match_with_details(title: dict, limit: asyncio.Semaphore) -> bool:
+    """Match a title using its TMDB details; shows must have every aired episode.
+
+    The details give the IMDb/TVDB ids, year and original title for library
+    items without a TMDB id, and the aired seasons a show is compared against.
+    Without details the title is left for the next pass.
+    """
+    loader = tmdb_metadata.get_movie_details if title["media_type"] == "movie" else tmdb_metadata.get_tv_details
+    try:
+        async with limit:
+            details = await loader(title["tmdb_id"], PRIORITY_BACKGROUND)
+    except (CircuitOpenError, httpx.HTTPError) as e:
+        logger.debug("No TMDB details to match %s %s: %s", title["media_type"], title["tmdb_id"], e)
+        return False
+    fields = tmdb_match_fields(details)
+    fields["title"] = fields["title"] or title["title"]
+    match = library_catalog.match(title["tmdb_id"], title["media_type"], **fields)
+    if match is None:
+        return False
+    if match.method != "tmdb":
+        logger.info(
+            "Matched %s %s to library item %s by %s (%.2f)",
+            title["media_type"], title["tmdb_id"], match.record.id, match.method, match.score,
+        )
+    if match.seasons is not None:
+        return library_status(season_availability(details, match.seasons)) == "available"
+    return True
+
+
+async def _check_catalog(credential, titles: list[dict]) -> list[dict]:
+    """Look titles up in the library catalog, rebuilding it first if it is stale.
+
+    Movies found by TMDB id are settled by the catalog alone. Shows (when
+    episodes are indexed) and, if the library has items Jellyfin could not
+    identify, titles not found by TMDB id are checked against their TMDB details.
+    """
+    await library_catalog.refresh(jellyfin_client, credential.user_id, credential.token)
+    found, check = [], []
+    for t in titles:
+        in_catalog = library_catalog.contains(t["tmdb_id"], t["media_type"])
+        if in_catalog and not (t["media_type"] == "tv" and library_catalog.episodes_indexed):
+            found.append(t)
+        elif in_catalog or library_catalog.unidentified:
+            check.append(t)
+    if check:
+        limit = asyncio.Semaphore(MATCH_CONCURRENCY)
+        matched = await asyncio.gather(*(_match_with_details(t, limit) for t in check))
+        found += [t for t, ok in zip(check, matched) if ok]
+    return found
+
+
+async def _scan_library(credential, titles: list[dict]) -> list[dict]:
+    """Stream the whole library once; returns the titles found in it."""
+    wanted = {(t["tmdb_id"], _jellyfin_type(t["media_type"])): t for t in titles}
+    found = []
+    async for item in jellyfin_client.iter_items(
+        credential.user_id, credential.token, site="fulfillment.scan"
+    ):
+        title = wanted.pop((item.tmdb_id, item.type), None)
+        if title is not None:
+            found.append(title)
+    return found
+
+
+async def fulfill_open_requests(conn) -> int:
+    """One auto-fulfill pass: mark open requests found in Jellyfin as fulfilled.
+
+    Runs as the credential picked by ``credential_manager``; a 401 rotates to the
+    next valid credential and retries the lookup. The outcome is recorded for
+    ``GET /api/admin/jobs/fulfillment``. Each requested title is looked up once
+    (in the library catalog, or by search or a single library scan when the
+    catalog is disabled) and fulfils all of its open requests. Returns the number
+    of requests fulfilled.
+    """
+    open_titles = [t for t in get_open_titles(conn) if t["media_type"] != "book"]
+    if not open_titles:
+        credential_manager.record_run(0, 0, 0, "ok")
+        return 0
+
+    try:
+        credential = await credential_manager.acquire(conn)
+    except CircuitOpenError:
+        credential_manager.record_run(0, 0, 0, "skipped", "Jellyfin circuit open")
+        return 0
+    except Exception as e:
+        logger.warning("Could not validate Jellyfin credentials: %s", e)
+        credential_manager.record_run(0, 0, 0, "error", f"Credential check failed: {e}")
+        return 0
+    if credential is None:
+        logger.warning("No valid Jellyfin credential available for auto-fulfill check")
+        credential_manager.record_run(0, 0, 0, "no_credentials", "No valid admin token or API key")
+        return 0
+
+    if library_catalog.enabled:
+        lookups = [(open_titles, partial(_check_catalog, titles=open_titles))]
+    elif len(open_titles) >= FULL_SCAN_MIN_TITLES:
+        lookups = [(open_titles, partial(_scan_library, titles=open_titles))]
+    else:
+        lookups = [([t], partial(_search_title, title=t)) for t in open_titles]
+
+    fulfilled = checked = auth_failures = 0
+    status, detail = "ok", None
+
+    for group, lookup in lookups:
+        try:
+            try:
+                found = await lookup(credential)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 401:
+                    raise
+                # Rotate to the next valid credential and retry this lookup once
+                auth_failures += 1
+                credential = await credential_manager.rotate(conn, credential)
+                if credential is None:
+                    status, detail = "no_credentials", "All Jellyfin credentials rejected"
+                    break
+                found = await lookup(credential)
+            checked += len(group)
+
+            if found:
+                # One write on the DB writer for everything this lookup found
+                count = await db_writer.run(auto_fulfill_titles, [t["id"] for t in found])
+                logger.info(
+                    "Auto-fulfilled %d request(s) for %s - found in library",
+                    count, ", ".join(t["title"] for t in found[:5]) + ("..." if len(found) > 5 else ""),
+                )
+                fulfilled += count
+        except CircuitOpenError:
+            logger.info("Jellyfin circuit open, skipping auto-fulfill cycle")
+            status, detail = "skipped", "Jellyfin circuit open"
+            break
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                # The replacement credential was rejected too; try again next cycle
+                auth_failures += 1
+                credential_manager.mark_invalid(credential)
+                status, detail = "auth_error", "Jellyfin rejected the rotated credential"
+                break
+            continue
+        except Exception:
+            logger.debug("Error checking %d title(s) against the library", len(group), exc_info=True)
+            continue
+
+    if status == "ok" and auth_failures:
+        status = "degraded"
+    credential_manager.record_run(checked, fulfilled, auth_failures, status, detail)
+    return fulfilled
 
 
 async def check_library_for_fulfilled_requests():
     """Background task that checks if any open requests are now in the Jellyfin library."""
-    import httpx
-
     while True:
         await asyncio.sleep(LIBRARY_CHECK_INTERVAL)
         try:
             conn = get_db_connection()
-            open_requests = get_open_requests(conn)
-            if not open_requests:
-                conn.close()
-                continue
-
-            # Get a valid Jellyfin token from the most recently active admin
-            admin_row = conn.execute(
-                "SELECT user_id, jellyfin_token FROM user_roles WHERE role = 'admin' AND jellyfin_token IS NOT NULL AND jellyfin_token != '' LIMIT 1"
-            ).fetchone()
-
-            if not admin_row or not admin_row["jellyfin_token"]:
-                logger.debug("No admin Jellyfin token available for auto-fulfill check")
+            try:
+                await fulfill_open_requests(conn)
+            finally:
                 conn.close()
-                continue
-
-            admin_token = admin_row["jellyfin_token"]
-            admin_user_id = admin_row["user_id"]
-
-            for req in open_requests:
-                if req["media_type"] == "book":
-                    continue
-                try:
-                    item_type = "Movie" if req["media_type"] == "movie" else "Series"
-                    async with httpx.AsyncClient() as client:
-                        resp = await client.get(
-                            f"{jellyfin_client.base_url}/Users/{admin_user_id}/Items",
-                            params={
-                                "SearchTerm": req["title"],
-                                "IncludeItemTypes": item_type,
-                                "Recursive": "true",
-                                "Limit": 10,
-                                "Fields": "ProviderIds",
-                            },
-                            headers={
-                                "Authorization": jellyfin_client._auth_header(admin_token),
-                            },
-                        )
-                        if resp.status_code == 401:
-                            logger.warning("Admin Jellyfin token expired for auto-fulfill")
-                            break
-                        if resp.status_code != 200:
-                            continue
-                        data = resp.json()
-
-                    for item in data.get("Items", []):
-                        provider_ids = item.get("ProviderIds", {})
-                        if str(provider_ids.get("Tmdb", "")) == str(req["tmdb_id"]):
-                            logger.info(
-                                "Auto-fulfilling request #%d (%s) - found in library",
-                                req["id"], req["title"],
-                            )
-                            auto_fulfill_request(conn, req["id"])
-                            break
-                except Exception:
-                    logger.debug("Error checking request #%d", req["id"], exc_info=True)
-                    continue
-
-            conn.close()
         except Exception:
             logger.exception("Error in library check background task")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    with startup_profiler.phase("db:init"):
+        init_db()
+    with startup_profiler.phase("db:warm"):
+        conn = get_db_connection()
+        prefetch_warmer.schedule_open_requests(conn)
+        suggest_index.load_requests(conn)
+        conn.close()
+        library_catalog.load()
+    await db_writer.start()
     task = asyncio.create_task(check_library_for_fulfilled_requests())
+    health_task = asyncio.create_task(health_monitor.run())
+    archive_task = asyncio.create_task(run_archiver())
+    startup_profiler.finish()
     yield
     task.cancel()
+    health_task.cancel()
+    archive_task.cancel()
+    await db_writer.stop()
+    await jellyfin_client.aclose()
+    await tmdb_client.aclose()
 
 
 app = FastAPI(title="Media Manager", version="1.0.0", lifespan=lifespan)
 
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origin_list,
@@ -104,14 +266,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-app.include_router(tmdb.router, prefix="/api/tmdb", tags=["tmdb"])
-app.include_router(requests.router, prefix="/api/requests", tags=["requests"])
-app.include_router(jellyfin.router, prefix="/api/library", tags=["library"])
-app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
-app.include_router(backlog.router, prefix="/api/backlog", tags=["backlog"])
-app.include_router(tunnel.router, prefix="/api/admin/tunnel", tags=["tunnel"])
-app.include_router(books.router, prefix="/api/books", tags=["books"])
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"{exc.name} is temporarily unavailable"},
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))},
+    )
+
+
+# (module, prefix, tag, enabled); disabled routers are never imported
+ROUTERS = [
+    ("auth", "/api/auth", "auth", True),
+    ("tmdb", "/api/tmdb", "tmdb", True),
+    ("requests", "/api/requests", "requests", True),
+    ("jellyfin", "/api/library", "library", True),
+    ("admin", "/api/admin", "admin", True),
+    ("backlog", "/api/backlog", "backlog", True),
+    ("tunnel", "/api/admin/tunnel", "tunnel", settings.tunnel_enabled),
+    ("books", "/api/books", "books", True),
+]
+
+for module_name, prefix, tag, enabled in ROUTERS:
+    if not enabled:
+        continue
+    with startup_profiler.phase(f"import:routers.{module_name}"):
+        module = importlib.import_module(f"app.routers.{module_name}")
+    app.include_router(module.router, prefix=prefix, tags=[tag])
 
 
 @app.get("/api/health")
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import math
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+
+from app.config import settings
+from app.database import get_db_connection
+
+# (method, path) -> route class; each class has its own per-user budget.
+ROUTE_CLASSES = {
+    ("GET", "/api/tmdb/search"): "search",
+    ("GET", "/api/books/search"): "search",
+    ("GET", "/api/tmdb/suggest"): "suggest",
+    ("POST", "/api/requests"): "requests",
+}
+
+WINDOW_SECONDS = 60
+
+
+def route_limits() -> dict[str, int]:
+    return {
+        "search": settings.rate_limit_search_per_minute,
+        "suggest": settings.rate_limit_suggest_per_minute,
+        "requests": settings.rate_limit_requests_per_minute,
+    }
+
+
+class MemoryWindowStore:
+    """Sliding-window counters kept in process memory (one worker)."""
+
+    def __init__(self):
+        self._windows: dict[str, tuple[int, int, int]] = {}
+
+    def _counts(self, key: str, window_start: int) -> tuple[int, int]:
+        start, current, previous = self._windows.get(key, (window_start, 0, 0))
+        if start == window_start:
+            return current, previous
+        if start == window_start - WINDOW_SECONDS:
+            return 0, current
+        return 0, 0
+
+    async def hit(self, key: str, window_start: int) -> tuple[int, int]:
+        """Count a call; returns (current window count including it, previous window count)."""
+        current, previous = self._counts(key, window_start)
+        self._windows[key] = (window_start, current + 1, previous)
+        if len(self._windows) > 10000:
+            self._evict(window_start)
+        return current + 1, previous
+
+    async def undo(self, key: str, window_start: int) -> None:
+        current, previous = self._counts(key, window_start)
+        self._windows[key] = (window_start, max(0, current - 1), previous)
+
+    def _evict(self, window_start: int) -> None:
+        cutoff = window_start - WINDOW_SECONDS
+        self._windows = {k: v for k, v in self._windows.items() if v[0] >= cutoff}
+
+
+class SQLiteWindowStore:
+    """Sliding-window counters in the shared database, for multi-worker deployments.
+
+    Each call is one ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``, so the
+    increment and the count it returns are atomic across workers. Statements run
+    on a dedicated connection and thread, so a locked database delays only the
+    limited request, not the event loop.
+    """
+
+    def __init__(self):
+        self._conn: sqlite3.Connection | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit")
+        self._last_cleanup = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = get_db_connection()
+        return self._conn
+
+    async def hit(self, key: str, window_start: int) -> tuple[int, int]:
+        """Count a call; returns (current window count including it, previous window count)."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._hit, key, window_start)
+
+    async def undo(self, key: str, window_start: int) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._undo, key, window_start)
+
+    def _hit(self, key: str, window_start: int) -> tuple[int, int]:
+        try:
+            current, previous = self.conn.execute(
+                """INSERT INTO rate_limit_counters (key, window_start, count) VALUES (?, ?, 1)
+                   ON CONFLICT (key, window_start) DO UPDATE SET count = count + 1
+                   RETURNING count, (SELECT p.count FROM rate_limit_counters p
+                                     WHERE p.key = ? AND p.window_start = ?)""",
+                (key, window_start, key, window_start - WINDOW_SECONDS),
+            ).fetchone()
+            if window_start != self._last_cleanup:
+                self.conn.execute(
+                    "DELETE FROM rate_limit_counters WHERE window_start < ?",
+                    (window_start - WINDOW_SECONDS,),
+                )
+                self._last_cleanup = window_start
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        return current, previous or 0
+
+    def _undo(self, key: str, window_start: int) -> None:
+        self.conn.execute(
+            "UPDATE rate_limit_counters SET count = count - 1 WHERE key = ? AND window_start = ? AND count > 0",
+            (key, window_start),
+        )
+        self.conn.commit()
+
+
+def _client_identity(scope: dict) -> str:
+    headers = dict(scope.get("headers") or [])
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    token = auth.removeprefix("Bearer ").strip()
+    if token:
+        try:
+            payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+            return f"user:{payload['user_id']}"
+        except (jwt.InvalidTokenError, KeyError):
+            pass
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Per-user, per-route-class rate limiting using sliding-window counters.
+
+    The estimate for the current window is ``previous * (1 - elapsed / window) +
+    current``. Responses on limited routes carry ``RateLimit-Limit``,
+    ``RateLimit-Remaining`` and ``RateLimit-Reset``; rejected calls get a 429 with
+    ``Retry-After`` and are taken back out of the count.
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        if store is None:
+            store = SQLiteWindowStore() if settings.rate_limit_backend == "sqlite" else MemoryWindowStore()
+        self.store = store
+
+    async def _check(self, key: str, limit: int) -> tuple[bool, int, int]:
+        now = time.time()
+        window_start = int(now // WINDOW_SECONDS) * WINDOW_SECONDS
+        elapsed = now - window_start
+        # Count first, then decide from the returned count: atomic across workers
+        current, previous = await self.store.hit(key, window_start)
+        estimate = previous * (1 - elapsed / WINDOW_SECONDS) + current
+        reset = math.ceil(WINDOW_SECONDS - elapsed)
+        if estimate > limit:
+            await self.store.undo(key, window_start)
+            return False, 0, reset
+        return True, max(0, int(limit - estimate)), reset
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        route_class = ROUTE_CLASSES.get((scope["method"], scope["path"].rstrip("/") or "/"))
+        limit = route_limits().get(route_class, 0) if route_class else 0
+        if limit <= 0:
+            return await self.app(scope, receive, send)
+
+        key = f"{_client_identity(scope)}:{route_class}"
+        allowed, remaining, reset = await self._check(key, limit)
+        rate_headers = [
+            (b"ratelimit-limit", str(limit).encode()),
+            (b"ratelimit-remaining", str(remaining).encode()),
+            (b"ratelimit-reset", str(reset).encode()),
+        ]
+
+        if not allowed:
+            body = json.dumps({"detail": "Too many requests, slow down"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(reset).encode()),
+                    *rate_headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + rate_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,72 @@
+"""Initial schema: requests, request history, backlog and user roles.
+
+Uses IF NOT EXISTS so databases created before versioned migrations adopt it
+without changes; 0002 brings their older table definitions up to date.
+"""
+import sqlite3
+
+from app.migrations import run_script
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    run_script(conn, """
+        CREATE TABLE IF NOT EXISTS requests (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id     TEXT NOT NULL,
+            username    TEXT NOT NULL,
+            tmdb_id     INTEGER NOT NULL,
+            media_type  TEXT NOT NULL CHECK(media_type IN ('movie', 'tv', 'book')),
+            title       TEXT NOT NULL,
+            poster_path TEXT,
+            status      TEXT NOT NULL DEFAULT 'pending'
+                            CHECK(status IN ('pending', 'approved', 'denied', 'fulfilled')),
+            admin_note  TEXT,
+            created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_requests_user_id ON requests(user_id);
+        CREATE INDEX IF NOT EXISTS idx_requests_status ON requests(status);
+        CREATE INDEX IF NOT EXISTS idx_requests_tmdb_id ON requests(tmdb_id);
+
+        CREATE TABLE IF NOT EXISTS request_history (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            request_id  INTEGER NOT NULL REFERENCES requests(id),
+            old_status  TEXT NOT NULL,
+            new_status  TEXT NOT NULL,
+            changed_by  TEXT NOT NULL,
+            note        TEXT,
+            created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS backlog (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id     TEXT NOT NULL,
+            username    TEXT NOT NULL,
+            type        TEXT NOT NULL DEFAULT 'bug'
+                            CHECK(type IN ('bug', 'feature')),
+            title       TEXT NOT NULL,
+            description TEXT,
+            status      TEXT NOT NULL DEFAULT 'reported'
+                            CHECK(status IN ('reported', 'triaged', 'in_progress', 'ready_for_test', 'resolved', 'wont_fix')),
+            priority    TEXT NOT NULL DEFAULT 'medium'
+                            CHECK(priority IN ('low', 'medium', 'high', 'critical')),
+            admin_note  TEXT,
+            created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_backlog_status ON backlog(status);
+        CREATE INDEX IF NOT EXISTS idx_backlog_type ON backlog(type);
+
+        CREATE TABLE IF NOT EXISTS user_roles (
+            user_id     TEXT PRIMARY KEY,
+            username    TEXT NOT NULL,
+            role        TEXT NOT NULL DEFAULT 'user'
+                            CHECK(role IN ('user', 'admin')),
+            granted_by  TEXT,
+            jellyfin_token TEXT,
+            created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
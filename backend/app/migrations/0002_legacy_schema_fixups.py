@@ -0,0 +1,92 @@
+"""Bring databases created before versioned migrations up to the 0001 schema.
+
+Replaces the startup probes init_db used to run on every boot: the
+jellyfin_token column, the 'ready_for_test' backlog status, the 'book' media
+type, and the request_history foreign key left pointing at requests_old by an
+earlier version of the books migration. On a fresh database nothing needs doing.
+"""
+import sqlite3
+
+from app.migrations import rebuild_table, table_sql
+
+REQUESTS_INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_requests_user_id ON requests(user_id);
+    CREATE INDEX IF NOT EXISTS idx_requests_status ON requests(status);
+    CREATE INDEX IF NOT EXISTS idx_requests_tmdb_id ON requests(tmdb_id);
+"""
+
+BACKLOG_INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_backlog_status ON backlog(status);
+    CREATE INDEX IF NOT EXISTS idx_backlog_type ON backlog(type);
+"""
+
+
+def _needs_rebuild(conn: sqlite3.Connection) -> dict[str, bool]:
+    return {
+        "backlog": "'ready_for_test'" not in (table_sql(conn, "backlog") or "'ready_for_test'"),
+        "requests": "'book'" not in (table_sql(conn, "requests") or "'book'"),
+        "request_history": "requests_old" in (table_sql(conn, "request_history") or ""),
+    }
+
+
+def rewrites(conn: sqlite3.Connection) -> list[str]:
+    return [table for table, needed in _needs_rebuild(conn).items() if needed]
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(user_roles)")}
+    if "jellyfin_token" not in columns:
+        conn.execute("ALTER TABLE user_roles ADD COLUMN jellyfin_token TEXT")
+
+    needed = _needs_rebuild(conn)
+
+    if needed["backlog"]:
+        rebuild_table(conn, "backlog", """
+            CREATE TABLE backlog_new (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id     TEXT NOT NULL,
+                username    TEXT NOT NULL,
+                type        TEXT NOT NULL DEFAULT 'bug'
+                                CHECK(type IN ('bug', 'feature')),
+                title       TEXT NOT NULL,
+                description TEXT,
+                status      TEXT NOT NULL DEFAULT 'reported'
+                                CHECK(status IN ('reported', 'triaged', 'in_progress', 'ready_for_test', 'resolved', 'wont_fix')),
+                priority    TEXT NOT NULL DEFAULT 'medium'
+                                CHECK(priority IN ('low', 'medium', 'high', 'critical')),
+                admin_note  TEXT,
+                created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """, BACKLOG_INDEXES)
+
+    if needed["requests"]:
+        rebuild_table(conn, "requests", """
+            CREATE TABLE requests_new (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id     TEXT NOT NULL,
+                username    TEXT NOT NULL,
+                tmdb_id     INTEGER NOT NULL,
+                media_type  TEXT NOT NULL CHECK(media_type IN ('movie', 'tv', 'book')),
+                title       TEXT NOT NULL,
+                poster_path TEXT,
+                status      TEXT NOT NULL DEFAULT 'pending'
+                                CHECK(status IN ('pending', 'approved', 'denied', 'fulfilled')),
+                admin_note  TEXT,
+                created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """, REQUESTS_INDEXES)
+
+    if needed["request_history"]:
+        rebuild_table(conn, "request_history", """
+            CREATE TABLE request_history_new (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                request_id  INTEGER NOT NULL REFERENCES requests(id),
+                old_status  TEXT NOT NULL,
+                new_status  TEXT NOT NULL,
+                changed_by  TEXT NOT NULL,
+                note        TEXT,
+                created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
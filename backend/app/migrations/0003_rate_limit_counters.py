@@ -0,0 +1,13 @@
+"""Sliding-window counters for the SQLite rate-limit backend."""
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rate_limit_counters (
+            key          TEXT NOT NULL,
+            window_start INTEGER NOT NULL,
+            count        INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (key, window_start)
+        )
+    """)
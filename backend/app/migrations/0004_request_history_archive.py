@@ -0,0 +1,33 @@
+"""Index request_history by request and add the compressed history archive.
+
+Archive chunks hold up to a few thousand history rows from one month, sorted by
+request_id and zlib-compressed; min/max_request_id let a per-request lookup
+decompress only the chunks that can contain it.
+"""
+import sqlite3
+
+from app.migrations import run_script
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    run_script(conn, """
+        CREATE INDEX IF NOT EXISTS idx_request_history_request
+            ON request_history(request_id, created_at);
+
+        CREATE TABLE IF NOT EXISTS request_history_archive (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            period          TEXT NOT NULL,
+            min_request_id  INTEGER NOT NULL,
+            max_request_id  INTEGER NOT NULL,
+            first_at        TIMESTAMP NOT NULL,
+            last_at         TIMESTAMP NOT NULL,
+            row_count       INTEGER NOT NULL,
+            payload         BLOB NOT NULL,
+            archived_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_history_archive_request_range
+            ON request_history_archive(max_request_id, min_request_id);
+        CREATE INDEX IF NOT EXISTS idx_history_archive_period
+            ON request_history_archive(period);
+    """)
@@ -0,0 +1,107 @@
+"""Per-user request counts maintained by triggers, for the admin users page.
+
+Backfilled once from requests; afterwards every insert, delete and status or
+owner change on requests adjusts the summary row in the same transaction.
+"""
+import sqlite3
+
+from app.migrations import run_script
+
+
+def rewrites(conn: sqlite3.Connection) -> list[str]:
+    # Not a rewrite, but the backfill scans requests once
+    return ["requests"]
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    run_script(conn, """
+        CREATE TABLE IF NOT EXISTS user_request_summary (
+            user_id         TEXT PRIMARY KEY,
+            pending         INTEGER NOT NULL DEFAULT 0,
+            approved        INTEGER NOT NULL DEFAULT 0,
+            denied          INTEGER NOT NULL DEFAULT 0,
+            fulfilled       INTEGER NOT NULL DEFAULT 0,
+            total           INTEGER NOT NULL DEFAULT 0,
+            last_request_at TIMESTAMP
+        );
+
+        DELETE FROM user_request_summary;
+
+        INSERT INTO user_request_summary (user_id, pending, approved, denied, fulfilled, total, last_request_at)
+            SELECT user_id,
+                   SUM(status = 'pending'), SUM(status = 'approved'),
+                   SUM(status = 'denied'), SUM(status = 'fulfilled'),
+                   COUNT(*), MAX(created_at)
+            FROM requests GROUP BY user_id;
+
+        CREATE INDEX IF NOT EXISTS idx_user_roles_username ON user_roles(username COLLATE NOCASE);
+
+        CREATE TRIGGER IF NOT EXISTS trg_requests_summary_insert AFTER INSERT ON requests
+        BEGIN
+            INSERT INTO user_request_summary (user_id, pending, approved, denied, fulfilled, total, last_request_at)
+            VALUES (
+                NEW.user_id,
+                NEW.status = 'pending', NEW.status = 'approved',
+                NEW.status = 'denied', NEW.status = 'fulfilled',
+                1, NEW.created_at
+            )
+            ON CONFLICT (user_id) DO UPDATE SET
+                pending = pending + excluded.pending,
+                approved = approved + excluded.approved,
+                denied = denied + excluded.denied,
+                fulfilled = fulfilled + excluded.fulfilled,
+                total = total + 1,
+                last_request_at = MAX(COALESCE(last_request_at, ''), excluded.last_request_at);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_requests_summary_delete AFTER DELETE ON requests
+        BEGIN
+            UPDATE user_request_summary SET
+                pending = pending - (OLD.status = 'pending'),
+                approved = approved - (OLD.status = 'approved'),
+                denied = denied - (OLD.status = 'denied'),
+                fulfilled = fulfilled - (OLD.status = 'fulfilled'),
+                total = total - 1,
+                last_request_at = (SELECT MAX(created_at) FROM requests WHERE user_id = OLD.user_id)
+            WHERE user_id = OLD.user_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_requests_summary_status AFTER UPDATE OF status ON requests
+        WHEN OLD.status IS NOT NEW.status AND OLD.user_id IS NEW.user_id
+        BEGIN
+            UPDATE user_request_summary SET
+                pending = pending - (OLD.status = 'pending') + (NEW.status = 'pending'),
+                approved = approved - (OLD.status = 'approved') + (NEW.status = 'approved'),
+                denied = denied - (OLD.status = 'denied') + (NEW.status = 'denied'),
+                fulfilled = fulfilled - (OLD.status = 'fulfilled') + (NEW.status = 'fulfilled')
+            WHERE user_id = NEW.user_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_requests_summary_owner AFTER UPDATE OF user_id ON requests
+        WHEN OLD.user_id IS NOT NEW.user_id
+        BEGIN
+            UPDATE user_request_summary SET
+                pending = pending - (OLD.status = 'pending'),
+                approved = approved - (OLD.status = 'approved'),
+                denied = denied - (OLD.status = 'denied'),
+                fulfilled = fulfilled - (OLD.status = 'fulfilled'),
+                total = total - 1,
+                last_request_at = (SELECT MAX(created_at) FROM requests WHERE user_id = OLD.user_id)
+            WHERE user_id = OLD.user_id;
+
+            INSERT INTO user_request_summary (user_id, pending, approved, denied, fulfilled, total, last_request_at)
+            VALUES (
+                NEW.user_id,
+                NEW.status = 'pending', NEW.status = 'approved',
+                NEW.status = 'denied', NEW.status = 'fulfilled',
+                1, NEW.created_at
+            )
+            ON CONFLICT (user_id) DO UPDATE SET
+                pending = pending + excluded.pending,
+                approved = approved + excluded.approved,
+                denied = denied + excluded.denied,
+                fulfilled = fulfilled + excluded.fulfilled,
+                total = total + 1,
+                last_request_at = MAX(COALESCE(last_request_at, ''), excluded.last_request_at);
+        END;
+    """)
@@ -0,0 +1,109 @@
+"""Title-level request aggregate with per-status vote counts, for the admin demand queue.
+
+One row per (tmdb_id, media_type), backfilled from requests and kept current by
+triggers like ``user_request_summary``. ``vote_count`` is the number of open
+(pending or approved) requests for the title.
+"""
+import sqlite3
+
+from app.migrations import run_script
+
+
+def rewrites(conn: sqlite3.Connection) -> list[str]:
+    # Not a rewrite, but the backfill scans requests once
+    return ["requests"]
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    run_script(conn, """
+        CREATE TABLE IF NOT EXISTS title_requests (
+            id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+            tmdb_id            INTEGER NOT NULL,
+            media_type         TEXT NOT NULL,
+            title              TEXT NOT NULL,
+            poster_path        TEXT,
+            pending            INTEGER NOT NULL DEFAULT 0,
+            approved           INTEGER NOT NULL DEFAULT 0,
+            denied             INTEGER NOT NULL DEFAULT 0,
+            fulfilled          INTEGER NOT NULL DEFAULT 0,
+            vote_count         INTEGER NOT NULL DEFAULT 0,
+            subscribers        INTEGER NOT NULL DEFAULT 0,
+            first_requested_at TIMESTAMP,
+            last_requested_at  TIMESTAMP,
+            UNIQUE (tmdb_id, media_type)
+        );
+
+        DELETE FROM title_requests;
+
+        -- Bare title/poster_path come from the row holding MAX(created_at)
+        INSERT INTO title_requests (
+            tmdb_id, media_type, title, poster_path, pending, approved, denied, fulfilled,
+            vote_count, subscribers, first_requested_at, last_requested_at
+        )
+            SELECT tmdb_id, media_type, title, poster_path,
+                   SUM(status = 'pending'), SUM(status = 'approved'),
+                   SUM(status = 'denied'), SUM(status = 'fulfilled'),
+                   SUM(status IN ('pending', 'approved')), COUNT(*),
+                   MIN(created_at), MAX(created_at)
+            FROM requests GROUP BY tmdb_id, media_type;
+
+        CREATE INDEX IF NOT EXISTS idx_title_requests_demand
+            ON title_requests(vote_count DESC, first_requested_at);
+
+        -- Subscriber lookups and cascades; supersedes the tmdb_id-only index
+        CREATE INDEX IF NOT EXISTS idx_requests_title ON requests(tmdb_id, media_type, status);
+        DROP INDEX IF EXISTS idx_requests_tmdb_id;
+
+        CREATE TRIGGER IF NOT EXISTS trg_requests_title_insert AFTER INSERT ON requests
+        BEGIN
+            INSERT INTO title_requests (
+                tmdb_id, media_type, title, poster_path, pending, approved, denied, fulfilled,
+                vote_count, subscribers, first_requested_at, last_requested_at
+            )
+            VALUES (
+                NEW.tmdb_id, NEW.media_type, NEW.title, NEW.poster_path,
+                NEW.status = 'pending', NEW.status = 'approved',
+                NEW.status = 'denied', NEW.status = 'fulfilled',
+                NEW.status IN ('pending', 'approved'), 1, NEW.created_at, NEW.created_at
+            )
+            ON CONFLICT (tmdb_id, media_type) DO UPDATE SET
+                title = excluded.title,
+                poster_path = COALESCE(excluded.poster_path, poster_path),
+                pending = pending + excluded.pending,
+                approved = approved + excluded.approved,
+                denied = denied + excluded.denied,
+                fulfilled = fulfilled + excluded.fulfilled,
+                vote_count = vote_count + excluded.vote_count,
+                subscribers = subscribers + 1,
+                first_requested_at = MIN(COALESCE(first_requested_at, excluded.first_requested_at), excluded.first_requested_at),
+                last_requested_at = MAX(COALESCE(last_requested_at, ''), excluded.last_requested_at);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_requests_title_delete AFTER DELETE ON requests
+        BEGIN
+            UPDATE title_requests SET
+                pending = pending - (OLD.status = 'pending'),
+                approved = approved - (OLD.status = 'approved'),
+                denied = denied - (OLD.status = 'denied'),
+                fulfilled = fulfilled - (OLD.status = 'fulfilled'),
+                vote_count = vote_count - (OLD.status IN ('pending', 'approved')),
+                subscribers = subscribers - 1
+            WHERE tmdb_id = OLD.tmdb_id AND media_type = OLD.media_type;
+
+            DELETE FROM title_requests
+            WHERE tmdb_id = OLD.tmdb_id AND media_type = OLD.media_type AND subscribers <= 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_requests_title_status AFTER UPDATE OF status ON requests
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            UPDATE title_requests SET
+                pending = pending - (OLD.status = 'pending') + (NEW.status = 'pending'),
+                approved = approved - (OLD.status = 'approved') + (NEW.status = 'approved'),
+                denied = denied - (OLD.status = 'denied') + (NEW.status = 'denied'),
+                fulfilled = fulfilled - (OLD.status = 'fulfilled') + (NEW.status = 'fulfilled'),
+                vote_count = vote_count - (OLD.status IN ('pending', 'approved'))
+                                        + (NEW.status IN ('pending', 'approved'))
+            WHERE tmdb_id = NEW.tmdb_id AND media_type = NEW.media_type;
+        END;
+    """)
@@ -0,0 +1,62 @@
+"""Database-enforced request deduplication and idempotency keys for request creation.
+
+A partial unique index allows one non-denied request per user and title, so
+concurrent submits cannot both get through a SELECT-then-INSERT check.
+Duplicates that already slipped in are moved to ``denied`` with a history
+entry, keeping the furthest-along request of each group.
+``request_idempotency_keys`` maps a client's ``Idempotency-Key`` to the request
+it created.
+"""
+import sqlite3
+
+from app.migrations import run_script
+
+
+def rewrites(conn: sqlite3.Connection) -> list[str]:
+    # Not a rewrite, but building the unique index scans requests once
+    return ["requests"]
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    run_script(conn, """
+        -- Keep the furthest-along request of each group (then the oldest)
+        CREATE TEMP TABLE duplicate_requests AS
+            SELECT id, status, kept_id FROM (
+                SELECT id, status,
+                       FIRST_VALUE(id) OVER w AS kept_id,
+                       ROW_NUMBER() OVER w AS rank
+                FROM requests
+                WHERE status != 'denied'
+                WINDOW w AS (
+                    PARTITION BY user_id, media_type, tmdb_id
+                    ORDER BY CASE status WHEN 'fulfilled' THEN 0 WHEN 'approved' THEN 1 ELSE 2 END, id
+                )
+            )
+            WHERE rank > 1;
+
+        INSERT INTO request_history (request_id, old_status, new_status, changed_by, note)
+            SELECT id, status, 'denied', 'system', 'Duplicate of request #' || kept_id
+            FROM duplicate_requests;
+
+        UPDATE requests SET
+            status = 'denied',
+            admin_note = 'Duplicate of request #' || (SELECT kept_id FROM duplicate_requests d WHERE d.id = requests.id),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT id FROM duplicate_requests);
+
+        DROP TABLE duplicate_requests;
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_requests_active_user_title
+            ON requests(user_id, media_type, tmdb_id) WHERE status != 'denied';
+
+        CREATE TABLE IF NOT EXISTS request_idempotency_keys (
+            user_id     TEXT NOT NULL,
+            key         TEXT NOT NULL,
+            request_id  INTEGER NOT NULL REFERENCES requests(id) ON DELETE CASCADE,
+            created_at  TIMESTAMP NOT NULL,
+            PRIMARY KEY (user_id, key)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_request_idempotency_keys_request
+            ON request_idempotency_keys(request_id);
+    """)
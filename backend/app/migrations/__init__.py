@@ -0,0 +1,170 @@
+"""Versioned schema migrations tracked with ``PRAGMA user_version``.
+
+Each migration is a module in this package named ``NNNN_description.py``
+exposing ``upgrade(conn)``, and optionally ``rewrites(conn)`` listing the
+tables the upgrade would copy. Migrations run once, in order, each in its own
+transaction together with the ``user_version`` bump. Foreign keys are off while
+a migration runs, so tables can be rebuilt, and a migration that leaves new
+violations behind is rolled back.
+
+On an up-to-date database ``migrate`` costs one pragma read.
+"""
+import importlib
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from types import ModuleType
+
+logger = logging.getLogger(__name__)
+
+_MODULE_RE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    module_name: str
+
+    def load(self) -> ModuleType:
+        return importlib.import_module(f"{__name__}.{self.module_name}")
+
+
+def discover() -> list[Migration]:
+    migrations = []
+    for filename in sorted(os.listdir(os.path.dirname(__file__))):
+        match = _MODULE_RE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), filename[:-3]))
+    versions = [m.version for m in migrations]
+    if versions != list(range(1, len(versions) + 1)):
+        raise RuntimeError(f"Migration versions must be contiguous from 1, got {versions}")
+    return migrations
+
+
+MIGRATIONS = discover()
+LATEST_VERSION = MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending(conn: sqlite3.Connection) -> list[Migration]:
+    version = current_version(conn)
+    return [m for m in MIGRATIONS if m.version > version]
+
+
+def run_script(conn: sqlite3.Connection, script: str) -> None:
+    """Execute several statements inside the caller's transaction.
+
+    ``executescript`` would commit first, so statements are split and run one
+    by one instead.
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+    if statement.strip():
+        conn.execute(statement)
+
+
+def table_sql(conn: sqlite3.Connection, table: str) -> str | None:
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def rebuild_table(conn: sqlite3.Connection, table: str, create_sql: str, indexes: str = "") -> None:
+    """Recreate ``table`` from ``create_sql`` (which must create ``<table>_new``), keeping rows.
+
+    The new table is renamed into place rather than renaming the old one away,
+    so foreign keys in other tables keep pointing at ``table``.
+    """
+    new_table = f"{table}_new"
+    conn.execute(f"DROP TABLE IF EXISTS {new_table}")
+    conn.execute(create_sql)
+    new_columns = [r[1] for r in conn.execute(f"PRAGMA table_info({new_table})")]
+    old_columns = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    columns = ", ".join(c for c in new_columns if c in old_columns)
+    conn.execute(f"INSERT INTO {new_table} ({columns}) SELECT {columns} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+    if indexes:
+        run_script(conn, indexes)
+
+
+def _apply(conn: sqlite3.Connection, migration: Migration) -> bool:
+    if conn.in_transaction:
+        conn.commit()
+    # Has no effect inside a transaction, so it is switched before BEGIN
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have applied it while we waited for the lock
+            if current_version(conn) >= migration.version:
+                conn.rollback()
+                return False
+            # Only fail on violations the migration introduced; legacy databases
+            # may already have some that a later migration repairs
+            before = len(conn.execute("PRAGMA foreign_key_check").fetchall())
+            migration.load().upgrade(conn)
+            after = len(conn.execute("PRAGMA foreign_key_check").fetchall())
+            if after > before:
+                raise RuntimeError(
+                    f"Migration {migration.module_name} added {after - before} foreign key violation(s)"
+                )
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        conn.execute("PRAGMA foreign_keys=ON")
+    return True
+
+
+def migrate(conn: sqlite3.Connection) -> list[Migration]:
+    """Apply pending migrations in order; returns the ones applied here."""
+    if current_version(conn) >= LATEST_VERSION:
+        return []
+    applied = []
+    for migration in pending(conn):
+        logger.info("Applying migration %s", migration.module_name)
+        if _apply(conn, migration):
+            applied.append(migration)
+    return applied
+
+
+def table_size(conn: sqlite3.Connection, table: str) -> tuple[int, int | None]:
+    """Row count and on-disk bytes (``None`` when SQLite lacks the dbstat table)."""
+    rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    try:
+        size = conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = ?", (table,)).fetchone()[0]
+    except sqlite3.OperationalError:
+        size = None
+    return rows, size
+
+
+def plan(conn: sqlite3.Connection) -> list[dict]:
+    """Describe pending migrations and the tables each would rewrite, without changing anything."""
+    steps = []
+    for migration in pending(conn):
+        module = migration.load()
+        rewrites = []
+        for table in module.rewrites(conn) if hasattr(module, "rewrites") else []:
+            rows, size = table_size(conn, table)
+            rewrites.append({"table": table, "rows": rows, "bytes": size})
+        steps.append({
+            "version": migration.version,
+            "name": migration.module_name,
+            "description": (module.__doc__ or "").strip().split("\n")[0],
+            "rewrites": rewrites,
+        })
+    return steps
@@ -1,3 +1,4 @@
+import math
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -6,10 +7,25 @@ from pydantic import BaseModel
 import httpx
 
 from app.dependencies import require_admin
-from app.database import get_db
-from app.schemas import RequestUpdate, RequestResponse, PaginatedResponse
+from app.config import settings
+from app.database import get_db, fetch_dicts
+from app.schemas import (
+    RequestUpdate, RequestResponse, PaginatedResponse, TitleRequestResponse, TitleSubscriber,
+)
+from app.serialization import FastJSONResponse
 from app.services import request_service
+from app.services.bulk_import import bulk_importer
+from app.services.cache import caches
+from app.services.db_writer import db_writer
+from app.services.circuit_breaker import breakers
+from app.services.rate_limiter import limiters
+from app.services.health_monitor import health_monitor
 from app.services.jellyfin_client import jellyfin_client
+from app.services.jellyfin_credentials import credential_manager
+from app.services.library_catalog import library_catalog
+from app.services.prefetch import prefetch_warmer
+from app.services.request_history import archive_expired, history_stats
+from app.startup import startup_profiler
 
 router = APIRouter()
 
@@ -25,7 +41,7 @@ async def get_all_requests(
     admin: dict = Depends(require_admin),
     db=Depends(get_db),
 ):
-    return request_service.get_all_requests(db, status, user_id, page, limit)
+    return FastJSONResponse(request_service.get_all_requests(db, status, user_id, page, limit))
 
 
 @router.patch("/requests/{request_id}", response_model=RequestResponse)
@@ -33,19 +49,58 @@ async def update_request(
     request_id: int,
     body: RequestUpdate,
     admin: dict = Depends(require_admin),
-    db=Depends(get_db),
 ):
     if body.status not in ("approved", "denied", "fulfilled", "pending"):
         raise HTTPException(status_code=400, detail="Invalid status")
     try:
-        result = request_service.update_request_status(
-            db, request_id, body.status, admin["user_id"], body.admin_note
+        result = await db_writer.run(
+            request_service.update_request_status, request_id, body.status, admin["user_id"], body.admin_note
         )
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+# --- Titles (requests aggregated by tmdb_id + media_type) ---
+
+@router.get("/titles", response_model=PaginatedResponse)
+async def get_title_queue(
+    status: str | None = Query("open", pattern="^(open|pending|approved|fulfilled|denied)$"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=500),
+    admin: dict = Depends(require_admin),
+    db=Depends(get_db),
+):
+    return FastJSONResponse(request_service.get_title_queue(db, status, page, limit))
+
+
+@router.get("/titles/{title_id}/subscribers", response_model=list[TitleSubscriber])
+async def get_title_subscribers(
+    title_id: int,
+    admin: dict = Depends(require_admin),
+    db=Depends(get_db),
+):
+    if not request_service.get_title_by_id(db, title_id):
+        raise HTTPException(status_code=404, detail="Title not found")
+    return request_service.get_title_subscribers(db, title_id)
+
+
+@router.patch("/titles/{title_id}", response_model=TitleRequestResponse)
+async def update_title(
+    title_id: int,
+    body: RequestUpdate,
+    admin: dict = Depends(require_admin),
+):
+    if body.status not in request_service.TITLE_TRANSITIONS:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    try:
+        return await db_writer.run(
+            request_service.update_title_status, title_id, body.status, admin["user_id"], body.admin_note
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.get("/stats")
 async def get_stats(
     admin: dict = Depends(require_admin),
@@ -54,21 +109,87 @@ async def get_stats(
     return request_service.get_request_stats(db)
 
 
+# --- Request History ---
+
+@router.get("/history")
+async def get_history_stats(
+    admin: dict = Depends(require_admin),
+    db=Depends(get_db),
+):
+    return history_stats(db)
+
+
+@router.post("/history/archive")
+async def trigger_history_archive(
+    older_than_days: int | None = Query(None, ge=0),
+    admin: dict = Depends(require_admin),
+):
+    days = settings.history_retention_days if older_than_days is None else older_than_days
+    return await archive_expired(days)
+
+
 # --- User Management ---
 
 class RoleUpdate(BaseModel):
     role: str  # "admin" or "user"
 
 
-@router.get("/users")
+USER_SORTS = {
+    "username": "u.username COLLATE NOCASE",
+    "recent": "s.last_request_at IS NULL, s.last_request_at DESC, u.username COLLATE NOCASE",
+    "requests": "COALESCE(s.total, 0) DESC, u.username COLLATE NOCASE",
+}
+
+
+@router.get("/users", response_model=PaginatedResponse)
 async def get_users(
+    search: str | None = Query(None),
+    sort: str = Query("username", pattern="^(username|recent|requests)$"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=200),
     admin: dict = Depends(require_admin),
     db=Depends(get_db),
 ):
-    rows = db.execute(
-        "SELECT user_id, username, role, granted_by, created_at, updated_at FROM user_roles ORDER BY username"
-    ).fetchall()
-    return [dict(r) for r in rows]
+    where = ""
+    params: list = []
+    if search:
+        where = "WHERE u.username LIKE ? ESCAPE '\\'"
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+
+    total = db.execute(f"SELECT COUNT(*) FROM user_roles u {where}", params).fetchone()[0]
+    offset = (page - 1) * limit
+    # Counts come from user_request_summary, kept current by triggers on requests
+    items = fetch_dicts(
+        db,
+        f"""SELECT u.user_id, u.username, u.role, u.granted_by, u.created_at, u.updated_at,
+                   COALESCE(s.pending, 0) AS pending, COALESCE(s.approved, 0) AS approved,
+                   COALESCE(s.denied, 0) AS denied, COALESCE(s.fulfilled, 0) AS fulfilled,
+                   COALESCE(s.total, 0) AS total_requests, s.last_request_at
+            FROM user_roles u
+            LEFT JOIN user_request_summary s ON s.user_id = u.user_id
+            {where}
+            ORDER BY {USER_SORTS[sort]}
+            LIMIT ? OFFSET ?""",
+        params + [limit, offset],
+    )
+    return FastJSONResponse({
+        "items": items,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": math.ceil(total / limit) if total > 0 else 1,
+    })
+
+
+def _set_role(conn, user_id: str, role: str, granted_by: str) -> dict | None:
+    updated = conn.execute(
+        """UPDATE user_roles SET role = ?, granted_by = ?, updated_at = ? WHERE user_id = ?
+           RETURNING user_id, username, role, granted_by, created_at, updated_at""",
+        (role, granted_by, datetime.utcnow().isoformat(), user_id),
+    ).fetchone()
+    conn.commit()
+    return dict(updated) if updated else None
 
 
 @router.patch("/users/{user_id}")
@@ -76,89 +197,55 @@ async def update_user_role(
     user_id: str,
     body: RoleUpdate,
     admin: dict = Depends(require_admin),
-    db=Depends(get_db),
 ):
     if body.role not in ("admin", "user"):
         raise HTTPException(status_code=400, detail="Role must be 'admin' or 'user'")
 
-    row = db.execute("SELECT * FROM user_roles WHERE user_id = ?", (user_id,)).fetchone()
-    if not row:
-        raise HTTPException(status_code=404, detail="User not found")
-
     # Prevent removing your own admin access
     if user_id == admin["user_id"] and body.role != "admin":
         raise HTTPException(status_code=400, detail="Cannot remove your own admin access")
 
-    now = datetime.utcnow().isoformat()
-    db.execute(
-        "UPDATE user_roles SET role = ?, granted_by = ?, updated_at = ? WHERE user_id = ?",
-        (body.role, admin["user_id"], now, user_id),
-    )
-    db.commit()
-
-    updated = db.execute("SELECT user_id, username, role, granted_by, created_at, updated_at FROM user_roles WHERE user_id = ?", (user_id,)).fetchone()
-    return dict(updated)
+    updated = await db_writer.run(_set_role, user_id, body.role, admin["user_id"])
+    if not updated:
+        raise HTTPException(status_code=404, detail="User not found")
+    return updated
 
 
 # --- Health Check ---
 
 @router.get("/health")
-async def health_check(admin: dict = Depends(require_admin)):
-    checks = {}
+async def health_check(
+    refresh: bool = Query(False),
+    admin: dict = Depends(require_admin),
+):
+    # Probes run in the background; only block when asked to or on a cold start.
+    if refresh or not health_monitor.has_snapshot():
+        return await health_monitor.refresh()
+    return health_monitor.snapshot()
 
-    # Jellyfin
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(
-                f"{jellyfin_client.base_url}/System/Info/Public",
-            )
-            if resp.status_code == 200:
-                info = resp.json()
-                checks["jellyfin"] = {
-                    "status": "ok",
-                    "url": jellyfin_client.base_url,
-                    "server_name": info.get("ServerName"),
-                    "version": info.get("Version"),
-                }
-            else:
-                checks["jellyfin"] = {
-                    "status": "error",
-                    "url": jellyfin_client.base_url,
-                    "detail": f"HTTP {resp.status_code}",
-                }
-    except Exception as e:
-        checks["jellyfin"] = {
-            "status": "error",
-            "url": jellyfin_client.base_url,
-            "detail": str(e),
-        }
-
-    # TMDB
-    try:
-        from app.config import settings
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(
-                f"{settings.tmdb_base_url}/configuration",
-                params={"api_key": settings.tmdb_api_key},
-            )
-            checks["tmdb"] = {
-                "status": "ok" if resp.status_code == 200 else "error",
-                "detail": None if resp.status_code == 200 else f"HTTP {resp.status_code}",
-            }
-    except Exception as e:
-        checks["tmdb"] = {"status": "error", "detail": str(e)}
-
-    # Database
-    try:
-        from app.database import get_db_connection
-        conn = get_db_connection()
-        conn.execute("SELECT 1").fetchone()
-        conn.close()
-        checks["database"] = {"status": "ok"}
-    except Exception as e:
-        checks["database"] = {"status": "error", "detail": str(e)}
-
-    return checks
+
+@router.get("/upstreams")
+async def get_upstream_stats(admin: dict = Depends(require_admin)):
+    return {
+        "breakers": {name: breaker.stats() for name, breaker in breakers.items()},
+        "limiters": {name: limiter.stats() for name, limiter in limiters.items()},
+        "caches": {name: cache.stats() for name, cache in caches.items()},
+        "prefetch": prefetch_warmer.stats(),
+        "jellyfin_payloads": jellyfin_client.payload_stats(),
+        "library_catalog": library_catalog.stats(),
+        "db_writer": db_writer.stats(),
+        "bulk_import": bulk_importer.stats(),
+    }
+
+
+@router.get("/jobs/fulfillment")
+async def get_fulfillment_job_health(admin: dict = Depends(require_admin)):
+    return credential_manager.stats()
+
+
+@router.get("/startup")
+async def get_startup_report(admin: dict = Depends(require_admin)):
+    return startup_profiler.report()
 
 
 @router.post("/jellyfin/scan")
@@ -5,14 +5,32 @@ import httpx
 from app.config import settings
 from app.schemas import LoginRequest, LoginResponse, UserInfo
 from app.dependencies import get_current_user
-from app.database import get_db
+from app.services.db_writer import db_writer
 from app.services.jellyfin_client import jellyfin_client
 
 router = APIRouter()
 
 
+def _record_login(conn, user_id: str, username: str, access_token: str, jellyfin_admin: bool) -> bool:
+    """Track the user in user_roles and return whether they get admin access."""
+    # New users start as admin if Jellyfin says so; returning users keep their
+    # app-level role while username and token are kept in sync
+    role = conn.execute(
+        """INSERT INTO user_roles (user_id, username, role, jellyfin_token) VALUES (?, ?, ?, ?)
+           ON CONFLICT (user_id) DO UPDATE SET
+               username = excluded.username,
+               jellyfin_token = excluded.jellyfin_token,
+               updated_at = CURRENT_TIMESTAMP
+           RETURNING role""",
+        (user_id, username, "admin" if jellyfin_admin else "user", access_token),
+    ).fetchone()[0]
+    conn.commit()
+    # Jellyfin admin always gets admin access
+    return jellyfin_admin or role == "admin"
+
+
 @router.post("/login", response_model=LoginResponse)
-async def login(body: LoginRequest, db=Depends(get_db)):
+async def login(body: LoginRequest):
     try:
         result = await jellyfin_client.authenticate(body.username, body.password)
     except httpx.HTTPStatusError as e:
@@ -28,28 +46,7 @@ async def login(body: LoginRequest, db=Depends(get_db)):
     username = user_data.get("Name", "")
     jellyfin_admin = user_data.get("Policy", {}).get("IsAdministrator", False)
 
-    # Check app-level role (Jellyfin admin always gets admin access)
-    app_role = db.execute(
-        "SELECT role FROM user_roles WHERE user_id = ?", (user_id,)
-    ).fetchone()
-    is_admin = jellyfin_admin or (app_role and app_role["role"] == "admin")
-
-    # Upsert user into user_roles table so we track all users who have logged in
-    existing = db.execute("SELECT user_id FROM user_roles WHERE user_id = ?", (user_id,)).fetchone()
-    if not existing:
-        role = "admin" if jellyfin_admin else "user"
-        db.execute(
-            "INSERT INTO user_roles (user_id, username, role, jellyfin_token) VALUES (?, ?, ?, ?)",
-            (user_id, username, role, access_token),
-        )
-        db.commit()
-    else:
-        # Keep username and token in sync
-        db.execute(
-            "UPDATE user_roles SET username = ?, jellyfin_token = ? WHERE user_id = ?",
-            (username, access_token, user_id),
-        )
-        db.commit()
+    is_admin = await db_writer.run(_record_login, user_id, username, access_token, jellyfin_admin)
 
     payload = {
         "user_id": user_id,
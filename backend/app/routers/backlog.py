@@ -4,11 +4,48 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.dependencies import get_current_user, require_admin
-from app.database import get_db
+from app.database import get_db, fetch_dicts
 from app.schemas import BacklogCreate, BacklogResponse, BacklogUpdate
+from app.serialization import FastJSONResponse
+from app.services.db_writer import db_writer
 
 router = APIRouter()
 
+VALID_STATUSES = ("reported", "triaged", "in_progress", "ready_for_test", "resolved", "wont_fix")
+VALID_PRIORITIES = ("low", "medium", "high", "critical")
+
+
+# --- Writes (run on the DB writer) ---
+
+def _insert_report(conn, user_id: str, username: str, type: str, title: str, description: str | None) -> dict:
+    cursor = conn.execute(
+        """INSERT INTO backlog (user_id, username, type, title, description)
+           VALUES (?, ?, ?, ?, ?)""",
+        (user_id, username, type, title, description),
+    )
+    conn.commit()
+    return dict(conn.execute("SELECT * FROM backlog WHERE id = ?", (cursor.lastrowid,)).fetchone())
+
+
+def _update_item(conn, item_id: int, changes: dict) -> dict | None:
+    row = conn.execute("SELECT * FROM backlog WHERE id = ?", (item_id,)).fetchone()
+    if not row:
+        return None
+    if not changes:
+        return dict(row)
+
+    updates = [f"{column} = ?" for column in changes] + ["updated_at = ?"]
+    values = list(changes.values()) + [datetime.utcnow().isoformat(), item_id]
+    conn.execute(f"UPDATE backlog SET {', '.join(updates)} WHERE id = ?", values)
+    conn.commit()
+    return dict(conn.execute("SELECT * FROM backlog WHERE id = ?", (item_id,)).fetchone())
+
+
+def _delete_item(conn, item_id: int) -> bool:
+    deleted = conn.execute("DELETE FROM backlog WHERE id = ?", (item_id,)).rowcount
+    conn.commit()
+    return deleted > 0
+
 
 # --- User endpoints ---
 
@@ -16,19 +53,13 @@ router = APIRouter()
 async def create_report(
     body: BacklogCreate,
     user: dict = Depends(get_current_user),
-    db=Depends(get_db),
 ):
     if body.type not in ("bug", "feature"):
         raise HTTPException(status_code=400, detail="Type must be 'bug' or 'feature'")
 
-    cursor = db.execute(
-        """INSERT INTO backlog (user_id, username, type, title, description)
-           VALUES (?, ?, ?, ?, ?)""",
-        (user["user_id"], user["username"], body.type, body.title, body.description),
+    return await db_writer.run(
+        _insert_report, user["user_id"], user["username"], body.type, body.title, body.description
     )
-    db.commit()
-    row = db.execute("SELECT * FROM backlog WHERE id = ?", (cursor.lastrowid,)).fetchone()
-    return dict(row)
 
 
 @router.get("/mine")
@@ -36,11 +67,11 @@ async def get_my_reports(
     user: dict = Depends(get_current_user),
     db=Depends(get_db),
 ):
-    rows = db.execute(
+    return FastJSONResponse(fetch_dicts(
+        db,
         "SELECT * FROM backlog WHERE user_id = ? ORDER BY created_at DESC",
         (user["user_id"],),
-    ).fetchall()
-    return [dict(r) for r in rows]
+    ))
 
 
 # --- Admin endpoints ---
@@ -66,18 +97,19 @@ async def get_all_backlog(
     where = ("WHERE " + " AND ".join(where_parts)) if where_parts else ""
     total = db.execute(f"SELECT COUNT(*) FROM backlog {where}", params).fetchone()[0]
     offset = (page - 1) * limit
-    rows = db.execute(
+    items = fetch_dicts(
+        db,
         f"SELECT * FROM backlog {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
         params + [limit, offset],
-    ).fetchall()
+    )
 
-    return {
-        "items": [dict(r) for r in rows],
+    return FastJSONResponse({
+        "items": items,
         "total": total,
         "page": page,
         "limit": limit,
         "total_pages": math.ceil(total / limit) if total > 0 else 1,
-    }
+    })
 
 
 @router.patch("/{item_id}", response_model=BacklogResponse)
@@ -85,59 +117,30 @@ async def update_backlog_item(
     item_id: int,
     body: BacklogUpdate,
     admin: dict = Depends(require_admin),
-    db=Depends(get_db),
 ):
-    row = db.execute("SELECT * FROM backlog WHERE id = ?", (item_id,)).fetchone()
-    if not row:
+    if body.status and body.status not in VALID_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(VALID_STATUSES)}")
+    if body.priority and body.priority not in VALID_PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"Priority must be one of: {', '.join(VALID_PRIORITIES)}")
+
+    changes = {
+        column: value
+        for column, value in (("status", body.status), ("priority", body.priority), ("admin_note", body.admin_note))
+        if value is not None
+    }
+    updated = await db_writer.run(_update_item, item_id, changes)
+    if updated is None:
         raise HTTPException(status_code=404, detail="Backlog item not found")
-
-    valid_statuses = ("reported", "triaged", "in_progress", "ready_for_test", "resolved", "wont_fix")
-    valid_priorities = ("low", "medium", "high", "critical")
-
-    if body.status and body.status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(valid_statuses)}")
-    if body.priority and body.priority not in valid_priorities:
-        raise HTTPException(status_code=400, detail=f"Priority must be one of: {', '.join(valid_priorities)}")
-
-    now = datetime.utcnow().isoformat()
-    updates = []
-    values = []
-
-    if body.status is not None:
-        updates.append("status = ?")
-        values.append(body.status)
-    if body.priority is not None:
-        updates.append("priority = ?")
-        values.append(body.priority)
-    if body.admin_note is not None:
-        updates.append("admin_note = ?")
-        values.append(body.admin_note)
-
-    if not updates:
-        return dict(row)
-
-    updates.append("updated_at = ?")
-    values.append(now)
-    values.append(item_id)
-
-    db.execute(f"UPDATE backlog SET {', '.join(updates)} WHERE id = ?", values)
-    db.commit()
-
-    updated = db.execute("SELECT * FROM backlog WHERE id = ?", (item_id,)).fetchone()
-    return dict(updated)
+    return updated
 
 
 @router.delete("/{item_id}")
 async def delete_backlog_item(
     item_id: int,
     admin: dict = Depends(require_admin),
-    db=Depends(get_db),
 ):
-    row = db.execute("SELECT * FROM backlog WHERE id = ?", (item_id,)).fetchone()
-    if not row:
+    if not await db_writer.run(_delete_item, item_id):
         raise HTTPException(status_code=404, detail="Backlog item not found")
-    db.execute("DELETE FROM backlog WHERE id = ?", (item_id,))
-    db.commit()
     return {"message": "Deleted"}
 
 
@@ -3,13 +3,16 @@ import httpx
 import logging
 
 from app.dependencies import get_current_user
-from app.schemas import BookSearchResult, BookDetail
+from app.schemas import BookDetail
+from app.serialization import FastJSONResponse
+from app.services import book_metadata
 from app.services.openlibrary_client import (
     openlibrary_client,
     cover_url,
     parse_work_id,
     format_work_key,
 )
+from app.services.rate_limiter import is_rate_limited
 from app.services.request_service import get_request_for_tmdb
 from app.database import get_db
 
@@ -26,9 +29,13 @@ async def search_books(
 ):
     try:
         data = await openlibrary_client.search_books(query, page)
-    except httpx.HTTPError:
+    except httpx.HTTPError as e:
+        if is_rate_limited(e):
+            raise HTTPException(status_code=503, detail="Open Library rate limit reached, try again shortly")
         raise HTTPException(status_code=502, detail="Open Library API error")
 
+    book_metadata.remember_search_docs(data.get("docs", []))
+
     results = []
     for doc in data.get("docs", []):
         key = doc.get("key", "")
@@ -41,29 +48,31 @@ async def search_books(
 
         existing_request = get_request_for_tmdb(db, work_id, "book", user["user_id"])
 
-        results.append(BookSearchResult(
-            ol_work_id=work_id,
-            ol_work_key=format_work_key(work_id),
-            media_type="book",
-            title=doc.get("title", ""),
-            authors=doc.get("author_name", []),
-            first_publish_year=doc.get("first_publish_year"),
-            cover_url=cover_url(doc.get("cover_i"), "M"),
-            subject=(doc.get("subject") or [])[:5],
-            edition_count=doc.get("edition_count"),
-            ratings_average=doc.get("ratings_average"),
-            existing_request=existing_request,
-        ))
+        # Same shape as BookSearchResult, built directly to skip per-item validation
+        results.append({
+            "ol_work_id": work_id,
+            "ol_work_key": format_work_key(work_id),
+            "media_type": "book",
+            "title": doc.get("title", ""),
+            "authors": doc.get("author_name", []),
+            "first_publish_year": doc.get("first_publish_year"),
+            "cover_url": cover_url(doc.get("cover_i"), "M"),
+            "subject": (doc.get("subject") or [])[:5],
+            "edition_count": doc.get("edition_count"),
+            "ratings_average": doc.get("ratings_average"),
+            "existing_request": existing_request,
+            "already_in_library": False,
+        })
 
     num_found = data.get("numFound", 0)
     total_pages = max(1, -(-num_found // 20))  # ceil division
 
-    return {
+    return FastJSONResponse({
         "results": results,
         "page": page,
         "total_pages": total_pages,
         "total_results": num_found,
-    }
+    })
 
 
 @router.get("/work/{work_id}")
@@ -74,44 +83,33 @@ async def get_book_detail(
 ):
     work_key = format_work_key(work_id)
     try:
-        data = await openlibrary_client.get_work_details(work_key)
+        book = await book_metadata.get_book(work_id)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="Book not found")
+        if is_rate_limited(e):
+            raise HTTPException(status_code=503, detail="Open Library rate limit reached, try again shortly")
         raise HTTPException(status_code=502, detail="Open Library API error")
     except httpx.HTTPError:
         raise HTTPException(status_code=502, detail="Open Library API error")
 
-    # Extract description
-    description = data.get("description")
-    if isinstance(description, dict):
-        description = description.get("value", "")
-
     # Build cover URL from covers array or fall back
-    covers = data.get("covers", [])
+    covers = book["covers"]
     book_cover_url = cover_url(covers[0], "L") if covers else None
 
-    # Extract subjects
-    subjects = [s for s in data.get("subjects", []) if isinstance(s, str)][:15]
-
     existing_request = get_request_for_tmdb(db, work_id, "book", user["user_id"])
 
     return BookDetail(
         ol_work_id=work_id,
         ol_work_key=work_key,
-        title=data.get("title", ""),
-        authors=[
-            a.get("author", {}).get("key", "").split("/")[-1]
-            if isinstance(a.get("author"), dict)
-            else str(a.get("author", ""))
-            for a in data.get("authors", [])
-        ],
-        description=description,
-        first_publish_year=None,
+        title=book["title"],
+        authors=book["authors"],
+        description=book["description"],
+        first_publish_year=book["first_publish_year"],
         cover_url=book_cover_url,
-        subjects=subjects,
-        page_count=None,
-        edition_count=None,
-        ratings_average=None,
+        subjects=book["subjects"][:15],
+        page_count=book["page_count"],
+        edition_count=book["edition_count"],
+        ratings_average=book["ratings_average"],
         existing_request=existing_request,
     )
@@ -1,18 +1,44 @@
+import asyncio
+import hashlib
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 import httpx
 
+from app.config import settings
 from app.dependencies import get_current_user
-from app.schemas import LibraryItem, LibraryStats
-from app.services.jellyfin_client import jellyfin_client
+from app.schemas import LibraryStats
+from app.serialization import dumps
+from app.services.cache import get_cache
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.jellyfin_client import COUNT_FIELDS, LISTING_FIELDS, jellyfin_client
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Rendered (body, etag) pairs, keyed per user since Jellyfin libraries are per-user.
+library_cache = get_cache("library_responses", ttl=settings.library_cache_ttl, max_entries=2048)
+
+
+async def _render(load) -> tuple[bytes, str]:
+    body = dumps(await load())
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+async def cached_response(request: Request, key: tuple, load) -> Response:
+    """Serve ``load()`` from the per-user cache, answering 304 to a matching If-None-Match."""
+    body, etag = await library_cache.get_or_load(key, lambda: _render(load))
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={settings.library_cache_ttl}"}
+    if_none_match = request.headers.get("If-None-Match", "")
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/movies")
 async def get_movies(
+    request: Request,
     search: str | None = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
@@ -20,46 +46,57 @@ async def get_movies(
     sort_order: str = Query("Ascending"),
     user: dict = Depends(get_current_user),
 ):
-    try:
-        start_index = (page - 1) * limit
-        data = await jellyfin_client.get_items(
-            user_id=user["user_id"],
-            token=user["jellyfin_token"],
-            include_item_types="Movie",
-            search_term=search,
-            start_index=start_index,
-            limit=limit,
-            sort_by=sort_by,
-            sort_order=sort_order,
-        )
-        items = [
-            LibraryItem(
-                jellyfin_id=item["Id"],
-                title=item.get("Name", ""),
-                year=item.get("ProductionYear"),
-                poster_url=jellyfin_client.get_image_url(item["Id"]),
-                media_type="movie",
+    async def load():
+        try:
+            start_index = (page - 1) * limit
+            data = await jellyfin_client.get_items(
+                user_id=user["user_id"],
+                token=user["jellyfin_token"],
+                include_item_types="Movie",
+                search_term=search,
+                start_index=start_index,
+                limit=limit,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                fields=LISTING_FIELDS,
+                enable_images=False,
+                enable_user_data=False,
+                site="library.movies",
             )
-            for item in data.get("Items", [])
-        ]
-        return {
-            "items": items,
-            "total": data.get("TotalRecordCount", 0),
-            "page": page,
-            "limit": limit,
-        }
-    except httpx.HTTPStatusError as e:
-        logger.error("Jellyfin HTTP error (movies): %s", e.response.status_code)
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
-        raise HTTPException(status_code=502, detail=f"Jellyfin error: {e.response.status_code}")
-    except Exception as e:
-        logger.error("Jellyfin error (movies): %s", e)
-        raise HTTPException(status_code=502, detail=str(e))
+            items = [
+                {
+                    "jellyfin_id": item["Id"],
+                    "title": item.get("Name", ""),
+                    "year": item.get("ProductionYear"),
+                    "poster_url": jellyfin_client.get_image_url(item["Id"]),
+                    "media_type": "movie",
+                }
+                for item in data.get("Items", [])
+            ]
+            return {
+                "items": items,
+                "total": data.get("TotalRecordCount", 0),
+                "page": page,
+                "limit": limit,
+            }
+        except httpx.HTTPStatusError as e:
+            logger.error("Jellyfin HTTP error (movies): %s", e.response.status_code)
+            if e.response.status_code == 401:
+                raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
+            raise HTTPException(status_code=502, detail=f"Jellyfin error: {e.response.status_code}")
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Jellyfin error (movies): %s", e)
+            raise HTTPException(status_code=502, detail=str(e))
+
+    key = (user["user_id"], "movies", search, page, limit, sort_by, sort_order)
+    return await cached_response(request, key, load)
 
 
 @router.get("/tvshows")
 async def get_tv_shows(
+    request: Request,
     search: str | None = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
@@ -67,95 +104,115 @@ async def get_tv_shows(
     sort_order: str = Query("Ascending"),
     user: dict = Depends(get_current_user),
 ):
-    try:
-        start_index = (page - 1) * limit
-        data = await jellyfin_client.get_items(
-            user_id=user["user_id"],
-            token=user["jellyfin_token"],
-            include_item_types="Series",
-            search_term=search,
-            start_index=start_index,
-            limit=limit,
-            sort_by=sort_by,
-            sort_order=sort_order,
-        )
-        items = [
-            LibraryItem(
-                jellyfin_id=item["Id"],
-                title=item.get("Name", ""),
-                year=item.get("ProductionYear"),
-                poster_url=jellyfin_client.get_image_url(item["Id"]),
-                media_type="tv",
+    async def load():
+        try:
+            start_index = (page - 1) * limit
+            data = await jellyfin_client.get_items(
+                user_id=user["user_id"],
+                token=user["jellyfin_token"],
+                include_item_types="Series",
+                search_term=search,
+                start_index=start_index,
+                limit=limit,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                fields=LISTING_FIELDS,
+                enable_images=False,
+                enable_user_data=False,
+                site="library.tvshows",
             )
-            for item in data.get("Items", [])
-        ]
-        return {
-            "items": items,
-            "total": data.get("TotalRecordCount", 0),
-            "page": page,
-            "limit": limit,
-        }
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
-        raise HTTPException(status_code=502, detail="Jellyfin server error")
-    except Exception as e:
-        logger.error("Jellyfin error (tvshows): %s", e)
-        raise HTTPException(status_code=502, detail=str(e))
+            items = [
+                {
+                    "jellyfin_id": item["Id"],
+                    "title": item.get("Name", ""),
+                    "year": item.get("ProductionYear"),
+                    "poster_url": jellyfin_client.get_image_url(item["Id"]),
+                    "media_type": "tv",
+                }
+                for item in data.get("Items", [])
+            ]
+            return {
+                "items": items,
+                "total": data.get("TotalRecordCount", 0),
+                "page": page,
+                "limit": limit,
+            }
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
+            raise HTTPException(status_code=502, detail="Jellyfin server error")
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Jellyfin error (tvshows): %s", e)
+            raise HTTPException(status_code=502, detail=str(e))
+
+    key = (user["user_id"], "tvshows", search, page, limit, sort_by, sort_order)
+    return await cached_response(request, key, load)
 
 
 @router.get("/stats", response_model=LibraryStats)
-async def get_library_stats(user: dict = Depends(get_current_user)):
-    try:
-        movies = await jellyfin_client.get_items(
-            user["user_id"], user["jellyfin_token"],
-            include_item_types="Movie", limit=0,
-        )
-        shows = await jellyfin_client.get_items(
-            user["user_id"], user["jellyfin_token"],
-            include_item_types="Series", limit=0,
-        )
-        episodes = await jellyfin_client.get_items(
-            user["user_id"], user["jellyfin_token"],
-            include_item_types="Episode", limit=0,
-        )
-        return LibraryStats(
-            total_movies=movies.get("TotalRecordCount", 0),
-            total_shows=shows.get("TotalRecordCount", 0),
-            total_episodes=episodes.get("TotalRecordCount", 0),
-        )
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
-        raise HTTPException(status_code=502, detail="Jellyfin server error")
-    except Exception as e:
-        logger.error("Jellyfin error (stats): %s", e)
-        raise HTTPException(status_code=502, detail=str(e))
+async def get_library_stats(request: Request, user: dict = Depends(get_current_user)):
+    async def load():
+        try:
+            movies, shows, episodes = await asyncio.gather(*(
+                jellyfin_client.get_items(
+                    user["user_id"], user["jellyfin_token"],
+                    include_item_types=item_type, limit=0,
+                    fields=COUNT_FIELDS, enable_images=False, enable_user_data=False,
+                    site="library.stats",
+                )
+                for item_type in ("Movie", "Series", "Episode")
+            ))
+            return {
+                "total_movies": movies.get("TotalRecordCount", 0),
+                "total_shows": shows.get("TotalRecordCount", 0),
+                "total_episodes": episodes.get("TotalRecordCount", 0),
+            }
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
+            raise HTTPException(status_code=502, detail="Jellyfin server error")
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Jellyfin error (stats): %s", e)
+            raise HTTPException(status_code=502, detail=str(e))
+
+    return await cached_response(request, (user["user_id"], "stats"), load)
 
 
 @router.get("/recent")
 async def get_recent(
+    request: Request,
     limit: int = Query(20, ge=1, le=50),
     user: dict = Depends(get_current_user),
 ):
-    try:
-        items = await jellyfin_client.get_latest_items(
-            user["user_id"], user["jellyfin_token"], limit
-        )
-        return [
-            LibraryItem(
-                jellyfin_id=item["Id"],
-                title=item.get("Name", ""),
-                year=item.get("ProductionYear"),
-                poster_url=jellyfin_client.get_image_url(item["Id"]),
-                media_type="movie" if item.get("Type") == "Movie" else "tv",
+    async def load():
+        try:
+            items = await jellyfin_client.get_latest_items(
+                user["user_id"], user["jellyfin_token"], limit,
+                fields=LISTING_FIELDS, enable_images=False, enable_user_data=False,
+                site="library.recent",
             )
-            for item in items
-        ]
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
-        raise HTTPException(status_code=502, detail="Jellyfin server error")
-    except Exception as e:
-        logger.error("Jellyfin error (recent): %s", e)
-        raise HTTPException(status_code=502, detail=str(e))
+            return [
+                {
+                    "jellyfin_id": item["Id"],
+                    "title": item.get("Name", ""),
+                    "year": item.get("ProductionYear"),
+                    "poster_url": jellyfin_client.get_image_url(item["Id"]),
+                    "media_type": "movie" if item.get("Type") == "Movie" else "tv",
+                }
+                for item in items
+            ]
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                raise HTTPException(status_code=401, detail="Jellyfin session expired. Please log out and log back in.")
+            raise HTTPException(status_code=502, detail="Jellyfin server error")
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Jellyfin error (recent): %s", e)
+            raise HTTPException(status_code=502, detail=str(e))
+
+    return await cached_response(request, (user["user_id"], "recent", limit), load)
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
 from app.dependencies import get_current_user
 from app.database import get_db
-from app.schemas import RequestCreate, RequestResponse, PaginatedResponse
+from app.schemas import BulkImportCreate, RequestCreate, RequestResponse, PaginatedResponse, RequestHistoryEntry
+from app.serialization import FastJSONResponse
 from app.services import request_service
+from app.services.bulk_import import bulk_importer, parse_import
+from app.services.db_writer import db_writer
+from app.services.request_history import get_history
+from app.services.prefetch import prefetch_warmer
+from app.services.suggest_index import suggest_index
 
 router = APIRouter()
 
@@ -12,21 +18,55 @@ router = APIRouter()
 async def create_request(
     body: RequestCreate,
     user: dict = Depends(get_current_user),
-    db=Depends(get_db),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
 ):
     try:
-        result = request_service.create_request(
-            conn=db,
+        result = await db_writer.run(
+            request_service.create_request,
             user_id=user["user_id"],
             username=user["username"],
             tmdb_id=body.tmdb_id,
             media_type=body.media_type,
             title=body.title,
             poster_path=body.poster_path,
+            idempotency_key=idempotency_key,
         )
-        return result
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
+    # Warm the detail caches so the admin review of this request opens instantly
+    prefetch_warmer.schedule(body.media_type, body.tmdb_id)
+    suggest_index.add(body.tmdb_id, body.media_type, body.title, None, body.poster_path)
+    return result
+
+
+@router.post("/import", status_code=202)
+async def start_import(
+    body: BulkImportCreate,
+    user: dict = Depends(get_current_user),
+):
+    """Start a bulk import of a CSV or JSON title list; poll the returned job for progress."""
+    if body.format not in ("csv", "json"):
+        raise HTTPException(status_code=400, detail="Format must be 'csv' or 'json'")
+    try:
+        entries = parse_import(body.content, body.format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        job = bulk_importer.start(user, entries)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return job.summary()
+
+
+@router.get("/import/{job_id}")
+async def get_import(
+    job_id: str,
+    user: dict = Depends(get_current_user),
+):
+    job = bulk_importer.get(job_id, user["user_id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return FastJSONResponse(job.to_dict())
 
 
 @router.get("", response_model=PaginatedResponse)
@@ -37,7 +77,7 @@ async def get_my_requests(
     user: dict = Depends(get_current_user),
     db=Depends(get_db),
 ):
-    return request_service.get_user_requests(db, user["user_id"], status, page, limit)
+    return FastJSONResponse(request_service.get_user_requests(db, user["user_id"], status, page, limit))
 
 
 @router.get("/{request_id}", response_model=RequestResponse)
@@ -54,14 +94,27 @@ async def get_request(
     return result
 
 
+@router.get("/{request_id}/history", response_model=list[RequestHistoryEntry])
+async def get_request_history(
+    request_id: int,
+    user: dict = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    result = request_service.get_request_by_id(db, request_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Request not found")
+    if result["user_id"] != user["user_id"] and not user.get("is_admin"):
+        raise HTTPException(status_code=403, detail="Access denied")
+    return get_history(db, request_id)
+
+
 @router.delete("/{request_id}")
 async def cancel_request(
     request_id: int,
     user: dict = Depends(get_current_user),
-    db=Depends(get_db),
 ):
     try:
-        request_service.delete_request(db, request_id, user["user_id"])
+        await db_writer.run(request_service.delete_request, request_id, user["user_id"])
         return {"message": "Request cancelled"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,20 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 import httpx
 import logging
 
 from app.dependencies import get_current_user
-from app.schemas import TMDBSearchResult, TMDBMovieDetail, TMDBTvDetail
+from app.schemas import TMDBMovieDetail, TMDBTvDetail, TMDBSuggestion
+from app.serialization import FastJSONResponse
+from app.services.cache import get_cache
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.rate_limiter import is_rate_limited
+from app.services import tmdb_metadata
 from app.services.tmdb_client import tmdb_client
-from app.services.jellyfin_client import jellyfin_client
+from app.services.jellyfin_client import MATCH_FIELDS, jellyfin_client
+from app.services.library_catalog import library_catalog
 from app.services.request_service import get_request_for_tmdb
+from app.services.suggest_index import normalize_title, release_year, suggest_index
+from app.services.title_matching import tmdb_match_fields
+from app.services.tv_availability import library_status, season_availability
 from app.database import get_db
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Upstream suggestions per normalized prefix, for prefixes the local index can't fill
+suggest_cache = get_cache("tmdb_suggest", ttl=600, max_entries=2048)
+# Latest in-flight upstream suggest call per user; a newer keystroke supersedes it
+_suggest_inflight: dict[str, asyncio.Task] = {}
+
+
+async def check_in_library(
+    user: dict, title: str, tmdb_id: int, media_type: str, details: dict | None = None
+) -> bool | None:
+    """Check if a title exists in the Jellyfin library by searching and matching TMDB ID.
 
-async def check_in_library(user: dict, title: str, tmdb_id: int, media_type: str) -> bool:
-    """Check if a title exists in the Jellyfin library by searching and matching TMDB ID."""
+    Answered from the library catalog while it is fresh, where ``details`` (a
+    TMDB result) also lets items without a TMDB id match by IMDb/TVDB id or
+    title and year; otherwise searches Jellyfin as the user. Returns None
+    (unknown) when Jellyfin is unavailable.
+    """
+    if library_catalog.is_fresh():
+        fields = tmdb_match_fields(details) if details else {"title": title}
+        return library_catalog.match(tmdb_id, media_type, **fields) is not None
     try:
         item_type = "Movie" if media_type == "movie" else "Series"
         data = await jellyfin_client.get_items(
@@ -23,15 +50,21 @@ async def check_in_library(user: dict, title: str, tmdb_id: int, media_type: str
             include_item_types=item_type,
             search_term=title,
             limit=10,
+            fields=MATCH_FIELDS,
+            enable_images=False,
+            enable_user_data=False,
+            site="check_in_library",
         )
         for item in data.get("Items", []):
             provider_ids = item.get("ProviderIds", {})
             if str(provider_ids.get("Tmdb", "")) == str(tmdb_id):
                 return True
         return False
+    except CircuitOpenError:
+        return None
     except Exception:
         logger.debug("Failed to check Jellyfin library for %s", title)
-        return False
+        return None
 
 
 @router.get("/search")
@@ -54,9 +87,13 @@ async def search(
         else:
             data = await tmdb_client.search_multi(query, page)
             results = data.get("results", [])
-    except httpx.HTTPStatusError:
+    except httpx.HTTPError as e:
+        if is_rate_limited(e):
+            raise HTTPException(status_code=503, detail="TMDB rate limit reached, try again shortly")
         raise HTTPException(status_code=502, detail="TMDB API error")
 
+    suggest_index.add_tmdb_results(results)
+
     search_results = []
     for r in results:
         media_type = r.get("media_type", "movie")
@@ -65,26 +102,109 @@ async def search(
         release_date = r.get("release_date") or r.get("first_air_date")
 
         existing_request = get_request_for_tmdb(db, tmdb_id, media_type, user["user_id"])
-        in_library = await check_in_library(user, title, tmdb_id, media_type)
-
-        search_results.append(TMDBSearchResult(
-            tmdb_id=tmdb_id,
-            media_type=media_type,
-            title=title,
-            overview=r.get("overview"),
-            poster_path=r.get("poster_path"),
-            release_date=release_date,
-            vote_average=r.get("vote_average"),
-            existing_request=existing_request,
-            already_in_library=in_library,
-        ))
-
-    return {
+        in_library = await check_in_library(user, title, tmdb_id, media_type, r)
+
+        # Same shape as TMDBSearchResult, built directly to skip per-item validation
+        search_results.append({
+            "tmdb_id": tmdb_id,
+            "media_type": media_type,
+            "title": title,
+            "overview": r.get("overview"),
+            "poster_path": r.get("poster_path"),
+            "release_date": release_date,
+            "vote_average": r.get("vote_average"),
+            "already_in_library": in_library,
+            "existing_request": existing_request,
+        })
+
+    return FastJSONResponse({
         "results": search_results,
         "page": data.get("page", 1),
         "total_pages": data.get("total_pages", 1),
         "total_results": data.get("total_results", 0),
-    }
+    })
+
+
+async def _fetch_suggestions(query: str, media_type: str | None) -> list[dict]:
+    if media_type == "movie":
+        data = await tmdb_client.search_movies(query)
+        results = [{**r, "media_type": "movie"} for r in data.get("results", [])]
+    elif media_type == "tv":
+        data = await tmdb_client.search_tv(query)
+        results = [{**r, "media_type": "tv"} for r in data.get("results", [])]
+    else:
+        data = await tmdb_client.search_multi(query)
+        results = data.get("results", [])
+    suggest_index.add_tmdb_results(results)
+    return [
+        {
+            "tmdb_id": r["id"],
+            "media_type": r["media_type"],
+            "title": r.get("title") or r.get("name", ""),
+            "year": release_year(r),
+            "poster_path": r.get("poster_path"),
+        }
+        for r in results
+    ]
+
+
+async def _wait_unless_disconnected(request: Request, task: asyncio.Task) -> bool:
+    """Wait for ``task``; cancel it if the client disconnects first."""
+    while not task.done():
+        if await request.is_disconnected():
+            task.cancel()
+            return False
+        await asyncio.wait({task}, timeout=0.1)
+    return not task.cancelled()
+
+
+@router.get("/suggest", response_model=list[TMDBSuggestion])
+async def suggest(
+    request: Request,
+    query: str = Query(..., min_length=1),
+    limit: int = Query(8, ge=1, le=20),
+    type: str | None = Query(None, pattern="^(movie|tv)$"),
+    user: dict = Depends(get_current_user),
+):
+    """Lightweight title suggestions: no library lookups, served locally when possible."""
+    results = suggest_index.search(query, limit, type)
+    prefix = normalize_title(query)
+    if len(results) >= limit or len(prefix) < 3:
+        return results
+    # A shorter prefix already went upstream and its results are in the index;
+    # only go back to TMDB if they don't cover what the user is typing now.
+    if results and any((prefix[:n], type) in suggest_cache for n in range(3, len(prefix))):
+        return results
+
+    cache_key = (prefix, type)
+    upstream = suggest_cache.get(cache_key)
+    if upstream is None:
+        previous = _suggest_inflight.get(user["user_id"])
+        if previous and not previous.done():
+            previous.cancel()
+        task = asyncio.create_task(_fetch_suggestions(query, type))
+        _suggest_inflight[user["user_id"]] = task
+        try:
+            completed = await _wait_unless_disconnected(request, task)
+        finally:
+            if _suggest_inflight.get(user["user_id"]) is task:
+                del _suggest_inflight[user["user_id"]]
+        if not completed or task.cancelled():
+            return results
+        if task.exception() is not None:
+            logger.debug("Upstream suggest failed for %r: %s", query, task.exception())
+            return results
+        upstream = task.result()
+        suggest_cache.set(cache_key, upstream)
+
+    seen = {(r["media_type"], r["tmdb_id"]) for r in results}
+    for r in upstream:
+        if len(results) >= limit:
+            break
+        if (r["media_type"], r["tmdb_id"]) not in seen:
+            seen.add((r["media_type"], r["tmdb_id"]))
+            results.append(r)
+    return results
 
 
 @router.get("/movie/{tmdb_id}", response_model=TMDBMovieDetail)
@@ -94,10 +214,14 @@ async def get_movie(
     db=Depends(get_db),
 ):
     try:
-        data = await tmdb_client.get_movie_details(tmdb_id)
+        data = await tmdb_metadata.get_movie_details(tmdb_id)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="Movie not found")
+        if is_rate_limited(e):
+            raise HTTPException(status_code=503, detail="TMDB rate limit reached, try again shortly")
+        raise HTTPException(status_code=502, detail="TMDB API error")
+    except httpx.HTTPError:
         raise HTTPException(status_code=502, detail="TMDB API error")
 
     cast = [
@@ -106,7 +230,7 @@ async def get_movie(
     ]
 
     existing_request = get_request_for_tmdb(db, tmdb_id, "movie", user["user_id"])
-    in_library = await check_in_library(user, data.get("title", ""), tmdb_id, "movie")
+    in_library = await check_in_library(user, data.get("title", ""), tmdb_id, "movie", data)
 
     return TMDBMovieDetail(
         tmdb_id=data["id"],
@@ -132,10 +256,14 @@ async def get_tv_show(
     db=Depends(get_db),
 ):
     try:
-        data = await tmdb_client.get_tv_details(tmdb_id)
+        data = await tmdb_metadata.get_tv_details(tmdb_id)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="TV show not found")
+        if is_rate_limited(e):
+            raise HTTPException(status_code=503, detail="TMDB rate limit reached, try again shortly")
+        raise HTTPException(status_code=502, detail="TMDB API error")
+    except httpx.HTTPError:
         raise HTTPException(status_code=502, detail="TMDB API error")
 
     cast = [
@@ -144,7 +272,17 @@ async def get_tv_show(
     ]
 
     existing_request = get_request_for_tmdb(db, tmdb_id, "tv", user["user_id"])
-    in_library = await check_in_library(user, data.get("name", ""), tmdb_id, "tv")
+    match = library_catalog.match(tmdb_id, "tv", **tmdb_match_fields(data))
+    seasons, status = [], None
+    if match is not None and match.seasons is not None:
+        # Only a show with every aired episode counts as in the library; the rest can be requested
+        seasons = season_availability(data, match.seasons)
+        status = library_status(seasons)
+        in_library = status == "available"
+    elif match is not None:
+        in_library = True
+    else:
+        in_library = await check_in_library(user, data.get("name", ""), tmdb_id, "tv", data)
 
     return TMDBTvDetail(
         tmdb_id=data["id"],
@@ -161,4 +299,6 @@ async def get_tv_show(
         cast=cast,
         existing_request=existing_request,
         already_in_library=in_library,
+        seasons=seasons,
+        library_status=status or ("available" if in_library else None),
     )
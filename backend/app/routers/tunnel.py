@@ -1,8 +1,6 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
-from pyngrok import ngrok, conf as ngrok_conf
-from pyngrok.exception import PyngrokError
 
 from app.config import settings
 from app.dependencies import require_admin
@@ -14,6 +12,14 @@ logger = logging.getLogger(__name__)
 _active_tunnel = None
 
 
+def _pyngrok():
+    """Import pyngrok on first use; it is only needed once a tunnel is started."""
+    from pyngrok import ngrok, conf as ngrok_conf
+    from pyngrok.exception import PyngrokError
+
+    return ngrok, ngrok_conf, PyngrokError
+
+
 def _get_display_url():
     """Return the canonical public URL, preferring the configured custom domain."""
     if settings.ngrok_domain:
@@ -24,6 +30,7 @@ def _get_display_url():
 def _get_status():
     global _active_tunnel
     if _active_tunnel:
+        ngrok, _, _ = _pyngrok()
         try:
             tunnels = ngrok.get_tunnels()
             if tunnels:
@@ -53,6 +60,7 @@ async def start_tunnel(admin: dict = Depends(require_admin)):
             detail="NGROK_AUTHTOKEN not set. Add it to your .env file.",
         )
 
+    ngrok, ngrok_conf, PyngrokError = _pyngrok()
     try:
         ngrok_conf.get_default().auth_token = settings.ngrok_authtoken
 
@@ -82,6 +90,7 @@ async def start_tunnel(admin: dict = Depends(require_admin)):
 async def stop_tunnel(admin: dict = Depends(require_admin)):
     global _active_tunnel
 
+    ngrok, _, PyngrokError = _pyngrok()
     try:
         ngrok.kill()
         url = _get_display_url()
@@ -28,6 +28,11 @@ class RequestCreate(BaseModel):
     poster_path: Optional[str] = None
 
 
+class BulkImportCreate(BaseModel):
+    format: str = "csv"  # "csv" or "json"
+    content: str
+
+
 class RequestResponse(BaseModel):
     id: int
     user_id: str
@@ -42,6 +47,43 @@ class RequestResponse(BaseModel):
     updated_at: str
 
 
+class RequestHistoryEntry(BaseModel):
+    id: int
+    old_status: str
+    new_status: str
+    changed_by: str
+    note: Optional[str]
+    created_at: Optional[str]
+    archived: bool = False
+
+
+class TitleRequestResponse(BaseModel):
+    id: int
+    tmdb_id: int
+    media_type: str
+    title: str
+    poster_path: Optional[str]
+    status: str
+    pending: int
+    approved: int
+    denied: int
+    fulfilled: int
+    vote_count: int
+    subscribers: int
+    first_requested_at: Optional[str]
+    last_requested_at: Optional[str]
+    updated_requests: Optional[int] = None
+
+
+class TitleSubscriber(BaseModel):
+    id: int
+    user_id: str
+    username: str
+    status: str
+    admin_note: Optional[str]
+    created_at: str
+
+
 class RequestUpdate(BaseModel):
     status: str
     admin_note: Optional[str] = None
@@ -64,10 +106,18 @@ class TMDBSearchResult(BaseModel):
     poster_path: Optional[str] = None
     release_date: Optional[str] = None
     vote_average: Optional[float] = None
-    already_in_library: bool = False
+    already_in_library: Optional[bool] = False
     existing_request: Optional[str] = None
 
 
+class TMDBSuggestion(BaseModel):
+    tmdb_id: int
+    media_type: str
+    title: str
+    year: Optional[int] = None
+    poster_path: Optional[str] = None
+
+
 class TMDBMovieDetail(BaseModel):
     tmdb_id: int
     title: str
@@ -80,10 +130,19 @@ class TMDBMovieDetail(BaseModel):
     vote_average: Optional[float] = None
     vote_count: Optional[int] = None
     cast: list[dict] = []
-    already_in_library: bool = False
+    already_in_library: Optional[bool] = False
     existing_request: Optional[str] = None
 
 
+class SeasonAvailability(BaseModel):
+    season_number: int
+    name: Optional[str] = None
+    episode_count: int
+    aired_episodes: int
+    available_episodes: int
+    status: str  # available, partial, missing or unaired
+
+
 class TMDBTvDetail(BaseModel):
     tmdb_id: int
     title: str
@@ -97,8 +156,11 @@ class TMDBTvDetail(BaseModel):
     vote_average: Optional[float] = None
     vote_count: Optional[int] = None
     cast: list[dict] = []
-    already_in_library: bool = False
+    already_in_library: Optional[bool] = False
     existing_request: Optional[str] = None
+    # From the library catalog's episode index; empty when it is unavailable
+    seasons: list[SeasonAvailability] = []
+    library_status: Optional[str] = None  # "available" or "partial" when the show is in the library
 
 
 # --- Library ---
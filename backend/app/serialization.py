@@ -0,0 +1,31 @@
+"""Fast JSON encoding for hot list endpoints.
+
+Routes that return trusted data (rows we just read from SQLite, dicts we built
+ourselves) can return ``FastJSONResponse`` directly. FastAPI then skips
+re-validating the payload against ``response_model`` and the
+``jsonable_encoder`` pass, and the body is encoded in one step. ``orjson`` is used
+when installed, with the stdlib ``json`` module as a fallback.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
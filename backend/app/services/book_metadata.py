@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import re
+
+from app.services.cache import get_cache
+from app.services.openlibrary_client import (
+    openlibrary_client,
+    format_work_key,
+    parse_work_id,
+)
+from app.services.rate_limiter import PRIORITY_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+work_cache = get_cache("openlibrary_works", ttl=6 * 3600, max_entries=2048)
+author_cache = get_cache("openlibrary_authors", ttl=24 * 3600, max_entries=8192)
+search_doc_cache = get_cache("openlibrary_search_docs", ttl=6 * 3600, max_entries=8192)
+
+
+def remember_search_docs(docs: list[dict]) -> None:
+    """Keep search docs around: they carry the edition/page/year fields works lack."""
+    for doc in docs:
+        try:
+            work_id = parse_work_id(doc.get("key", ""))
+        except (ValueError, IndexError):
+            continue
+        search_doc_cache.set(work_id, doc)
+        for key, name in zip(doc.get("author_key") or [], doc.get("author_name") or []):
+            if key not in author_cache:
+                author_cache.set(key, name)
+
+
+async def get_work(work_id: int, priority: int = PRIORITY_INTERACTIVE) -> dict:
+    work_key = format_work_key(work_id)
+    return await work_cache.get_or_load(
+        work_id, lambda: openlibrary_client.get_work_details(work_key, priority)
+    )
+
+
+async def get_search_doc(work_id: int, priority: int = PRIORITY_INTERACTIVE) -> dict | None:
+    async def load() -> dict | None:
+        data = await openlibrary_client.search_books(
+            f"key:/works/{format_work_key(work_id)}", limit=1, priority=priority
+        )
+        docs = data.get("docs", [])
+        remember_search_docs(docs)
+        return docs[0] if docs else None
+
+    return await search_doc_cache.get_or_load(work_id, load)
+
+
+async def _author_name(author_key: str, priority: int) -> str:
+    async def load() -> str:
+        data = await openlibrary_client.get_author(author_key, priority)
+        return data.get("name") or data.get("personal_name") or author_key
+
+    try:
+        return await author_cache.get_or_load(author_key, load)
+    except Exception:
+        logger.debug("Failed to resolve Open Library author %s", author_key, exc_info=True)
+        return author_key
+
+
+async def resolve_authors(author_keys: list[str], priority: int = PRIORITY_INTERACTIVE) -> list[str]:
+    """Resolve author keys to names concurrently, fetching each distinct key once."""
+    unique = list(dict.fromkeys(k for k in author_keys if k))
+    names = await asyncio.gather(*(_author_name(k, priority) for k in unique))
+    return list(names)
+
+
+def _author_keys(work: dict) -> list[str]:
+    keys = []
+    for a in work.get("authors", []):
+        author = a.get("author") if isinstance(a, dict) else None
+        if isinstance(author, dict):
+            keys.append(author.get("key", "").split("/")[-1])
+        elif author:
+            keys.append(str(author))
+    return keys
+
+
+def _year(value) -> int | None:
+    match = re.search(r"\d{4}", str(value or ""))
+    return int(match.group()) if match else None
+
+
+async def get_book(work_id: int, priority: int = PRIORITY_INTERACTIVE) -> dict:
+    """Work details merged with its search doc, authors resolved to names.
+
+    The work and its search doc are fetched concurrently; a missing search doc
+    only leaves the edition/page/rating fields empty.
+    """
+    work, doc = await asyncio.gather(
+        get_work(work_id, priority),
+        get_search_doc(work_id, priority),
+        return_exceptions=True,
+    )
+    if isinstance(work, BaseException):
+        raise work
+    if isinstance(doc, BaseException):
+        logger.debug("No search doc for work %s: %s", work_id, doc)
+        doc = None
+    doc = doc or {}
+
+    description = work.get("description")
+    if isinstance(description, dict):
+        description = description.get("value", "")
+
+    return {
+        "title": work.get("title") or doc.get("title", ""),
+        "authors": await resolve_authors(_author_keys(work), priority),
+        "description": description,
+        "covers": work.get("covers") or ([doc["cover_i"]] if doc.get("cover_i") else []),
+        "subjects": [s for s in work.get("subjects", []) if isinstance(s, str)],
+        "first_publish_year": doc.get("first_publish_year") or _year(work.get("first_publish_date")),
+        "page_count": doc.get("number_of_pages_median"),
+        "edition_count": doc.get("edition_count"),
+        "ratings_average": doc.get("ratings_average"),
+    }
@@ -0,0 +1,356 @@
+"""Bulk import of watchlists into requests.
+
+An import runs as a background job in the worker that accepted it:
+
+1. parse a CSV or JSON list of titles (optionally with year, type or TMDB id),
+2. resolve entries to TMDB titles with ``bulk_import_concurrency`` lookups in
+   flight, at background priority and through a shared resolution cache,
+3. drop duplicates and titles the library catalog already has,
+4. insert every remaining request in one transaction on the DB writer.
+
+Progress and per-entry outcomes are polled through ``GET
+/api/requests/import/{job_id}``.
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import httpx
+
+from app.config import settings
+from app.services import request_service, tmdb_metadata
+from app.services.cache import get_cache
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.db_writer import db_writer
+from app.services.library_catalog import library_catalog
+from app.services.prefetch import prefetch_warmer
+from app.services.rate_limiter import PRIORITY_BACKGROUND
+from app.services.suggest_index import normalize_title, release_year, suggest_index
+from app.services.tmdb_client import tmdb_client
+
+logger = logging.getLogger(__name__)
+
+# (normalized title, year, media type) -> best TMDB match or None
+resolve_cache = get_cache("tmdb_import_resolve", ttl=6 * 3600, max_entries=8192)
+
+MEDIA_TYPES = {
+    "movie": "movie", "movies": "movie", "film": "movie",
+    "tv": "tv", "series": "tv", "show": "tv", "tvshow": "tv",
+}
+# Finished jobs stay pollable this long
+JOB_RETENTION = 3600
+
+
+@dataclass
+class ImportEntry:
+    line: int
+    title: str
+    year: int | None = None
+    media_type: str | None = None
+    tmdb_id: int | None = None
+
+
+def _year(value) -> int | None:
+    text = str(value or "").strip()[:4]
+    return int(text) if text.isdigit() and 1870 <= int(text) <= 2100 else None
+
+
+def _media_type(value) -> str | None:
+    return MEDIA_TYPES.get(str(value or "").strip().lower())
+
+
+def _tmdb_id(value) -> int | None:
+    text = str(value or "").strip()
+    return int(text) if text.isdigit() else None
+
+
+def _entry(line: int, row: dict) -> ImportEntry | None:
+    title = str(row.get("title") or row.get("name") or "").strip()
+    tmdb_id = _tmdb_id(row.get("tmdb_id") or row.get("tmdb"))
+    if not title and not tmdb_id:
+        return None
+    return ImportEntry(
+        line,
+        title,
+        _year(row.get("year")),
+        _media_type(row.get("media_type") or row.get("type")),
+        tmdb_id,
+    )
+
+
+def _parse_csv(content: str) -> list[ImportEntry]:
+    rows = list(csv.reader(io.StringIO(content)))
+    if not rows:
+        return []
+    header = [c.strip().lower() for c in rows[0]]
+    if "title" in header or "name" in header or "tmdb_id" in header:
+        return [
+            entry for line, row in enumerate(rows[1:], start=2)
+            if (entry := _entry(line, dict(zip(header, row))))
+        ]
+    # No header: title[, year[, type]]
+    return [
+        entry for line, row in enumerate(rows, start=1)
+        if row and (entry := _entry(line, dict(zip(("title", "year", "type"), row))))
+    ]
+
+
+def _parse_json(content: str) -> list[ImportEntry]:
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        raise ValueError("JSON import must be a list of titles or objects")
+    entries = []
+    for line, item in enumerate(data, start=1):
+        row = {"title": item} if isinstance(item, str) else item
+        if isinstance(row, dict) and (entry := _entry(line, row)):
+            entries.append(entry)
+    return entries
+
+
+def parse_import(content: str, format: str) -> list[ImportEntry]:
+    """Parse an uploaded list; raises ``ValueError`` for unusable input."""
+    entries = _parse_json(content) if format == "json" else _parse_csv(content)
+    if not entries:
+        raise ValueError("No titles found in the import")
+    if len(entries) > settings.bulk_import_max_titles:
+        raise ValueError(f"Imports are limited to {settings.bulk_import_max_titles} titles")
+    return entries
+
+
+def _pick_match(results: list[dict], entry: ImportEntry) -> dict | None:
+    """Best result by exact (normalized) title and release year, in TMDB's relevance order."""
+    wanted = normalize_title(entry.title)
+    if not wanted:
+        # Nothing to compare titles on; an empty key would "match" any other empty key
+        return None
+    best, best_score = None, 0
+    for result in results:
+        if entry.media_type and result["media_type"] != entry.media_type:
+            continue
+        score = 2 if normalize_title(result.get("title") or result.get("name", "")) == wanted else 0
+        year = release_year(result)
+        if entry.year and year:
+            score += 2 if year == entry.year else 1 if abs(year - entry.year) == 1 else 0
+        if score > best_score:
+            best, best_score = result, score
+    if best is None and results and not entry.year:
+        # Nothing matched exactly; without a year to contradict it, trust TMDB's top hit
+        return results[0]
+    return best
+
+
+async def _search(entry: ImportEntry) -> dict | None:
+    if entry.media_type == "movie":
+        data = await tmdb_client.search_movies(entry.title, priority=PRIORITY_BACKGROUND, year=entry.year)
+        results = [{**r, "media_type": "movie"} for r in data.get("results", [])]
+    elif entry.media_type == "tv":
+        data = await tmdb_client.search_tv(entry.title, priority=PRIORITY_BACKGROUND, year=entry.year)
+        results = [{**r, "media_type": "tv"} for r in data.get("results", [])]
+    else:
+        data = await tmdb_client.search_multi(entry.title, priority=PRIORITY_BACKGROUND)
+        results = data.get("results", [])
+    suggest_index.add_tmdb_results(results)
+    match = _pick_match(results, entry)
+    if match is None:
+        return None
+    return {
+        "tmdb_id": match["id"],
+        "media_type": match["media_type"],
+        "title": match.get("title") or match.get("name", ""),
+        "poster_path": match.get("poster_path"),
+    }
+
+
+async def _by_id(entry: ImportEntry) -> dict | None:
+    media_type = entry.media_type or "movie"
+    loader = tmdb_metadata.get_movie_details if media_type == "movie" else tmdb_metadata.get_tv_details
+    try:
+        details = await loader(entry.tmdb_id, PRIORITY_BACKGROUND)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
+    return {
+        "tmdb_id": entry.tmdb_id,
+        "media_type": media_type,
+        "title": details.get("title") or details.get("name") or entry.title,
+        "poster_path": details.get("poster_path"),
+    }
+
+
+class UnresolvableEntry(ValueError):
+    """An entry with nothing to search TMDB for."""
+
+
+async def resolve(entry: ImportEntry) -> dict | None:
+    if entry.tmdb_id:
+        return await _by_id(entry)
+    title_key = normalize_title(entry.title)
+    if not title_key:
+        raise UnresolvableEntry("Title has no letters or digits to search for")
+    key = (title_key, entry.year, entry.media_type)
+    return await resolve_cache.get_or_load(key, lambda: _search(entry))
+
+
+@dataclass
+class ImportJob:
+    id: str
+    user_id: str
+    username: str
+    items: list[dict]
+    status: str = "queued"  # queued, resolving, saving, done or failed
+    resolved: int = 0
+    error: str | None = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    finished_at: str | None = None
+    finished: float | None = None  # monotonic, for retention
+
+    def summary(self) -> dict:
+        counts: dict[str, int] = {}
+        for item in self.items:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": len(self.items),
+            "resolved": self.resolved,
+            "counts": counts,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    def to_dict(self) -> dict:
+        return {**self.summary(), "items": self.items}
+
+
+class BulkImporter:
+    """Runs import jobs and keeps them pollable for ``JOB_RETENTION`` seconds."""
+
+    def __init__(self, concurrency: int = 8):
+        self.concurrency = concurrency
+        self._jobs: dict[str, ImportJob] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - JOB_RETENTION
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def start(self, user: dict, entries: list[ImportEntry]) -> ImportJob:
+        self._prune()
+        if any(j.user_id == user["user_id"] and not j.finished for j in self._jobs.values()):
+            raise ValueError("An import is already running")
+        items = [
+            {
+                "line": e.line,
+                "input": e.title,
+                "year": e.year,
+                "status": "pending",
+                "tmdb_id": None,
+                "media_type": None,
+                "title": None,
+                "poster_path": None,
+                "request_id": None,
+                "detail": None,
+            }
+            for e in entries
+        ]
+        job = ImportJob(uuid.uuid4().hex, user["user_id"], user["username"], items)
+        self._jobs[job.id] = job
+        task = asyncio.get_running_loop().create_task(self._run(job, entries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str, user_id: str) -> ImportJob | None:
+        job = self._jobs.get(job_id)
+        return job if job and job.user_id == user_id else None
+
+    async def _resolve_all(self, job: ImportJob, entries: list[ImportEntry]) -> None:
+        pairs = iter(zip(job.items, entries))
+
+        async def worker() -> None:
+            for item, entry in pairs:
+                try:
+                    match = await resolve(entry)
+                except UnresolvableEntry as e:
+                    item.update(status="not_found", detail=str(e))
+                except (CircuitOpenError, httpx.HTTPError) as e:
+                    item.update(status="error", detail=str(e) or type(e).__name__)
+                else:
+                    if match is None:
+                        item["status"] = "not_found"
+                    else:
+                        item.update(match, status="resolved")
+                job.resolved += 1
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(entries)))))
+
+    async def _run(self, job: ImportJob, entries: list[ImportEntry]) -> None:
+        started = time.monotonic()
+        try:
+            job.status = "resolving"
+            await self._resolve_all(job, entries)
+
+            job.status = "saving"
+            seen = set()
+            to_insert = []
+            for item in job.items:
+                if item["status"] != "resolved":
+                    continue
+                key = (item["tmdb_id"], item["media_type"])
+                if key in seen:
+                    item["status"] = "duplicate"
+                elif library_catalog.contains(*key):
+                    item["status"] = "in_library"
+                else:
+                    to_insert.append(item)
+                seen.add(key)
+
+            created = await db_writer.run(
+                request_service.create_requests_bulk, job.user_id, job.username, to_insert
+            )
+            for item in to_insert:
+                request_id = created.get((item["tmdb_id"], item["media_type"]))
+                item.update(status="created" if request_id else "already_requested", request_id=request_id)
+                if request_id:
+                    prefetch_warmer.schedule(item["media_type"], item["tmdb_id"])
+            job.status = "done"
+            self.completed += 1
+            logger.info(
+                "Import %s for %s: %d titles, %d requests created in %.1fs",
+                job.id, job.username, len(job.items), len(created), time.monotonic() - started,
+            )
+        except Exception as e:
+            logger.exception("Import %s failed", job.id)
+            job.status = "failed"
+            job.error = str(e) or type(e).__name__
+            self.failed += 1
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            job.finished = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "running": sum(1 for j in self._jobs.values() if not j.finished),
+            "completed": self.completed,
+            "failed": self.failed,
+            "resolve_cache": resolve_cache.stats(),
+        }
+
+
+bulk_importer = BulkImporter(concurrency=settings.bulk_import_concurrency)
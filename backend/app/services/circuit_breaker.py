@@ -0,0 +1,185 @@
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} is unavailable (circuit open)")
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Transport errors and 5xx responses count against the breaker; 4xx do not."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """Rolling error-rate circuit breaker with half-open probing and adaptive timeouts.
+
+    The breaker opens once at least ``min_requests`` calls in the last ``window``
+    seconds failed at a rate of ``error_threshold`` or more. After ``open_seconds``
+    a single probe call is let through; its outcome closes or re-opens the circuit.
+    The request timeout tracks recent latency (p95 * ``timeout_multiplier``),
+    clamped to ``[min_timeout, max_timeout]``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float = 60.0,
+        min_requests: int = 5,
+        error_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        min_timeout: float = 2.0,
+        max_timeout: float = 10.0,
+        timeout_multiplier: float = 4.0,
+    ):
+        self.name = name
+        self.window = window
+        self.min_requests = min_requests
+        self.error_threshold = error_threshold
+        self.open_seconds = open_seconds
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+
+        self.state = CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._latencies: deque[float] = deque(maxlen=50)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / len(self._outcomes)
+
+    @property
+    def timeout(self) -> float:
+        if len(self._latencies) < 5:
+            return self.max_timeout
+        ordered = sorted(self._latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(self.min_timeout, min(self.max_timeout, p95 * self.timeout_multiplier))
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected outright (no probe slot available)."""
+        if self.state == OPEN:
+            return time.monotonic() - self._opened_at < self.open_seconds
+        return self.state == HALF_OPEN and self._probe_in_flight
+
+    def before_request(self) -> None:
+        now = time.monotonic()
+        if self.state == OPEN:
+            remaining = self.open_seconds - (now - self._opened_at)
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, remaining)
+            self.state = HALF_OPEN
+            logger.info("Circuit %s half-open, probing upstream", self.name)
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.open_seconds)
+            self._probe_in_flight = True
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self._opened_at = now
+        self.times_opened += 1
+        logger.warning(
+            "Circuit %s opened (error rate %.0f%% over %d calls)",
+            self.name, self._error_rate() * 100, len(self._outcomes),
+        )
+
+    def record_success(self, latency: float | None = None) -> None:
+        now = time.monotonic()
+        if latency is not None:
+            self._latencies.append(latency)
+        if self.state == HALF_OPEN:
+            logger.info("Circuit %s closed, upstream recovered", self.name)
+            self.state = CLOSED
+            self._probe_in_flight = False
+            self._outcomes.clear()
+        self._outcomes.append((now, True))
+        self._prune(now)
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            self._open(now)
+            return
+        self._outcomes.append((now, False))
+        self._prune(now)
+        if (
+            self.state == CLOSED
+            and len(self._outcomes) >= self.min_requests
+            and self._error_rate() >= self.error_threshold
+        ):
+            self._open(now)
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without recording an outcome."""
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+
+    @asynccontextmanager
+    async def guard(self):
+        """Wrap one upstream call: reject it if open, then record its outcome."""
+        self.before_request()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_upstream_failure(e):
+                self.record_failure()
+            else:
+                self.record_success(time.monotonic() - started)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success(time.monotonic() - started)
+
+    def stats(self) -> dict:
+        self._prune(time.monotonic())
+        return {
+            "state": self.state,
+            "calls_in_window": len(self._outcomes),
+            "error_rate": round(self._error_rate(), 3),
+            "timeout": round(self.timeout, 2),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    if name not in breakers:
+        breakers[name] = CircuitBreaker(name, **kwargs)
+    return breakers[name]
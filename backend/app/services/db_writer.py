@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app import database
+
+logger = logging.getLogger(__name__)
+
+
+class _BatchConnection:
+    """The connection handed to a queued write.
+
+    Operations are ordinary service functions that commit (or roll back) when
+    they finish; inside a batch the writer owns the transaction, so those calls
+    are no-ops. An exception raised by the operation undoes only its own
+    savepoint.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class DBWriter:
+    """Single writer with group commit for SQLite write paths.
+
+    ``run(fn, *args)`` queues ``fn(conn, *args)``. One task takes operations
+    from the queue, waits up to ``max_delay`` for more to arrive (or until
+    ``max_batch``), and runs them in one ``BEGIN IMMEDIATE`` transaction on a
+    dedicated connection and thread, each inside its own SAVEPOINT. One commit
+    (and one WAL sync) covers the batch; each caller gets its own result or
+    exception once the commit succeeds.
+
+    Until ``start()`` is called (scripts, tests without the app lifespan),
+    ``run`` executes the operation directly on a fresh connection.
+    """
+
+    def __init__(self, max_batch: int = 64, max_delay: float = 0.002):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._conn = None
+        self.batches = 0
+        self.operations = 0
+        self.failed_operations = 0
+        self.failed_commits = 0
+        self.largest_batch = 0
+        self._batch_sizes: deque[int] = deque(maxlen=1024)
+        self._queue_waits: deque[float] = deque(maxlen=1024)
+        self._commit_times: deque[float] = deque(maxlen=1024)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Finish queued operations, then close the writer connection."""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        if self._conn is not None:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    async def run(self, fn, *args, **kwargs):
+        if not self.running:
+            return await asyncio.to_thread(self._run_direct, fn, args, kwargs)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, args, kwargs, future, time.monotonic()))
+        return await future
+
+    @staticmethod
+    def _run_direct(fn, args, kwargs):
+        conn = database.get_db_connection()
+        try:
+            return fn(conn, *args, **kwargs)
+        finally:
+            conn.close()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            op = await self._queue.get()
+            if op is None:
+                break
+            batch = [op]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    op = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        op = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if op is None:
+                    stopping = True
+                    break
+                batch.append(op)
+
+            started = time.monotonic()
+            for _, _, _, _, queued_at in batch:
+                self._queue_waits.append(started - queued_at)
+            try:
+                outcomes = await loop.run_in_executor(self._executor, self._execute, batch)
+            except Exception as e:
+                # Never leave callers waiting: the batch fails, the writer keeps running
+                logger.exception("DB writer batch of %d write(s) failed", len(batch))
+                self.failed_commits += 1
+                outcomes = [(False, e)] * len(batch)
+                # The connection may be left inside a transaction; start the next batch on a new one
+                await loop.run_in_executor(self._executor, self._discard_connection)
+            self._record_batch(len(batch), time.monotonic() - started)
+
+            for (_, _, _, future, _), (ok, value) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    self.failed_operations += 1
+                    future.set_exception(value)
+
+    def _discard_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                logger.exception("Could not close the DB writer connection")
+
+    def _execute(self, batch: list) -> list[tuple[bool, object]]:
+        try:
+            if self._conn is None:
+                self._conn = database.get_db_connection()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+        except Exception as e:
+            self.failed_commits += 1
+            return [(False, e)] * len(batch)
+
+        proxy = _BatchConnection(conn)
+        outcomes = []
+        try:
+            for fn, args, kwargs, _, _ in batch:
+                conn.execute("SAVEPOINT op")
+                try:
+                    result = fn(proxy, *args, **kwargs)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    outcomes.append((False, e))
+                else:
+                    conn.execute("RELEASE op")
+                    outcomes.append((True, result))
+            conn.commit()
+        except Exception as e:
+            # The transaction itself failed (e.g. disk full): nothing in the batch is kept
+            logger.exception("Group commit of %d write(s) failed", len(batch))
+            self.failed_commits += 1
+            conn.rollback()
+            return [(False, e)] * len(batch)
+        return outcomes
+
+    def _record_batch(self, size: int, seconds: float) -> None:
+        self.batches += 1
+        self.operations += size
+        self.largest_batch = max(self.largest_batch, size)
+        self._batch_sizes.append(size)
+        self._commit_times.append(seconds)
+
+    def stats(self) -> dict:
+        waits = list(self._queue_waits)
+        sizes = list(self._batch_sizes)
+        commits = list(self._commit_times)
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "batches": self.batches,
+            "operations": self.operations,
+            "failed_operations": self.failed_operations,
+            "failed_commits": self.failed_commits,
+            "largest_batch": self.largest_batch,
+            "avg_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else None,
+            "queue_wait_p50_ms": round(_percentile(waits, 0.5) * 1000, 2) if waits else None,
+            "queue_wait_p95_ms": round(_percentile(waits, 0.95) * 1000, 2) if waits else None,
+            "batch_ms_p50": round(_percentile(commits, 0.5) * 1000, 2) if commits else None,
+            "batch_ms_p95": round(_percentile(commits, 0.95) * 1000, 2) if commits else None,
+        }
+
+
+db_writer = DBWriter(
+    max_batch=settings.db_writer_max_batch,
+    max_delay=settings.db_group_commit_ms / 1000,
+)
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+import httpx
+
+from app.config import settings
+from app.database import get_db_connection
+from app.services.jellyfin_client import jellyfin_client
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 5.0
+
+
+async def _probe_jellyfin() -> dict:
+    async with httpx.AsyncClient(timeout=PROBE_TIMEOUT) as client:
+        resp = await client.get(f"{jellyfin_client.base_url}/System/Info/Public")
+    if resp.status_code != 200:
+        return {
+            "status": "error",
+            "url": jellyfin_client.base_url,
+            "detail": f"HTTP {resp.status_code}",
+        }
+    info = resp.json()
+    return {
+        "status": "ok",
+        "url": jellyfin_client.base_url,
+        "server_name": info.get("ServerName"),
+        "version": info.get("Version"),
+    }
+
+
+async def _probe_tmdb() -> dict:
+    async with httpx.AsyncClient(timeout=PROBE_TIMEOUT) as client:
+        resp = await client.get(
+            f"{settings.tmdb_base_url}/configuration",
+            params={"api_key": settings.tmdb_api_key},
+        )
+    return {
+        "status": "ok" if resp.status_code == 200 else "error",
+        "detail": None if resp.status_code == 200 else f"HTTP {resp.status_code}",
+    }
+
+
+def _check_database() -> None:
+    conn = get_db_connection()
+    try:
+        conn.execute("SELECT 1").fetchone()
+    finally:
+        conn.close()
+
+
+async def _probe_database() -> dict:
+    await asyncio.to_thread(_check_database)
+    return {"status": "ok"}
+
+
+class HealthMonitor:
+    """Probes upstream services in the background and keeps the last result of each.
+
+    Every snapshot entry carries the probe outcome plus ``latency_ms``,
+    ``checked_at`` and ``failure_streak`` (consecutive failed probes).
+    """
+
+    def __init__(self, interval: float = 30.0):
+        self.interval = interval
+        self.probes = {
+            "jellyfin": _probe_jellyfin,
+            "tmdb": _probe_tmdb,
+            "database": _probe_database,
+        }
+        self._snapshot: dict[str, dict] = {}
+        self._refreshing: asyncio.Task | None = None
+
+    async def _run_probe(self, name: str) -> None:
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self.probes[name](), timeout=PROBE_TIMEOUT + 1)
+        except Exception as e:
+            result = {"status": "error", "detail": str(e) or type(e).__name__}
+            if name == "jellyfin":
+                result["url"] = jellyfin_client.base_url
+
+        previous = self._snapshot.get(name, {})
+        streak = previous.get("failure_streak", 0)
+        result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        result["checked_at"] = datetime.utcnow().isoformat()
+        result["failure_streak"] = 0 if result["status"] == "ok" else streak + 1
+        self._snapshot[name] = result
+
+    async def _refresh_all(self) -> None:
+        await asyncio.gather(*(self._run_probe(name) for name in self.probes))
+
+    async def refresh(self) -> dict:
+        """Run all probes in parallel now; concurrent callers share one refresh."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._refresh_all())
+        await asyncio.shield(self._refreshing)
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        return {name: dict(result) for name, result in self._snapshot.items()}
+
+    def has_snapshot(self) -> bool:
+        return len(self._snapshot) == len(self.probes)
+
+    async def run(self) -> None:
+        """Background loop: refresh the snapshot every ``interval`` seconds."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Error in health monitor background task")
+            await asyncio.sleep(self.interval)
+
+
+health_monitor = HealthMonitor(interval=settings.health_check_interval)
@@ -1,6 +1,20 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Sequence
+
 import httpx
 
 from app.config import settings
+from app.services.circuit_breaker import get_breaker
+from app.services.jellyfin_stream import EpisodeRecord, ItemStreamDecoder, LibraryItemRecord
+
+logger = logging.getLogger(__name__)
+
+# Per-call-site ``Fields`` projections. Id, Name and Type are always returned.
+DETAIL_FIELDS = ("Overview", "Genres", "CommunityRating", "ProductionYear", "ProviderIds")
+LISTING_FIELDS = ("ProductionYear",)
+MATCH_FIELDS = ("ProductionYear", "ProviderIds")
+COUNT_FIELDS: tuple[str, ...] = ()
 
 
 class JellyfinClient:
@@ -10,39 +24,104 @@ class JellyfinClient:
         self.client_version = "1.0.0"
         self.device_name = "MediaManager-Server"
         self.device_id = "mediamanager-backend-001"
-
-    def _auth_header(self, token: str | None = None) -> str:
-        header = (
+        self.breaker = get_breaker("jellyfin", min_timeout=2.0, max_timeout=10.0)
+        self.measure_payloads = settings.jellyfin_measure_payloads
+        self._payloads: dict[str, dict] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        # Client/device part of the Authorization header, identical on every call
+        self._auth_prefix = (
             f'MediaBrowser Client="{self.client_name}", '
             f'Device="{self.device_name}", '
             f'DeviceId="{self.device_id}", '
             f'Version="{self.client_version}"'
         )
+
+    def _auth_header(self, token: str | None = None) -> str:
         if token:
-            header += f', Token="{token}"'
-        return header
+            return f'{self._auth_prefix}, Token="{token}"'
+        return self._auth_prefix
 
-    async def authenticate(self, username: str, password: str) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.base_url}/Users/AuthenticateByName",
-                json={"Username": username, "Pw": password},
-                headers={
-                    "Authorization": self._auth_header(),
-                    "Content-Type": "application/json",
-                },
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Connection-pooled client, created on first use in the running event loop.
+
+        Reusing connections (and the TLS context) keeps per-call overhead off
+        hot paths like login; timeouts are still set per request from the
+        circuit breaker.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=settings.jellyfin_max_connections,
+                    max_keepalive_connections=settings.jellyfin_max_connections,
+                ),
             )
-            resp.raise_for_status()
-            return resp.json()
+            self._client_loop = loop
+        return self._client
 
-    async def get_user_views(self, user_id: str, token: str) -> list:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/Users/{user_id}/Views",
+    async def aclose(self) -> None:
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+
+    async def _request(
+        self, method: str, path: str, token: str | None = None, site: str | None = None, **kwargs
+    ) -> httpx.Response:
+        async with self.breaker.guard():
+            resp = await self.client.request(
+                method,
+                path,
                 headers={"Authorization": self._auth_header(token)},
+                timeout=self.breaker.timeout,
+                **kwargs,
             )
             resp.raise_for_status()
-            return resp.json().get("Items", [])
+        if self.measure_payloads:
+            self._record_payload(site or path, len(resp.content))
+        return resp
+
+    def _record_payload(self, site: str, size: int) -> None:
+        stats = self._payloads.setdefault(site, {"calls": 0, "bytes": 0, "max_bytes": 0})
+        stats["calls"] += 1
+        stats["bytes"] += size
+        stats["max_bytes"] = max(stats["max_bytes"], size)
+        logger.info("Jellyfin %s response: %d bytes", site, size)
+
+    def payload_stats(self) -> dict:
+        """Response sizes per call site, collected while ``jellyfin_measure_payloads`` is on."""
+        return {
+            site: {**stats, "avg_bytes": round(stats["bytes"] / stats["calls"])}
+            for site, stats in self._payloads.items()
+        }
+
+    @staticmethod
+    def _projection(fields: Sequence[str], enable_images: bool, enable_user_data: bool) -> dict:
+        params = {"Fields": ",".join(fields), "EnableUserData": str(enable_user_data).lower()}
+        if enable_images:
+            params["ImageTypeLimit"] = 1
+            params["EnableImageTypes"] = "Primary,Backdrop"
+        else:
+            params["EnableImages"] = "false"
+        return params
+
+    async def authenticate(self, username: str, password: str) -> dict:
+        resp = await self._request(
+            "POST",
+            "/Users/AuthenticateByName",
+            json={"Username": username, "Pw": password},
+        )
+        return resp.json()
+
+    async def validate_token(self, token: str) -> None:
+        """Cheap authenticated call; raises ``HTTPStatusError`` (401) if the token was revoked."""
+        await self._request("GET", "/System/Info", token)
+
+    async def get_user_views(self, user_id: str, token: str) -> list:
+        resp = await self._request("GET", f"/Users/{user_id}/Views", token)
+        return resp.json().get("Items", [])
 
     async def get_items(
         self,
@@ -55,7 +134,18 @@ class JellyfinClient:
         sort_by: str = "SortName",
         sort_order: str = "Ascending",
         parent_id: str | None = None,
+        fields: Sequence[str] = DETAIL_FIELDS,
+        enable_images: bool = True,
+        enable_user_data: bool = True,
+        site: str = "items",
     ) -> dict:
+        """Query ``/Users/{id}/Items``.
+
+        Callers that only need a few properties should pass a narrower
+        ``fields`` set and turn off images and user data; on large pages that
+        is most of what Jellyfin serializes. ``site`` labels the call in payload
+        measurements.
+        """
         params = {
             "IncludeItemTypes": include_item_types,
             "Recursive": "true",
@@ -63,33 +153,124 @@ class JellyfinClient:
             "Limit": limit,
             "SortBy": sort_by,
             "SortOrder": sort_order,
-            "Fields": "Overview,Genres,CommunityRating,ProductionYear,ProviderIds",
-            "ImageTypeLimit": 1,
-            "EnableImageTypes": "Primary,Backdrop",
+            **self._projection(fields, enable_images, enable_user_data),
         }
         if search_term:
             params["SearchTerm"] = search_term
         if parent_id:
             params["ParentId"] = parent_id
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/Users/{user_id}/Items",
-                params=params,
-                headers={"Authorization": self._auth_header(token)},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._request("GET", f"/Users/{user_id}/Items", token, site=site, params=params)
+        return resp.json()
 
-    async def get_latest_items(self, user_id: str, token: str, limit: int = 20) -> list:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/Users/{user_id}/Items/Latest",
-                params={"Limit": limit, "Fields": "Overview,ProductionYear,ProviderIds"},
+    async def _stream_page(
+        self, user_id: str, token: str, site: str, params: dict, parse=LibraryItemRecord.from_item
+    ) -> list:
+        records = []
+        size = 0
+        decoder = ItemStreamDecoder()
+        async with self.breaker.guard():
+            async with self.client.stream(
+                "GET",
+                f"/Users/{user_id}/Items",
                 headers={"Authorization": self._auth_header(token)},
-            )
-            resp.raise_for_status()
-            return resp.json()
+                params=params,
+                timeout=self.breaker.timeout,
+            ) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes():
+                    size += len(chunk)
+                    records.extend(parse(item) for item in decoder.feed(chunk))
+                decoder.close()
+        if self.measure_payloads:
+            self._record_payload(site, size)
+        return records
+
+    async def iter_items(
+        self,
+        user_id: str,
+        token: str,
+        include_item_types: str = "Movie,Series",
+        page_size: int = 500,
+        fields: Sequence[str] = MATCH_FIELDS,
+        site: str = "iter_items",
+    ) -> AsyncIterator[LibraryItemRecord]:
+        """Yield every matching library item as a compact record, one page at a time.
+
+        Pages are parsed item by item from the response stream and only a page
+        of records is held at once, so whole-library passes run in memory
+        bounded by ``page_size`` rather than library size.
+        """
+        start_index = 0
+        while True:
+            params = {
+                "IncludeItemTypes": include_item_types,
+                "Recursive": "true",
+                "StartIndex": start_index,
+                "Limit": page_size,
+                "SortBy": "SortName",
+                "SortOrder": "Ascending",
+                "EnableTotalRecordCount": "false",
+                **self._projection(fields, enable_images=False, enable_user_data=False),
+            }
+            records = await self._stream_page(user_id, token, site, params)
+            for record in records:
+                yield record
+            if len(records) < page_size:
+                return
+            start_index += page_size
+
+    async def iter_episodes(
+        self,
+        user_id: str,
+        token: str,
+        page_size: int = 1000,
+        site: str = "iter_episodes",
+    ) -> AsyncIterator[EpisodeRecord]:
+        """Yield the season and episode numbers of every episode file in the library.
+
+        Same streamed paging as ``iter_items``; missing (virtual) episodes are
+        excluded and no optional fields are requested, since series, season
+        and episode numbers are part of every item.
+        """
+        start_index = 0
+        while True:
+            params = {
+                "IncludeItemTypes": "Episode",
+                "Recursive": "true",
+                "IsMissing": "false",
+                "StartIndex": start_index,
+                "Limit": page_size,
+                "SortBy": "SortName",
+                "SortOrder": "Ascending",
+                "EnableTotalRecordCount": "false",
+                **self._projection((), enable_images=False, enable_user_data=False),
+            }
+            records = await self._stream_page(user_id, token, site, params, EpisodeRecord.from_item)
+            for record in records:
+                yield record
+            if len(records) < page_size:
+                return
+            start_index += page_size
+
+    async def get_latest_items(
+        self,
+        user_id: str,
+        token: str,
+        limit: int = 20,
+        fields: Sequence[str] = ("Overview", "ProductionYear", "ProviderIds"),
+        enable_images: bool = True,
+        enable_user_data: bool = True,
+        site: str = "latest",
+    ) -> list:
+        resp = await self._request(
+            "GET",
+            f"/Users/{user_id}/Items/Latest",
+            token,
+            site=site,
+            params={"Limit": limit, **self._projection(fields, enable_images, enable_user_data)},
+        )
+        return resp.json()
 
     def get_image_url(self, item_id: str, image_type: str = "Primary") -> str:
         return f"{self.base_url}/Items/{item_id}/Images/{image_type}"
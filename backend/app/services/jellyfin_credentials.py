@@ -0,0 +1,192 @@
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import httpx
+
+from app.config import settings
+from app.services.jellyfin_client import jellyfin_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Credential:
+    source: str  # "api_key" or "admin"
+    user_id: str
+    username: str
+    token: str
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.user_id, self.token)
+
+    def describe(self) -> str:
+        return "api_key" if self.source == "api_key" else f"admin:{self.username}"
+
+
+@dataclass
+class TokenState:
+    label: str
+    status: str = "unknown"  # "unknown", "valid" or "invalid"
+    checked_at: float | None = None
+    last_ok_at: str | None = None
+    last_failure_at: str | None = None
+    failures: int = 0
+
+
+class CredentialManager:
+    """Picks the Jellyfin credential background jobs run as, and tracks token health.
+
+    Candidates are the configured ``jellyfin_api_key`` first (acting for
+    ``jellyfin_service_user_id`` or, if unset, the first admin), then stored
+    admin session tokens, most recently refreshed first. Tokens are tracked by
+    ``(user_id, token)``, so a fresh login replaces a token marked invalid. A
+    credential that has not been checked for ``jellyfin_token_check_interval``
+    seconds is validated before use, so jobs find out about revoked tokens
+    before they start failing mid-cycle; rejected credentials are re-checked on
+    the same interval.
+    """
+
+    def __init__(self, check_interval: float = 600.0):
+        self.check_interval = check_interval
+        self._states: dict[tuple[str, str], TokenState] = {}
+        self._current: Credential | None = None
+        self.rotations = 0
+        self.job: dict = {
+            "status": "idle",
+            "last_run_at": None,
+            "last_success_at": None,
+            "checked": 0,
+            "fulfilled": 0,
+            "auth_failures": 0,
+            "detail": None,
+        }
+
+    def _candidates(self, conn: sqlite3.Connection) -> list[Credential]:
+        admins = conn.execute(
+            """SELECT user_id, username, jellyfin_token FROM user_roles
+               WHERE role = 'admin'
+               ORDER BY updated_at DESC, user_id"""
+        ).fetchall()
+        candidates = []
+        if settings.jellyfin_api_key:
+            user_id = settings.jellyfin_service_user_id or (admins[0]["user_id"] if admins else "")
+            if user_id:
+                candidates.append(Credential("api_key", user_id, "api_key", settings.jellyfin_api_key))
+        candidates.extend(
+            Credential("admin", r["user_id"], r["username"], r["jellyfin_token"])
+            for r in admins
+            if r["jellyfin_token"]
+        )
+        return candidates
+
+    def _state(self, credential: Credential) -> TokenState:
+        state = self._states.get(credential.key)
+        if state is None:
+            state = self._states[credential.key] = TokenState(credential.describe())
+        return state
+
+    def mark_valid(self, credential: Credential) -> None:
+        state = self._state(credential)
+        state.status = "valid"
+        state.checked_at = time.monotonic()
+        state.last_ok_at = datetime.utcnow().isoformat()
+        state.failures = 0
+
+    def mark_invalid(self, credential: Credential) -> None:
+        state = self._state(credential)
+        state.status = "invalid"
+        state.checked_at = time.monotonic()
+        state.last_failure_at = datetime.utcnow().isoformat()
+        state.failures += 1
+        if self._current and self._current.key == credential.key:
+            self._current = None
+        logger.warning("Jellyfin credential %s rejected", credential.describe())
+
+    async def _validate(self, credential: Credential) -> bool:
+        try:
+            await jellyfin_client.validate_token(credential.token)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (401, 403):
+                self.mark_invalid(credential)
+                return False
+            raise
+        self.mark_valid(credential)
+        return True
+
+    async def acquire(self, conn: sqlite3.Connection) -> Credential | None:
+        """Return a credential believed valid, validating it first if its check is stale.
+
+        Invalid tokens are skipped until their check is stale, then retried, so a
+        key rejected during a Jellyfin restart or a permissions change recovers
+        without a new login. Errors other than a rejected token (e.g. the circuit
+        being open) propagate to the caller.
+        """
+        now = time.monotonic()
+        candidates = self._candidates(conn)
+        # Forget tokens that are no longer stored (replaced by a newer login)
+        stored = {c.key for c in candidates}
+        for key in [k for k in self._states if k not in stored]:
+            del self._states[key]
+        # Keep using the current credential while it is still stored
+        if self._current and any(c.key == self._current.key for c in candidates):
+            candidates.sort(key=lambda c: c.key != self._current.key)
+
+        for credential in candidates:
+            state = self._state(credential)
+            fresh = state.checked_at is not None and now - state.checked_at < self.check_interval
+            if state.status == "invalid" and fresh:
+                continue
+            if (state.status == "valid" and fresh) or await self._validate(credential):
+                if self._current is None or self._current.key != credential.key:
+                    logger.info("Background jobs using Jellyfin credential %s", credential.describe())
+                self._current = credential
+                return credential
+        self._current = None
+        return None
+
+    async def rotate(self, conn: sqlite3.Connection, credential: Credential) -> Credential | None:
+        """Mark ``credential`` as rejected and switch to the next valid one."""
+        self.mark_invalid(credential)
+        replacement = await self.acquire(conn)
+        if replacement is not None:
+            self.rotations += 1
+        return replacement
+
+    def record_run(self, checked: int, fulfilled: int, auth_failures: int, status: str, detail: str | None = None) -> None:
+        now = datetime.utcnow().isoformat()
+        self.job.update(
+            status=status,
+            last_run_at=now,
+            checked=checked,
+            fulfilled=fulfilled,
+            auth_failures=auth_failures,
+            detail=detail,
+        )
+        if status == "ok":
+            self.job["last_success_at"] = now
+
+    def stats(self) -> dict:
+        return {
+            "job": dict(self.job),
+            "credential": self._current.describe() if self._current else None,
+            "api_key_configured": bool(settings.jellyfin_api_key),
+            "rotations": self.rotations,
+            "tokens": [
+                {
+                    "credential": state.label,
+                    "user_id": user_id,
+                    "status": state.status,
+                    "last_ok_at": state.last_ok_at,
+                    "last_failure_at": state.last_failure_at,
+                    "failures": state.failures,
+                }
+                for (user_id, _), state in self._states.items()
+            ],
+        }
+
+
+credential_manager = CredentialManager(check_interval=settings.jellyfin_token_check_interval)
@@ -0,0 +1,127 @@
+"""Incremental decoding of Jellyfin item pages.
+
+``ItemStreamDecoder`` is fed response chunks as they arrive and returns the
+objects of the top-level ``"Items"`` array one at a time, so a page is never
+held as a whole body plus a full object graph. Callers reduce each object to a
+``LibraryItemRecord`` (or ``EpisodeRecord``) as soon as it is decoded.
+"""
+import codecs
+import json
+import re
+
+_ITEMS_KEY = '"Items"'
+# Whitespace and the commas between array elements
+_SKIP = re.compile(r"[\s,]*")
+_decoder = json.JSONDecoder()
+
+
+class LibraryItemRecord:
+    """The properties of a library item that availability checks and listings use."""
+
+    __slots__ = ("id", "name", "type", "year", "tmdb_id", "imdb_id", "tvdb_id")
+
+    def __init__(self, id, name, type, year, tmdb_id, imdb_id, tvdb_id):
+        self.id = id
+        self.name = name
+        self.type = type
+        self.year = year
+        self.tmdb_id = tmdb_id
+        self.imdb_id = imdb_id
+        self.tvdb_id = tvdb_id
+
+    @classmethod
+    def from_item(cls, item: dict) -> "LibraryItemRecord":
+        provider_ids = item.get("ProviderIds") or {}
+        tmdb = provider_ids.get("Tmdb")
+        return cls(
+            item["Id"],
+            item.get("Name", ""),
+            item.get("Type"),
+            item.get("ProductionYear"),
+            int(tmdb) if tmdb and str(tmdb).isdigit() else None,
+            provider_ids.get("Imdb"),
+            provider_ids.get("Tvdb"),
+        )
+
+    def __repr__(self) -> str:
+        return f"LibraryItemRecord({self.id!r}, {self.name!r}, tmdb_id={self.tmdb_id})"
+
+
+class EpisodeRecord:
+    """Where an episode sits in its series; ``episode_end`` is set for multi-episode files."""
+
+    __slots__ = ("series_id", "season", "episode", "episode_end")
+
+    def __init__(self, series_id, season, episode, episode_end):
+        self.series_id = series_id
+        self.season = season
+        self.episode = episode
+        self.episode_end = episode_end
+
+    @classmethod
+    def from_item(cls, item: dict) -> "EpisodeRecord":
+        return cls(
+            item.get("SeriesId"),
+            item.get("ParentIndexNumber"),
+            item.get("IndexNumber"),
+            item.get("IndexNumberEnd"),
+        )
+
+    def __repr__(self) -> str:
+        return f"EpisodeRecord({self.series_id!r}, S{self.season}E{self.episode})"
+
+
+class ItemStreamDecoder:
+    """Split the ``"Items"`` array of a streamed response into per-item objects.
+
+    Items are decoded with ``JSONDecoder.raw_decode`` straight from a text
+    buffer holding at most one chunk plus the item still being received. An
+    item cut off by the end of a chunk is retried when more data arrives; keys
+    other than ``"Items"`` (``TotalRecordCount``, ``StartIndex``) are skipped.
+    """
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_items = False
+        self._done = False
+
+    def feed(self, chunk: bytes) -> list[dict]:
+        if self._done:
+            return []
+        self._buffer += self._text.decode(chunk)
+        if not self._in_items:
+            index = self._buffer.find(_ITEMS_KEY)
+            bracket = self._buffer.find("[", index + len(_ITEMS_KEY)) if index >= 0 else -1
+            if bracket < 0:
+                # Keep a tail in case the key is split across chunks
+                self._buffer = self._buffer[index if index >= 0 else -len(_ITEMS_KEY):]
+                return []
+            self._buffer = self._buffer[bracket + 1:]
+            self._in_items = True
+        return self._drain()
+
+    def _drain(self) -> list[dict]:
+        items = []
+        buffer, pos, end = self._buffer, 0, len(self._buffer)
+        while True:
+            pos = _SKIP.match(buffer, pos).end()
+            if pos == end:
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                item, pos_after = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Incomplete item; wait for the next chunk
+                break
+            items.append(item)
+            pos = pos_after
+        self._buffer = "" if self._done else buffer[pos:]
+        return items
+
+    def close(self) -> None:
+        """Raise if the stream ended in the middle of the Items array."""
+        if self._in_items and not self._done:
+            raise ValueError("Truncated Jellyfin item stream")
@@ -0,0 +1,497 @@
+"""Process-wide, array-backed copy of the Jellyfin library for availability checks.
+
+The catalog is built from a streamed library scan (``JellyfinClient.iter_items``)
+and stored column by column: items are sorted by a key packing the TMDB id and
+movie/series type into one integer, years sit in a parallel ``int16`` array, and
+names and Jellyfin ids live in one UTF-8 blob addressed by offset arrays. A
+lookup is a binary search over the key column; no per-item Python objects exist
+until a match is materialized.
+
+Items Jellyfin did not identify by TMDB id get three more sorted indexes, used
+by ``match``: an IMDb/TVDB cross-reference, a title-key hash column, and
+trigram posting lists for near matches. Every lookup is a handful of binary
+searches plus a scan of the rarest trigrams' postings, so its cost does not
+grow with the library.
+
+Unless disabled, a second streamed pass over every episode file
+(``JellyfinClient.iter_episodes``) fills a season table: distinct episode
+numbers per series and season, sorted by catalog row. Matches for series carry
+these counts, so season availability is read from the snapshot instead of
+queried per page view.
+
+The columns are written to a snapshot file and read back through ``mmap``, so
+every uvicorn worker maps the same pages instead of holding its own copy.
+Workers notice a newer snapshot (written by whichever worker refreshed) by its
+mtime.
+"""
+import asyncio
+import heapq
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from app.config import settings
+from app.services.jellyfin_stream import EpisodeRecord, LibraryItemRecord
+from app.services.title_matching import (
+    FUZZY_THRESHOLD, dice, external_key, key_hash, match_key, min_shared, numbers, trigrams,
+)
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"MMLC"
+_VERSION = 4
+# magic, version, byte order, item count, built_at, blob length, external id
+# entries, unidentified items, distinct trigrams, trigram postings, season
+# entries, whether episodes were indexed
+_HEADER = struct.Struct("<4sHcxIdQIIIII?")
+_BYTE_ORDER = b"L" if sys.byteorder == "little" else b"B"
+RELOAD_CHECK_INTERVAL = 5.0
+
+
+def catalog_key(tmdb_id: int, media_type: str) -> int:
+    return tmdb_id << 1 | (media_type != "movie")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _sorted_pairs(pairs: list[tuple[int, int]], key_code: str) -> tuple[array, array]:
+    pairs.sort()
+    return array(key_code, (k for k, _ in pairs)), array("I", (r for _, r in pairs))
+
+
+@dataclass(frozen=True)
+class LibraryMatch:
+    record: LibraryItemRecord
+    method: str  # "tmdb", "imdb", "tvdb", "title" or "fuzzy"
+    score: float = 1.0
+    # Series only: season number -> episodes in the library (None when episodes are not indexed)
+    seasons: dict[int, int] | None = None
+
+
+class CatalogBuilder:
+    """Accumulates scanned records straight into arrays, in scan order."""
+
+    def __init__(self):
+        self.keys = array("q")
+        self.years = array("h")
+        self.blob = bytearray()
+        self.offsets = array("I", [0])
+        # External ids of items without a TMDB id, by scan position
+        self.external: list[tuple[int, int]] = []
+        # Series scan positions by Jellyfin id, and episode numbers per (position, season)
+        self.series: dict[str, int] = {}
+        self.episodes: dict[tuple[int, int], set[int]] = {}
+        self.episodes_indexed = False
+
+    def add(self, record: LibraryItemRecord) -> None:
+        media_type = "movie" if record.type == "Movie" else "tv"
+        position = len(self.keys)
+        if media_type == "tv":
+            self.series[record.id] = position
+        if not record.tmdb_id:
+            for source, value in (("imdb", record.imdb_id), ("tvdb", record.tvdb_id)):
+                key = external_key(source, value)
+                if key is not None:
+                    self.external.append((key, position))
+        self.keys.append(catalog_key(record.tmdb_id or 0, media_type))
+        self.years.append(record.year or 0)
+        self.blob += record.name.encode()
+        self.offsets.append(len(self.blob))
+        self.blob += record.id.encode()
+        self.offsets.append(len(self.blob))
+
+    def add_episode(self, record: EpisodeRecord) -> None:
+        """Count an episode file; call after every series has been added."""
+        position = self.series.get(record.series_id)
+        if position is None or record.season is None or record.episode is None:
+            return
+        last = max(record.episode, record.episode_end or 0)
+        self.episodes.setdefault((position, record.season), set()).update(range(record.episode, last + 1))
+
+    def build(self, built_at: float) -> bytes:
+        """Serialize into the snapshot layout, with every column sorted by catalog key."""
+        order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        row_of = {position: row for row, position in enumerate(order)}
+        keys = array("q", (self.keys[i] for i in order))
+        years = array("h", (self.years[i] for i in order))
+        blob = bytearray()
+        offsets = array("I", [0])
+        for i in order:
+            blob += self.blob[self.offsets[2 * i]:self.offsets[2 * i + 2]]
+            offsets.append(len(blob) - (self.offsets[2 * i + 2] - self.offsets[2 * i + 1]))
+            offsets.append(len(blob))
+
+        # Secondary indexes over items without a TMDB id (they sort first, key >> 1 == 0)
+        external_keys, external_rows = _sorted_pairs(
+            [(key, row_of[position]) for key, position in self.external], "q"
+        )
+        titles, postings = [], []
+        for row in range(bisect_left(keys, 2)):
+            key = match_key(bytes(blob[offsets[2 * row]:offsets[2 * row + 1]]).decode())
+            titles.append((key_hash(key), row))
+            postings.extend((trigram, row) for trigram in trigrams(key))
+        title_keys, title_rows = _sorted_pairs(titles, "q")
+        trigram_codes, trigram_rows = _sorted_pairs(postings, "I")
+        distinct = array("I")
+        trigram_offsets = array("I")
+        for index, code in enumerate(trigram_codes):
+            if not distinct or distinct[-1] != code:
+                distinct.append(code)
+                trigram_offsets.append(index)
+        trigram_offsets.append(len(trigram_codes))
+
+        seasons = sorted(
+            (row_of[position], season, min(len(numbers), 0xFFFF))
+            for (position, season), numbers in self.episodes.items()
+            if 0 <= season <= 0xFFFF
+        )
+        season_rows = array("I", (row for row, _, _ in seasons))
+        season_numbers = array("H", (season for _, season, _ in seasons))
+        season_episodes = array("H", (count for _, _, count in seasons))
+
+        out = bytearray(_HEADER.pack(
+            _MAGIC, _VERSION, _BYTE_ORDER, len(keys), built_at, len(blob),
+            len(external_keys), len(title_keys), len(distinct), len(trigram_rows),
+            len(seasons), self.episodes_indexed,
+        ))
+        for column in (
+            keys, years, offsets, external_keys, external_rows, title_keys, title_rows,
+            distinct, trigram_offsets, trigram_rows, season_rows, season_numbers, season_episodes,
+        ):
+            out += b"\0" * (_align(len(out)) - len(out))
+            out += column.tobytes()
+        out += blob
+        return bytes(out)
+
+
+class _Columns:
+    """Typed views over a snapshot buffer (bytes or mmap); nothing is copied."""
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        magic, version, order = struct.unpack_from("<4sHc", view)
+        if magic != _MAGIC or version != _VERSION or order != _BYTE_ORDER:
+            raise ValueError("Incompatible library catalog snapshot")
+        (
+            _, _, _, count, built_at, blob_len, externals, unidentified, distinct, postings,
+            seasons, episodes_indexed,
+        ) = _HEADER.unpack_from(view)
+        offset = _HEADER.size
+        columns = []
+        for code, length in (
+            ("q", count), ("h", count), ("I", 2 * count + 1),
+            ("q", externals), ("I", externals),
+            ("q", unidentified), ("I", unidentified),
+            ("I", distinct), ("I", distinct + 1), ("I", postings),
+            ("I", seasons), ("H", seasons), ("H", seasons),
+        ):
+            offset = _align(offset)
+            size = length * array(code).itemsize
+            columns.append(view[offset:offset + size].cast(code))
+            offset += size
+        (
+            self.keys, self.years, self.offsets,
+            self.external_keys, self.external_rows,
+            self.title_keys, self.title_rows,
+            self.trigram_codes, self.trigram_offsets, self.trigram_rows,
+            self.season_rows, self.season_numbers, self.season_episodes,
+        ) = columns
+        self.episodes_indexed = episodes_indexed
+        self.blob = view[offset:offset + blob_len]
+        self.count = count
+        self.built_at = built_at
+        self.nbytes = len(view)
+
+    def _text(self, index: int) -> str:
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]]).decode()
+
+    def name(self, row: int) -> str:
+        return self._text(2 * row)
+
+    def seasons(self, row: int) -> dict[int, int]:
+        start = bisect_left(self.season_rows, row)
+        end = bisect_right(self.season_rows, row, lo=start)
+        return dict(zip(self.season_numbers[start:end], self.season_episodes[start:end]))
+
+    def record(self, row: int) -> LibraryItemRecord:
+        key = self.keys[row]
+        return LibraryItemRecord(
+            self._text(2 * row + 1),
+            self._text(2 * row),
+            "Series" if key & 1 else "Movie",
+            self.years[row] or None,
+            key >> 1 or None,
+            None,
+            None,
+        )
+
+
+class LibraryCatalog:
+    def __init__(self, path: str, max_age: float, index_episodes: bool = True):
+        self.path = path
+        self.max_age = max_age
+        self.index_episodes = index_episodes
+        self._columns: _Columns | None = None
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+        self.last_error: str | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age > 0
+
+    # --- loading ---
+
+    def load(self) -> bool:
+        """Map the snapshot file if present; returns whether a catalog is loaded."""
+        try:
+            with open(self.path, "rb") as f:
+                mtime = os.fstat(f.fileno()).st_mtime
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._columns = _Columns(mapped)
+            self._mtime = mtime
+        except FileNotFoundError:
+            return self._columns is not None
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning("Could not load library catalog snapshot %s: %s", self.path, e)
+            return self._columns is not None
+        return True
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    @property
+    def unidentified(self) -> int:
+        """Items without a TMDB id, which only ``match`` can find."""
+        return len(self._columns.title_keys) if self._columns else 0
+
+    @property
+    def episodes_indexed(self) -> bool:
+        return bool(self._columns and self._columns.episodes_indexed)
+
+    def is_fresh(self) -> bool:
+        if not self.enabled:
+            return False
+        self._maybe_reload()
+        return self._columns is not None and time.time() - self._columns.built_at < self.max_age
+
+    # --- lookups ---
+
+    def _row(self, tmdb_id: int, media_type: str) -> int | None:
+        columns = self._columns
+        key = catalog_key(tmdb_id, media_type)
+        row = bisect_left(columns.keys, key)
+        return row if row < columns.count and columns.keys[row] == key else None
+
+    def contains(self, tmdb_id: int, media_type: str) -> bool | None:
+        """Whether the title is in the library; ``None`` when the catalog is missing or stale."""
+        if not self.is_fresh():
+            return None
+        return self._row(tmdb_id, media_type) is not None
+
+    def lookup(self, tmdb_id: int, media_type: str) -> LibraryItemRecord | None:
+        if not self.is_fresh():
+            return None
+        row = self._row(tmdb_id, media_type)
+        return self._columns.record(row) if row is not None else None
+
+    def match(
+        self,
+        tmdb_id: int,
+        media_type: str,
+        title: str | None = None,
+        year: int | None = None,
+        imdb_id: str | None = None,
+        tvdb_id: int | str | None = None,
+        original_title: str | None = None,
+    ) -> LibraryMatch | None:
+        """Find the library item for a TMDB title, including items Jellyfin has no TMDB id for.
+
+        Tried in order: the TMDB id, the IMDb/TVDB cross-reference, the exact
+        title key (year within one when both are known), then a trigram near
+        match, which requires both years to agree within one. Series matches
+        carry their per-season episode counts. ``None`` when nothing matches or
+        the catalog is missing or stale.
+        """
+        if not self.is_fresh():
+            return None
+        columns = self._columns
+        row = self._row(tmdb_id, media_type)
+        if row is not None:
+            return self._result(row, "tmdb")
+        series = media_type == "tv"
+
+        for source, value in (("imdb", imdb_id), ("tvdb", tvdb_id)):
+            key = external_key(source, value)
+            if key is None:
+                continue
+            for row in self._postings(columns.external_keys, columns.external_rows, key):
+                if columns.keys[row] & 1 == series:
+                    return self._result(row, source)
+
+        keys = [k for k in dict.fromkeys(match_key(t) for t in (title, original_title)) if k]
+        for key in keys:
+            for row in self._postings(columns.title_keys, columns.title_rows, key_hash(key)):
+                if (
+                    columns.keys[row] & 1 == series
+                    and _years_agree(year, columns.years[row], required=False)
+                    and match_key(columns.name(row)) == key
+                ):
+                    return self._result(row, "title")
+
+        if not year:
+            return None
+        best, best_score = None, 0.0
+        for key in keys:
+            row, score = self._fuzzy(key, series, year)
+            if row is not None and score > best_score:
+                best, best_score = row, score
+        return self._result(best, "fuzzy", round(best_score, 3)) if best is not None else None
+
+    def _result(self, row: int, method: str, score: float = 1.0) -> LibraryMatch:
+        columns = self._columns
+        seasons = columns.seasons(row) if columns.keys[row] & 1 and columns.episodes_indexed else None
+        return LibraryMatch(columns.record(row), method, score, seasons)
+
+    @staticmethod
+    def _postings(keys, rows, key: int):
+        start = bisect_left(keys, key)
+        return rows[start:bisect_right(keys, key, lo=start)]
+
+    def _fuzzy(self, key: str, series: bool, year: int) -> tuple[int | None, float]:
+        columns = self._columns
+        query = trigrams(key)
+        query_numbers = numbers(key)
+        lists = []
+        for code in query:
+            i = bisect_left(columns.trigram_codes, code)
+            if i < len(columns.trigram_codes) and columns.trigram_codes[i] == code:
+                lists.append((columns.trigram_offsets[i], columns.trigram_offsets[i + 1]))
+        needed = min_shared(len(query))
+        if len(lists) < needed:
+            return None, 0.0
+        # A match shares at least ``needed`` trigrams, so it is in one of the rarest q - needed + 1 lists
+        candidates = set()
+        rarest = heapq.nsmallest(len(query) - needed + 1, lists, key=lambda span: span[1] - span[0])
+        for start, end in rarest:
+            candidates.update(columns.trigram_rows[start:end])
+
+        best, best_score = None, 0.0
+        for row in candidates:
+            if columns.keys[row] & 1 != series or not _years_agree(year, columns.years[row], required=True):
+                continue
+            name = match_key(columns.name(row))
+            if numbers(name) != query_numbers:
+                continue
+            score = dice(query, trigrams(name))
+            if score >= FUZZY_THRESHOLD and score > best_score:
+                best, best_score = row, score
+        return best, best_score
+
+    # --- building ---
+
+    def _install(self, data: bytes) -> None:
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            # No writable snapshot location: serve this worker from memory
+            logger.warning("Could not write library catalog snapshot %s: %s", self.path, e)
+            self._columns = _Columns(data)
+            return
+        self.load()
+
+    async def refresh(self, client, user_id: str, token: str, force: bool = False) -> bool:
+        """Rebuild from a full library scan unless a fresh snapshot already exists.
+
+        Returns whether this call rebuilt the catalog. Concurrent callers in
+        one process share a single scan; another worker's recent snapshot is
+        picked up instead of scanning again.
+        """
+        async with self._lock:
+            self._checked_at = 0.0
+            if not force and self.is_fresh():
+                return False
+            started = time.monotonic()
+            builder = CatalogBuilder()
+            try:
+                async for record in client.iter_items(user_id, token, site="library_catalog"):
+                    builder.add(record)
+                if self.index_episodes:
+                    async for episode in client.iter_episodes(user_id, token, site="library_catalog.episodes"):
+                        builder.add_episode(episode)
+                    builder.episodes_indexed = True
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                raise
+            data = await asyncio.to_thread(builder.build, time.time())
+            await asyncio.to_thread(self._install, data)
+            self.refreshes += 1
+            self.last_error = None
+            logger.info(
+                "Library catalog rebuilt: %d items, %d seasons, %d bytes in %.0fms",
+                len(builder.keys), len(builder.episodes), len(data), (time.monotonic() - started) * 1000,
+            )
+            return True
+
+    def stats(self) -> dict:
+        columns = self._columns
+        return {
+            "path": self.path,
+            "enabled": self.enabled,
+            "loaded": columns is not None,
+            "items": columns.count if columns else 0,
+            "unidentified_items": self.unidentified,
+            "external_ids": len(columns.external_keys) if columns else 0,
+            "trigram_postings": len(columns.trigram_rows) if columns else 0,
+            "episodes_indexed": self.episodes_indexed,
+            "seasons": len(columns.season_rows) if columns else 0,
+            "bytes": columns.nbytes if columns else 0,
+            "built_at": columns.built_at if columns else None,
+            "age_seconds": round(time.time() - columns.built_at) if columns else None,
+            "max_age": self.max_age,
+            "refreshes": self.refreshes,
+            "last_error": self.last_error,
+        }
+
+
+def _years_agree(year: int | None, item_year: int, required: bool) -> bool:
+    if not year or not item_year:
+        return not required
+    return abs(year - item_year) <= 1
+
+
+def _default_path() -> str:
+    from app.database import DB_PATH
+
+    return os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "library_catalog.bin")
+
+
+library_catalog = LibraryCatalog(
+    settings.library_catalog_path or _default_path(),
+    max_age=settings.library_catalog_max_age,
+    index_episodes=settings.library_catalog_episodes,
+)
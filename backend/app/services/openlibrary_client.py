@@ -1,7 +1,9 @@
 import httpx
 
+from app.config import settings
+from app.services.circuit_breaker import get_breaker
+from app.services.rate_limiter import PRIORITY_INTERACTIVE, get_limiter
 
-OPENLIBRARY_BASE = "https://openlibrary.org"
 COVER_BASE = "https://covers.openlibrary.org/b/id"
 
 
@@ -21,38 +23,48 @@ def format_work_key(work_id: int) -> str:
 
 
 class OpenLibraryClient:
-    async def search_books(self, query: str, page: int = 1, limit: int = 20) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{OPENLIBRARY_BASE}/search.json",
-                params={
-                    "q": query,
-                    "page": page,
-                    "limit": limit,
-                    "fields": "key,title,author_name,first_publish_year,cover_i,number_of_pages_median,subject,edition_count,ratings_average",
-                },
-                timeout=15,
-            )
-            resp.raise_for_status()
-            return resp.json()
-
-    async def get_work_details(self, work_key: str) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{OPENLIBRARY_BASE}/works/{work_key}.json",
-                timeout=15,
-            )
-            resp.raise_for_status()
-            return resp.json()
-
-    async def get_author(self, author_key: str) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{OPENLIBRARY_BASE}/authors/{author_key}.json",
-                timeout=15,
-            )
-            resp.raise_for_status()
-            return resp.json()
+    def __init__(self):
+        self.base_url = settings.openlibrary_base_url.rstrip("/")
+        self.breaker = get_breaker("openlibrary", min_timeout=3.0, max_timeout=15.0)
+        self.limiter = get_limiter(
+            "openlibrary", settings.openlibrary_rate_limit, settings.openlibrary_rate_burst
+        )
+
+    async def _get(
+        self, path: str, params: dict | None = None, priority: int = PRIORITY_INTERACTIVE
+    ) -> dict:
+        async def send() -> dict:
+            async with self.breaker.guard():
+                async with httpx.AsyncClient(timeout=self.breaker.timeout) as client:
+                    resp = await client.get(f"{self.base_url}{path}", params=params)
+                    resp.raise_for_status()
+                    return resp.json()
+
+        return await self.limiter.run(send, priority)
+
+    async def search_books(
+        self,
+        query: str,
+        page: int = 1,
+        limit: int = 20,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> dict:
+        return await self._get(
+            "/search.json",
+            {
+                "q": query,
+                "page": page,
+                "limit": limit,
+                "fields": "key,title,author_name,author_key,first_publish_year,cover_i,number_of_pages_median,subject,edition_count,ratings_average",
+            },
+            priority,
+        )
+
+    async def get_work_details(self, work_key: str, priority: int = PRIORITY_INTERACTIVE) -> dict:
+        return await self._get(f"/works/{work_key}.json", priority=priority)
+
+    async def get_author(self, author_key: str, priority: int = PRIORITY_INTERACTIVE) -> dict:
+        return await self._get(f"/authors/{author_key}.json", priority=priority)
 
 
 openlibrary_client = OpenLibraryClient()
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import sqlite3
+
+from app.services import book_metadata, tmdb_metadata
+from app.services.rate_limiter import PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchWarmer:
+    """Warms metadata caches for requested titles at background priority.
+
+    Warm-ups queue behind interactive traffic in the upstream rate limiters, so
+    they never slow down users; by the time an admin opens the request, the
+    detail lookup is a cache hit.
+    """
+
+    def __init__(self, max_concurrency: int = 2):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: dict[tuple[str, int], asyncio.Task] = {}
+        self.warmed = 0
+        self.failed = 0
+
+    def _is_cached(self, media_type: str, tmdb_id: int) -> bool:
+        if media_type == "book":
+            return tmdb_id in book_metadata.work_cache
+        return tmdb_metadata.is_cached(media_type, tmdb_id)
+
+    async def _warm(self, media_type: str, tmdb_id: int) -> None:
+        async with self._semaphore:
+            try:
+                if media_type == "movie":
+                    await tmdb_metadata.get_movie_details(tmdb_id, PRIORITY_BACKGROUND)
+                elif media_type == "tv":
+                    await tmdb_metadata.get_tv_details(tmdb_id, PRIORITY_BACKGROUND)
+                else:
+                    await book_metadata.get_book(tmdb_id, PRIORITY_BACKGROUND)
+                self.warmed += 1
+            except Exception:
+                self.failed += 1
+                logger.debug("Prefetch failed for %s %s", media_type, tmdb_id, exc_info=True)
+
+    def schedule(self, media_type: str, tmdb_id: int) -> None:
+        key = (media_type, tmdb_id)
+        if key in self._pending or self._is_cached(media_type, tmdb_id):
+            return
+        task = asyncio.get_running_loop().create_task(self._warm(media_type, tmdb_id))
+        self._pending[key] = task
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+
+    def schedule_open_requests(self, conn: sqlite3.Connection, limit: int = 200) -> None:
+        """Queue warm-ups for the most recent pending requests (e.g. after a restart)."""
+        rows = conn.execute(
+            "SELECT DISTINCT media_type, tmdb_id FROM requests WHERE status = 'pending' ORDER BY created_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        for row in rows:
+            self.schedule(row["media_type"], row["tmdb_id"])
+
+    def stats(self) -> dict:
+        return {"pending": len(self._pending), "warmed": self.warmed, "failed": self.failed}
+
+
+prefetch_warmer = PrefetchWarmer()
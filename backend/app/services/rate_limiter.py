@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+
+class TokenBucketLimiter:
+    """Async token bucket shared by all calls to one upstream.
+
+    Callers that cannot get a token right away wait in a priority queue, so
+    interactive requests (``PRIORITY_INTERACTIVE``) are served before background
+    work (``PRIORITY_BACKGROUND``). ``run`` retries 429 responses (and 503s that
+    carry Retry-After) with backoff, pausing the whole bucket for the advertised
+    Retry-After so other callers back off too.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        max_retries: int = 3,
+        base_backoff: float = 0.5,
+        max_wait: float = 30.0,
+    ):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_wait = max_wait
+
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.acquired = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+        self.retries = 0
+        self.max_queue_depth = 0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        while self._waiters and now >= self._blocked_until and self.tokens >= 1:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self.tokens -= 1
+            fut.set_result(None)
+        if self._waiters:
+            delay = max(self._blocked_until - now, (1 - self.tokens) / self.rate, 0.001)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and now >= self._blocked_until and self.tokens >= 1:
+            self.tokens -= 1
+            self.acquired += 1
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        self._dispatch()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # Cancelled after _dispatch handed us a token: give it back so it
+            # goes to the next waiter instead of being lost.
+            if fut.done() and not fut.cancelled():
+                self.tokens = min(self.burst, self.tokens + 1)
+                self._dispatch()
+            raise
+        finally:
+            self.throttled_seconds += time.monotonic() - now
+        self.acquired += 1
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (e.g. after a Retry-After)."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        if self._waiters:
+            self._dispatch()
+
+    async def run(self, send, priority: int = PRIORITY_INTERACTIVE):
+        """Call ``send()`` once a token is available, retrying upstream throttling."""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(priority)
+            try:
+                return await send()
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                if status == 429:
+                    self.rate_limited += 1
+                elif status != 503 or retry_after is None:
+                    raise
+                if attempt == self.max_retries:
+                    raise
+                if retry_after is None:
+                    retry_after = self.base_backoff * 2 ** attempt * (0.5 + random.random() / 2)
+                if retry_after > self.max_wait:
+                    raise
+                logger.info(
+                    "%s throttled (HTTP %d), retrying in %.1fs", self.name, status, retry_after
+                )
+                self.retries += 1
+                self.pause(retry_after)
+
+    def stats(self) -> dict:
+        self._refill(time.monotonic())
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+        }
+
+
+limiters: dict[str, TokenBucketLimiter] = {}
+
+
+def get_limiter(name: str, rate: float, burst: int, **kwargs) -> TokenBucketLimiter:
+    if name not in limiters:
+        limiters[name] = TokenBucketLimiter(name, rate, burst, **kwargs)
+    return limiters[name]
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import zlib
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.database import get_db_connection
+from app.serialization import dumps
+from app.services.db_writer import db_writer
+
+logger = logging.getLogger(__name__)
+
+# Column order of the rows packed into an archive chunk
+ARCHIVE_COLUMNS = ("id", "request_id", "old_status", "new_status", "changed_by", "note", "created_at")
+CHUNK_ROWS = 500
+# Rows per archival transaction; each is one DB writer operation
+BATCH_ROWS = 10000
+
+
+def _unpack(payload: bytes) -> list[list]:
+    return json.loads(zlib.decompress(payload))
+
+
+def get_history(conn: sqlite3.Connection, request_id: int) -> list[dict]:
+    """Status timeline of one request, oldest first, merging archived and live rows."""
+    entries = []
+    chunks = conn.execute(
+        """SELECT payload FROM request_history_archive
+           WHERE max_request_id >= ? AND min_request_id <= ?""",
+        (request_id, request_id),
+    ).fetchall()
+    for chunk in chunks:
+        for row in _unpack(chunk["payload"]):
+            if row[1] == request_id:
+                entries.append({**dict(zip(ARCHIVE_COLUMNS, row)), "archived": True})
+
+    rows = conn.execute(
+        f"""SELECT {", ".join(ARCHIVE_COLUMNS)} FROM request_history
+            WHERE request_id = ? ORDER BY created_at, id""",
+        (request_id,),
+    ).fetchall()
+    entries.extend({**dict(r), "archived": False} for r in rows)
+    entries.sort(key=lambda e: (e["created_at"] or "", e["id"]))
+    return entries
+
+
+def iter_archived(conn: sqlite3.Connection, since: str | None = None, until: str | None = None):
+    """Yield archived history rows whose created_at falls in [since, until)."""
+    sql = "SELECT payload FROM request_history_archive WHERE 1 = 1"
+    params: list = []
+    if since:
+        sql += " AND last_at >= ?"
+        params.append(since)
+    if until:
+        sql += " AND first_at < ?"
+        params.append(until)
+    for chunk in conn.execute(sql + " ORDER BY period, min_request_id", params):
+        for row in _unpack(chunk["payload"]):
+            created_at = row[6] or ""
+            if (not since or created_at >= since) and (not until or created_at < until):
+                yield dict(zip(ARCHIVE_COLUMNS, row))
+
+
+def _write_chunks(conn: sqlite3.Connection, rows: list[tuple]) -> int:
+    by_period: dict[str, list[tuple]] = {}
+    for row in rows:
+        by_period.setdefault((row[6] or "")[:7], []).append(row)
+
+    chunks = 0
+    for period, period_rows in by_period.items():
+        period_rows.sort(key=lambda r: (r[1], r[6] or "", r[0]))
+        for start in range(0, len(period_rows), CHUNK_ROWS):
+            chunk = period_rows[start:start + CHUNK_ROWS]
+            created = [r[6] or "" for r in chunk]
+            conn.execute(
+                """INSERT INTO request_history_archive
+                   (period, min_request_id, max_request_id, first_at, last_at, row_count, payload)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    period, chunk[0][1], chunk[-1][1], min(created), max(created), len(chunk),
+                    zlib.compress(dumps([list(r) for r in chunk])),
+                ),
+            )
+            chunks += 1
+    return chunks
+
+
+def _cutoff(older_than_days: int) -> str:
+    return (datetime.utcnow() - timedelta(days=older_than_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _archive_batch(conn: sqlite3.Connection, cutoff: str) -> tuple[int, int]:
+    """Archive up to ``BATCH_ROWS`` rows older than ``cutoff``; returns (rows, chunks)."""
+    rows = conn.execute(
+        f"""SELECT {", ".join(ARCHIVE_COLUMNS)} FROM request_history
+            WHERE created_at < ? ORDER BY id LIMIT ?""",
+        (cutoff, BATCH_ROWS),
+    ).fetchall()
+    if not rows:
+        return 0, 0
+    rows = [tuple(r) for r in rows]
+    try:
+        chunks = _write_chunks(conn, rows)
+        # The batch is exactly the old rows up to its highest id
+        conn.execute(
+            "DELETE FROM request_history WHERE created_at < ? AND id <= ?",
+            (cutoff, rows[-1][0]),
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(rows), chunks
+
+
+def archive_history(conn: sqlite3.Connection, older_than_days: int) -> dict:
+    """Move history rows older than ``older_than_days`` into compressed archive chunks.
+
+    Works in batches, each in its own transaction, so a large first run does not
+    hold the write lock for long.
+    """
+    cutoff = _cutoff(older_than_days)
+    archived = chunks = 0
+    while True:
+        rows, batch_chunks = _archive_batch(conn, cutoff)
+        if not rows:
+            break
+        archived += rows
+        chunks += batch_chunks
+    if archived:
+        logger.info("Archived %d request history rows older than %s into %d chunks", archived, cutoff, chunks)
+    return {"archived_rows": archived, "chunks": chunks, "cutoff": cutoff}
+
+
+def history_stats(conn: sqlite3.Connection) -> dict:
+    live = conn.execute("SELECT COUNT(*) FROM request_history").fetchone()[0]
+    archive = conn.execute(
+        """SELECT COUNT(*), COALESCE(SUM(row_count), 0), COALESCE(SUM(LENGTH(payload)), 0),
+                  MIN(first_at), MAX(last_at)
+           FROM request_history_archive"""
+    ).fetchone()
+    return {
+        "live_rows": live,
+        "archived_rows": archive[1],
+        "archive_chunks": archive[0],
+        "archive_bytes": archive[2],
+        "archive_first_at": archive[3],
+        "archive_last_at": archive[4],
+        "retention_days": settings.history_retention_days,
+    }
+
+
+def _stats() -> dict:
+    conn = get_db_connection()
+    try:
+        return history_stats(conn)
+    finally:
+        conn.close()
+
+
+async def archive_expired(older_than_days: int) -> dict:
+    """Run one archival pass; returns the pass result and table stats.
+
+    Each batch is one operation on the DB writer, so request writes queued in
+    the meantime are committed between batches instead of waiting on the lock.
+    """
+    cutoff = _cutoff(older_than_days)
+    archived = chunks = 0
+    while True:
+        rows, batch_chunks = await db_writer.run(_archive_batch, cutoff)
+        if not rows:
+            break
+        archived += rows
+        chunks += batch_chunks
+    if archived:
+        logger.info("Archived %d request history rows older than %s into %d chunks", archived, cutoff, chunks)
+    result = {"archived_rows": archived, "chunks": chunks, "cutoff": cutoff}
+    return {**result, **await asyncio.to_thread(_stats)}
+
+
+async def run_archiver() -> None:
+    """Background loop: archive history past the retention period every interval."""
+    while True:
+        await asyncio.sleep(settings.history_archive_interval)
+        if settings.history_retention_days <= 0:
+            continue
+        try:
+            await archive_expired(settings.history_retention_days)
+        except Exception:
+            logger.exception("Error in request history archiver")
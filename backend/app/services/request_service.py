@@ -1,6 +1,21 @@
 import sqlite3
 import math
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from app.database import fetch_dicts
+
+
+# How long a client's Idempotency-Key keeps returning the request it created
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
+def _find_idempotent_request(conn: sqlite3.Connection, user_id: str, key: str, since: str) -> dict | None:
+    row = conn.execute(
+        """SELECT r.* FROM request_idempotency_keys k JOIN requests r ON r.id = k.request_id
+           WHERE k.user_id = ? AND k.key = ? AND k.created_at >= ?""",
+        (user_id, key, since),
+    ).fetchone()
+    return dict(row) if row else None
 
 
 def create_request(
@@ -11,22 +26,81 @@ def create_request(
     media_type: str,
     title: str,
     poster_path: str | None,
+    idempotency_key: str | None = None,
 ) -> dict:
-    # Check for duplicate
-    existing = conn.execute(
-        "SELECT id, status FROM requests WHERE tmdb_id = ? AND media_type = ? AND user_id = ? AND status != 'denied'",
-        (tmdb_id, media_type, user_id),
-    ).fetchone()
-    if existing:
-        raise ValueError(f"You already have a {existing['status']} request for this title")
+    """Create a request, or return the one an earlier call with the same ``idempotency_key`` made.
 
-    cursor = conn.execute(
+    Duplicates are rejected by the partial unique index on (user_id,
+    media_type, tmdb_id): the insert is a no-op on conflict, so concurrent
+    submits cannot both succeed.
+    """
+    now = datetime.utcnow()
+    if idempotency_key:
+        since = (now - IDEMPOTENCY_KEY_TTL).isoformat()
+        previous = _find_idempotent_request(conn, user_id, idempotency_key, since)
+        if previous:
+            if (previous["tmdb_id"], previous["media_type"]) != (tmdb_id, media_type):
+                raise ValueError("Idempotency-Key was already used for a different title")
+            return previous
+
+    row = conn.execute(
         """INSERT INTO requests (user_id, username, tmdb_id, media_type, title, poster_path)
-           VALUES (?, ?, ?, ?, ?, ?)""",
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT (user_id, media_type, tmdb_id) WHERE status != 'denied' DO NOTHING
+           RETURNING *""",
         (user_id, username, tmdb_id, media_type, title, poster_path),
-    )
+    ).fetchone()
+    if row is None:
+        existing = conn.execute(
+            "SELECT status FROM requests WHERE user_id = ? AND media_type = ? AND tmdb_id = ? AND status != 'denied'",
+            (user_id, media_type, tmdb_id),
+        ).fetchone()
+        raise ValueError(f"You already have a {existing['status']} request for this title")
+
+    if idempotency_key:
+        # Expired keys of this user are dropped as new ones arrive
+        conn.execute(
+            "DELETE FROM request_idempotency_keys WHERE user_id = ? AND created_at < ?",
+            (user_id, since),
+        )
+        conn.execute(
+            """INSERT INTO request_idempotency_keys (user_id, key, request_id, created_at)
+               VALUES (?, ?, ?, ?)""",
+            (user_id, idempotency_key, row["id"], now.isoformat()),
+        )
     conn.commit()
-    return get_request_by_id(conn, cursor.lastrowid)
+    return dict(row)
+
+
+def create_requests_bulk(
+    conn: sqlite3.Connection,
+    user_id: str,
+    username: str,
+    titles: list[dict],
+) -> dict[tuple[int, str], int]:
+    """Insert requests for many titles in one transaction.
+
+    ``titles`` carry tmdb_id, media_type, title and poster_path. Titles the
+    user already has an open request for are skipped by the unique index.
+    Returns the new request id per (tmdb_id, media_type).
+    """
+    created = {}
+    try:
+        for t in titles:
+            row = conn.execute(
+                """INSERT INTO requests (user_id, username, tmdb_id, media_type, title, poster_path)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (user_id, media_type, tmdb_id) WHERE status != 'denied' DO NOTHING
+                   RETURNING id""",
+                (user_id, username, t["tmdb_id"], t["media_type"], t["title"], t["poster_path"]),
+            ).fetchone()
+            if row:
+                created[(t["tmdb_id"], t["media_type"])] = row[0]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return created
 
 
 def get_request_by_id(conn: sqlite3.Connection, request_id: int) -> dict | None:
@@ -51,13 +125,14 @@ def get_user_requests(
 
     total = conn.execute(f"SELECT COUNT(*) FROM requests {where}", params).fetchone()[0]
     offset = (page - 1) * limit
-    rows = conn.execute(
+    items = fetch_dicts(
+        conn,
         f"SELECT * FROM requests {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
         params + [limit, offset],
-    ).fetchall()
+    )
 
     return {
-        "items": [dict(r) for r in rows],
+        "items": items,
         "total": total,
         "page": page,
         "limit": limit,
@@ -84,13 +159,14 @@ def get_all_requests(
     where = ("WHERE " + " AND ".join(where_parts)) if where_parts else ""
     total = conn.execute(f"SELECT COUNT(*) FROM requests {where}", params).fetchone()[0]
     offset = (page - 1) * limit
-    rows = conn.execute(
+    items = fetch_dicts(
+        conn,
         f"SELECT * FROM requests {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
         params + [limit, offset],
-    ).fetchall()
+    )
 
     return {
-        "items": [dict(r) for r in rows],
+        "items": items,
         "total": total,
         "page": page,
         "limit": limit,
@@ -112,10 +188,14 @@ def update_request_status(
     old_status = row["status"]
     now = datetime.utcnow().isoformat()
 
-    conn.execute(
-        "UPDATE requests SET status = ?, admin_note = ?, updated_at = ? WHERE id = ?",
-        (new_status, admin_note, now, request_id),
-    )
+    try:
+        conn.execute(
+            "UPDATE requests SET status = ?, admin_note = ?, updated_at = ? WHERE id = ?",
+            (new_status, admin_note, now, request_id),
+        )
+    except sqlite3.IntegrityError:
+        # Reopening a denied request the user has since requested again
+        raise ValueError("The user already has an open request for this title")
     conn.execute(
         """INSERT INTO request_history (request_id, old_status, new_status, changed_by, note)
            VALUES (?, ?, ?, ?, ?)""",
@@ -157,31 +237,157 @@ def get_request_stats(conn: sqlite3.Connection) -> dict:
     }
 
 
-def get_open_requests(conn: sqlite3.Connection) -> list[dict]:
-    """Get all pending or approved requests (candidates for auto-fulfillment)."""
-    rows = conn.execute(
-        "SELECT * FROM requests WHERE status IN ('pending', 'approved')"
-    ).fetchall()
-    return [dict(r) for r in rows]
+# Statuses a title-level transition moves subscriber requests out of. Approving
+# never reopens fulfilled requests; that is a per-request admin action.
+TITLE_TRANSITIONS = {
+    "approved": ("pending",),
+    "pending": ("approved", "denied"),
+    "denied": ("pending", "approved"),
+    "fulfilled": ("pending", "approved"),
+}
 
+TITLE_STATUS_SQL = """CASE WHEN pending > 0 THEN 'pending'
+                           WHEN approved > 0 THEN 'approved'
+                           WHEN fulfilled > 0 THEN 'fulfilled'
+                           ELSE 'denied' END"""
 
-def auto_fulfill_request(conn: sqlite3.Connection, request_id: int) -> None:
-    """Mark a request as fulfilled by the system."""
-    now = datetime.utcnow().isoformat()
-    row = conn.execute("SELECT status FROM requests WHERE id = ?", (request_id,)).fetchone()
-    if not row:
-        return
-    old_status = row["status"]
-    conn.execute(
-        "UPDATE requests SET status = 'fulfilled', admin_note = 'Auto-fulfilled: found in library', updated_at = ? WHERE id = ?",
-        (now, request_id),
+TITLE_FILTERS = {
+    "open": "vote_count > 0",
+    "pending": "pending > 0",
+    "approved": "approved > 0",
+    "fulfilled": "fulfilled > 0",
+    "denied": "denied > 0",
+}
+
+
+def get_title_queue(
+    conn: sqlite3.Connection,
+    status: str | None = "open",
+    page: int = 1,
+    limit: int = 20,
+) -> dict:
+    """Requested titles ordered by demand (open votes), then by how long they have waited."""
+    where = f"WHERE {TITLE_FILTERS[status]}" if status else ""
+    total = conn.execute(f"SELECT COUNT(*) FROM title_requests {where}").fetchone()[0]
+    offset = (page - 1) * limit
+    items = fetch_dicts(
+        conn,
+        f"""SELECT *, {TITLE_STATUS_SQL} AS status FROM title_requests {where}
+            ORDER BY vote_count DESC, first_requested_at LIMIT ? OFFSET ?""",
+        (limit, offset),
+    )
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": math.ceil(total / limit) if total > 0 else 1,
+    }
+
+
+def get_title_by_id(conn: sqlite3.Connection, title_id: int) -> dict | None:
+    row = conn.execute(
+        f"SELECT *, {TITLE_STATUS_SQL} AS status FROM title_requests WHERE id = ?", (title_id,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def get_title_subscribers(conn: sqlite3.Connection, title_id: int) -> list[dict]:
+    return fetch_dicts(
+        conn,
+        """SELECT r.id, r.user_id, r.username, r.status, r.admin_note, r.created_at
+           FROM title_requests t
+           JOIN requests r ON r.tmdb_id = t.tmdb_id AND r.media_type = t.media_type
+           WHERE t.id = ? ORDER BY r.created_at""",
+        (title_id,),
     )
+
+
+def _cascade_title_status(
+    conn: sqlite3.Connection,
+    title: dict,
+    new_status: str,
+    changed_by: str,
+    note: str | None,
+    history_note: str | None,
+) -> int:
+    """Move every subscriber request the transition applies to; caller commits."""
+    sources = TITLE_TRANSITIONS[new_status]
+    placeholders = ", ".join("?" for _ in sources)
+    match = f"tmdb_id = ? AND media_type = ? AND status IN ({placeholders})"
+    if "denied" in sources:
+        # Reopen at most one denied request per user, and none for users who
+        # already have an open one (one non-denied request per user and title)
+        match += """ AND (status != 'denied' OR id = (
+            SELECT MAX(d.id) FROM requests d
+            WHERE d.user_id = requests.user_id AND d.media_type = requests.media_type
+              AND d.tmdb_id = requests.tmdb_id AND d.status = 'denied'
+              AND NOT EXISTS (
+                  SELECT 1 FROM requests o
+                  WHERE o.user_id = d.user_id AND o.media_type = d.media_type
+                    AND o.tmdb_id = d.tmdb_id AND o.status != 'denied'
+              )
+        ))"""
+    params = (title["tmdb_id"], title["media_type"], *sources)
     conn.execute(
-        """INSERT INTO request_history (request_id, old_status, new_status, changed_by, note)
-           VALUES (?, ?, 'fulfilled', 'system', 'Auto-fulfilled: found in Jellyfin library')""",
-        (request_id, old_status),
+        f"""INSERT INTO request_history (request_id, old_status, new_status, changed_by, note)
+            SELECT id, status, ?, ?, ? FROM requests WHERE {match}""",
+        (new_status, changed_by, history_note, *params),
     )
-    conn.commit()
+    cursor = conn.execute(
+        f"UPDATE requests SET status = ?, admin_note = ?, updated_at = ? WHERE {match}",
+        (new_status, note, datetime.utcnow().isoformat(), *params),
+    )
+    return cursor.rowcount
+
+
+def update_title_status(
+    conn: sqlite3.Connection,
+    title_id: int,
+    new_status: str,
+    changed_by: str,
+    admin_note: str | None = None,
+) -> dict:
+    """Apply a status change to all subscribers of a title in one transaction."""
+    title = get_title_by_id(conn, title_id)
+    if not title:
+        raise ValueError("Title not found")
+    try:
+        updated = _cascade_title_status(conn, title, new_status, changed_by, admin_note, admin_note)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return {**get_title_by_id(conn, title_id), "updated_requests": updated}
+
+
+def get_open_titles(conn: sqlite3.Connection) -> list[dict]:
+    """Titles with pending or approved requests (candidates for auto-fulfillment)."""
+    return fetch_dicts(
+        conn,
+        "SELECT id, tmdb_id, media_type, title FROM title_requests WHERE vote_count > 0",
+    )
+
+
+def auto_fulfill_titles(conn: sqlite3.Connection, title_ids: list[int]) -> int:
+    """Mark every open request for the titles as fulfilled by the system, in one transaction.
+
+    Returns how many requests were fulfilled.
+    """
+    updated = 0
+    try:
+        for title_id in title_ids:
+            title = get_title_by_id(conn, title_id)
+            if title:
+                updated += _cascade_title_status(
+                    conn, title, "fulfilled", "system",
+                    "Auto-fulfilled: found in library", "Auto-fulfilled: found in Jellyfin library",
+                )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return updated
 
 
 def get_request_for_tmdb(
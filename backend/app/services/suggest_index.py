@@ -0,0 +1,138 @@
+import bisect
+import re
+import sqlite3
+import unicodedata
+
+_ARTICLES = ("the ", "a ", "an ")
+# Anything but a letter or digit, in any script
+_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip accents from Latin letters, turn punctuation into single spaces.
+
+    Letters and digits of every script are kept, so "千と千尋の神隠し" and
+    "Брат" have keys of their own. Only marks on ASCII letters are dropped
+    ("Amélie" -> "amelie"); marks that make a different letter elsewhere (kana
+    dakuten, Cyrillic й) stay.
+    """
+    text = unicodedata.normalize("NFKD", title or "")
+    kept = []
+    for c in text:
+        if unicodedata.combining(c) and kept and kept[-1] < "\x80":
+            continue
+        kept.append(c)
+    text = unicodedata.normalize("NFC", "".join(kept)).lower()
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def release_year(result: dict) -> int | None:
+    """Year from a TMDB result's release_date (movies) or first_air_date (TV)."""
+    date = result.get("release_date") or result.get("first_air_date") or ""
+    return int(date[:4]) if date[:4].isdigit() else None
+
+
+class SuggestIndex:
+    """Prefix index of known titles for search-as-you-type.
+
+    Titles are kept as a sorted list of normalized keys, so a prefix lookup is a
+    binary search plus a short scan. Titles starting with an article are also
+    indexed without it ("the matrix" matches "matrix"). Past ``max_entries`` the
+    least recently seen title is evicted, so the index keeps following recent
+    TMDB results.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._keys: list[tuple[str, str, int]] = []
+        self._entries: dict[tuple[str, int], dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        tmdb_id: int,
+        media_type: str,
+        title: str,
+        year: int | None = None,
+        poster_path: str | None = None,
+    ) -> None:
+        if media_type not in ("movie", "tv") or not tmdb_id or not title:
+            return
+        ident = (media_type, tmdb_id)
+        existing = self._entries.get(ident)
+        if existing:
+            # Keep the richest record we have seen, and mark it recently seen
+            existing["year"] = existing["year"] or year
+            existing["poster_path"] = existing["poster_path"] or poster_path
+            self._entries[ident] = self._entries.pop(ident)
+            return
+        while len(self._entries) >= self.max_entries:
+            self._evict_oldest()
+        self._entries[ident] = {
+            "tmdb_id": tmdb_id,
+            "media_type": media_type,
+            "title": title,
+            "year": year,
+            "poster_path": poster_path,
+        }
+        for k in self._index_keys(title):
+            bisect.insort(self._keys, (k, media_type, tmdb_id))
+
+    @staticmethod
+    def _index_keys(title: str) -> set[str]:
+        key = normalize_title(title)
+        keys = {key} if key else set()
+        for article in _ARTICLES:
+            if key.startswith(article):
+                keys.add(key[len(article):])
+        return keys
+
+    def _evict_oldest(self) -> None:
+        # Dicts keep insertion order, and add() moves re-seen titles to the end
+        (media_type, tmdb_id), entry = next(iter(self._entries.items()))
+        del self._entries[(media_type, tmdb_id)]
+        for k in self._index_keys(entry["title"]):
+            item = (k, media_type, tmdb_id)
+            i = bisect.bisect_left(self._keys, item)
+            if i < len(self._keys) and self._keys[i] == item:
+                del self._keys[i]
+
+    def add_tmdb_results(self, results: list[dict]) -> None:
+        for r in results:
+            self.add(
+                r.get("id"),
+                r.get("media_type", "movie"),
+                r.get("title") or r.get("name", ""),
+                release_year(r),
+                r.get("poster_path"),
+            )
+
+    def load_requests(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute(
+            "SELECT DISTINCT tmdb_id, media_type, title, poster_path FROM requests WHERE media_type IN ('movie', 'tv')"
+        ).fetchall()
+        for row in rows:
+            self.add(row["tmdb_id"], row["media_type"], row["title"], None, row["poster_path"])
+
+    def search(self, query: str, limit: int = 8, media_type: str | None = None) -> list[dict]:
+        prefix = normalize_title(query)
+        if not prefix:
+            return []
+        results: list[dict] = []
+        seen: set[tuple[str, int]] = set()
+        i = bisect.bisect_left(self._keys, (prefix,))
+        while i < len(self._keys) and len(results) < limit:
+            key, kind, tmdb_id = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            i += 1
+            if (kind, tmdb_id) in seen or (media_type and kind != media_type):
+                continue
+            seen.add((kind, tmdb_id))
+            results.append(dict(self._entries[(kind, tmdb_id)]))
+        return results
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,84 @@
+"""Keys and similarity for matching TMDB titles to library items without a TMDB id.
+
+Titles are compared as match keys: normalized (``normalize_title``) with a
+leading article dropped, so "The Office" and "Office, The" style variants and
+punctuation differences collapse to one key. Near matches use the Dice
+coefficient over padded character trigrams, with trigrams encoded as 32-bit
+CRCs so they can live in the catalog's integer columns.
+"""
+import math
+import re
+import zlib
+from hashlib import blake2b
+
+from app.services.suggest_index import normalize_title, release_year
+
+ARTICLES = ("the ", "a ", "an ")
+_TRAILING_ARTICLE = re.compile(r"^(.*),\s*(the|a|an)\s*$", re.IGNORECASE)
+# Dice similarity a fuzzy match must reach
+FUZZY_THRESHOLD = 0.8
+# Sequel and part numbers, which must agree even between near matches
+_NUMBER = re.compile(r"\b(?:\d+|[ivx]+)\b")
+
+
+def match_key(title: str | None) -> str:
+    # "Office, The" -> "The Office"
+    title = _TRAILING_ARTICLE.sub(r"\2 \1", title or "")
+    key = normalize_title(title)
+    for article in ARTICLES:
+        if key.startswith(article) and len(key) > len(article):
+            return key[len(article):]
+    return key
+
+
+def key_hash(key: str) -> int:
+    """Signed 64-bit hash of a match key, for the catalog's sorted title column."""
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little", signed=True)
+
+
+def trigrams(key: str) -> set[int]:
+    padded = f"  {key} "
+    return {zlib.crc32(padded[i:i + 3].encode()) for i in range(len(padded) - 2)}
+
+
+def dice(a: set[int], b: set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def numbers(key: str) -> list[str]:
+    """Number tokens of a match key; "Rocky II" and "Rocky III" are close but not the same film."""
+    return _NUMBER.findall(key)
+
+
+def min_shared(query_size: int, threshold: float = FUZZY_THRESHOLD) -> int:
+    """Fewest trigrams a candidate must share with the query to reach ``threshold``.
+
+    From 2c / (q + r) >= t and r >= c: c >= t * q / (2 - t). Any match must
+    therefore contain one of the ``q - min_shared + 1`` rarest query trigrams,
+    so only their posting lists need scanning.
+    """
+    return max(1, math.ceil(threshold * query_size / (2 - threshold)))
+
+
+def external_key(source: str, value) -> int | None:
+    """Pack an IMDb ("tt0133093") or TVDB id into one integer for the cross-reference index."""
+    text = str(value or "").strip().lower()
+    if source == "imdb":
+        text = text.removeprefix("tt")
+    if not text.isdigit():
+        return None
+    return int(text) << 1 | (source == "tvdb")
+
+
+def tmdb_match_fields(data: dict) -> dict:
+    """``LibraryCatalog.match`` keyword arguments from a TMDB search result or details."""
+    external_ids = data.get("external_ids") or {}
+    return {
+        "title": data.get("title") or data.get("name"),
+        "original_title": data.get("original_title") or data.get("original_name"),
+        "year": release_year(data),
+        "imdb_id": data.get("imdb_id") or external_ids.get("imdb_id"),
+        "tvdb_id": external_ids.get("tvdb_id"),
+    }
@@ -1,12 +1,40 @@
+import asyncio
+
 import httpx
 
 from app.config import settings
+from app.services.circuit_breaker import get_breaker
+from app.services.rate_limiter import PRIORITY_INTERACTIVE, get_limiter
 
 
 class TMDBClient:
     def __init__(self):
         self.base_url = settings.tmdb_base_url.rstrip("/")
         self.api_key = settings.tmdb_api_key
+        self.breaker = get_breaker("tmdb", min_timeout=2.0, max_timeout=10.0)
+        self.limiter = get_limiter("tmdb", settings.tmdb_rate_limit, settings.tmdb_rate_burst)
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Connection-pooled client for the running event loop (see ``JellyfinClient.client``)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=settings.tmdb_max_connections,
+                    max_keepalive_connections=settings.tmdb_max_connections,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
 
     def _params(self, extra: dict | None = None) -> dict:
         params = {"api_key": self.api_key}
@@ -14,56 +42,49 @@ class TMDBClient:
             params.update(extra)
         return params
 
-    async def search_multi(self, query: str, page: int = 1) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/search/multi",
-                params=self._params({"query": query, "page": page}),
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            # Filter to only movie and tv results
-            data["results"] = [
-                r for r in data.get("results", [])
-                if r.get("media_type") in ("movie", "tv")
-            ]
-            return data
-
-    async def search_movies(self, query: str, page: int = 1) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/search/movie",
-                params=self._params({"query": query, "page": page}),
-            )
-            resp.raise_for_status()
-            return resp.json()
-
-    async def search_tv(self, query: str, page: int = 1) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/search/tv",
-                params=self._params({"query": query, "page": page}),
-            )
-            resp.raise_for_status()
-            return resp.json()
-
-    async def get_movie_details(self, tmdb_id: int) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/movie/{tmdb_id}",
-                params=self._params({"append_to_response": "credits"}),
-            )
-            resp.raise_for_status()
-            return resp.json()
-
-    async def get_tv_details(self, tmdb_id: int) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/tv/{tmdb_id}",
-                params=self._params({"append_to_response": "credits"}),
-            )
-            resp.raise_for_status()
-            return resp.json()
+    async def _get(
+        self, path: str, params: dict | None = None, priority: int = PRIORITY_INTERACTIVE
+    ) -> dict:
+        async def send() -> dict:
+            async with self.breaker.guard():
+                resp = await self.client.get(path, params=self._params(params), timeout=self.breaker.timeout)
+                resp.raise_for_status()
+                return resp.json()
+
+        return await self.limiter.run(send, priority)
+
+    async def search_multi(
+        self, query: str, page: int = 1, priority: int = PRIORITY_INTERACTIVE
+    ) -> dict:
+        data = await self._get("/search/multi", {"query": query, "page": page}, priority)
+        # Filter to only movie and tv results
+        data["results"] = [
+            r for r in data.get("results", [])
+            if r.get("media_type") in ("movie", "tv")
+        ]
+        return data
+
+    async def search_movies(
+        self, query: str, page: int = 1, priority: int = PRIORITY_INTERACTIVE, year: int | None = None
+    ) -> dict:
+        params = {"query": query, "page": page}
+        if year:
+            params["year"] = year
+        return await self._get("/search/movie", params, priority)
+
+    async def search_tv(
+        self, query: str, page: int = 1, priority: int = PRIORITY_INTERACTIVE, year: int | None = None
+    ) -> dict:
+        params = {"query": query, "page": page}
+        if year:
+            params["first_air_date_year"] = year
+        return await self._get("/search/tv", params, priority)
+
+    async def get_movie_details(self, tmdb_id: int, priority: int = PRIORITY_INTERACTIVE) -> dict:
+        return await self._get(f"/movie/{tmdb_id}", {"append_to_response": "credits"}, priority)
+
+    async def get_tv_details(self, tmdb_id: int, priority: int = PRIORITY_INTERACTIVE) -> dict:
+        return await self._get(f"/tv/{tmdb_id}", {"append_to_response": "credits,external_ids"}, priority)
 
 
 tmdb_client = TMDBClient()
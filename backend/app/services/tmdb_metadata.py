@@ -0,0 +1,21 @@
+from app.services.cache import get_cache
+from app.services.rate_limiter import PRIORITY_INTERACTIVE
+from app.services.tmdb_client import tmdb_client
+
+details_cache = get_cache("tmdb_details", ttl=6 * 3600, max_entries=4096)
+
+
+async def get_movie_details(tmdb_id: int, priority: int = PRIORITY_INTERACTIVE) -> dict:
+    return await details_cache.get_or_load(
+        ("movie", tmdb_id), lambda: tmdb_client.get_movie_details(tmdb_id, priority)
+    )
+
+
+async def get_tv_details(tmdb_id: int, priority: int = PRIORITY_INTERACTIVE) -> dict:
+    return await details_cache.get_or_load(
+        ("tv", tmdb_id), lambda: tmdb_client.get_tv_details(tmdb_id, priority)
+    )
+
+
+def is_cached(media_type: str, tmdb_id: int) -> bool:
+    return (media_type, tmdb_id) in details_cache
@@ -0,0 +1,58 @@
+"""Season availability of a TV show: TMDB's aired episodes against the library's.
+
+TMDB's ``episode_count`` includes announced episodes of a running season, so
+the expected count stops at ``last_episode_to_air``; seasons after it are
+``unaired`` and do not count against completeness. Specials (season 0) are
+reported but never required.
+"""
+
+
+def aired_episodes(details: dict) -> dict[int, int]:
+    """Episodes aired so far per season number, from cached TMDB TV details."""
+    last = details.get("last_episode_to_air") or {}
+    last_season, last_episode = last.get("season_number"), last.get("episode_number")
+    aired = {}
+    for season in details.get("seasons") or []:
+        number = season.get("season_number")
+        if number is None:
+            continue
+        count = season.get("episode_count") or 0
+        if last_season is not None and number:
+            if number > last_season:
+                count = 0
+            elif number == last_season and last_episode:
+                count = min(count, last_episode)
+        aired[number] = count
+    return aired
+
+
+def season_availability(details: dict, library_seasons: dict[int, int]) -> list[dict]:
+    """Per-season rows for ``TMDBTvDetail.seasons``, in TMDB's season order."""
+    aired = aired_episodes(details)
+    seasons = []
+    for season in details.get("seasons") or []:
+        number = season.get("season_number")
+        if number is None:
+            continue
+        available = library_seasons.get(number, 0)
+        if not aired[number]:
+            status = "available" if available else "unaired"
+        elif available >= aired[number]:
+            status = "available"
+        else:
+            status = "partial" if available else "missing"
+        seasons.append({
+            "season_number": number,
+            "name": season.get("name"),
+            "episode_count": season.get("episode_count") or 0,
+            "aired_episodes": aired[number],
+            "available_episodes": available,
+            "status": status,
+        })
+    return seasons
+
+
+def library_status(seasons: list[dict]) -> str:
+    """``available`` when every aired regular season is complete, else ``partial``."""
+    required = [s for s in seasons if s["season_number"] and s["aired_episodes"]]
+    return "available" if all(s["status"] == "available" for s in required) else "partial"
@@ -0,0 +1,51 @@
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """Wall-clock timings for the phases of a cold start (imports, DB init, clients).
+
+    Phases are recorded in the order they finish. ``finish()`` is called once the
+    app is ready to serve and logs the report; ``report()`` backs the admin
+    endpoint.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.phases: list[tuple[str, float]] = []
+        self.ready_after: float | None = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def finish(self) -> None:
+        if self.ready_after is not None:
+            return
+        self.ready_after = time.perf_counter() - self.started
+        logger.info(
+            "Startup ready in %.0fms (%s)",
+            self.ready_after * 1000,
+            ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases),
+        )
+
+    def report(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "ready_ms": round(self.ready_after * 1000, 1) if self.ready_after is not None else None,
+            "phases": [
+                {"name": name, "ms": round(seconds * 1000, 1)} for name, seconds in self.phases
+            ],
+        }
+
+
+startup_profiler = StartupProfiler()
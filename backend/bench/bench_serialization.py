@@ -0,0 +1,103 @@
+"""Compare allocations and time per response for list endpoints.
+
+The old path read rows through ``sqlite3.Row``, copied each into a dict,
+validated the page against ``PaginatedResponse`` and encoded it with
+``jsonable_encoder`` + ``json.dumps``. The fast path builds plain dicts straight
+from the cursor and encodes them once.
+
+Run from ``backend/``::
+
+    python -m bench.bench_serialization [--rows 5000] [--page-size 50] [--iterations 200]
+"""
+import argparse
+import json
+import sqlite3
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+
+from app.database import fetch_dicts
+from app.schemas import PaginatedResponse
+from app.serialization import dumps, orjson
+
+
+def build_db(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            username TEXT NOT NULL,
+            tmdb_id INTEGER NOT NULL,
+            media_type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            poster_path TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            admin_note TEXT,
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO requests (user_id, username, tmdb_id, media_type, title, poster_path, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (f"user-{i % 40}", f"user{i % 40}", 1000 + i, "movie" if i % 3 else "tv",
+             f"Some Title Number {i}", f"/poster{i}.jpg", ("pending", "approved", "fulfilled")[i % 3])
+            for i in range(rows)
+        ],
+    )
+    conn.commit()
+    return conn
+
+
+def old_path(conn: sqlite3.Connection, limit: int, offset: int) -> bytes:
+    rows = conn.execute(
+        "SELECT * FROM requests ORDER BY created_at DESC LIMIT ? OFFSET ?", (limit, offset)
+    ).fetchall()
+    page = {"items": [dict(r) for r in rows], "total": 0, "page": 1, "limit": limit, "total_pages": 1}
+    model = PaginatedResponse.model_validate(page)
+    return json.dumps(jsonable_encoder(model), separators=(",", ":")).encode()
+
+
+def new_path(conn: sqlite3.Connection, limit: int, offset: int) -> bytes:
+    items = fetch_dicts(
+        conn, "SELECT * FROM requests ORDER BY created_at DESC LIMIT ? OFFSET ?", (limit, offset)
+    )
+    return dumps({"items": items, "total": 0, "page": 1, "limit": limit, "total_pages": 1})
+
+
+def measure(fn, conn, limit: int, iterations: int) -> tuple[float, int]:
+    """Mean ms per response, and peak bytes allocated while building one."""
+    fn(conn, limit, 0)  # warm up caches and lazy imports
+    tracemalloc.start()
+    fn(conn, limit, 0)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(conn, limit, (i * limit) % 1000)
+    return (time.perf_counter() - start) * 1000 / iterations, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    conn = build_db(args.rows)
+    assert json.loads(old_path(conn, args.page_size, 0)) == json.loads(new_path(conn, args.page_size, 0))
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json (stdlib fallback)'}")
+    print(f"{'path':<6} {'ms/response':>12} {'peak bytes':>12}")
+    for name, fn in (("old", old_path), ("new", new_path)):
+        ms, peak = measure(fn, conn, args.page_size, args.iterations)
+        print(f"{name:<6} {ms:>12.3f} {peak:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""Scripted load scenarios against the backend with stubbed upstreams.
+
+By default the backend runs in-process (``httpx.ASGITransport``) on a seeded
+database, talking to ``bench.stubs`` started as a subprocess. Each scenario is
+a closed loop: ``--concurrency`` workers issue requests back to back for
+``--duration`` seconds after a short warm-up, and the report gives p50/p95/p99
+latency and throughput of the calls that complete after the warm-up. ``login``
+posts to ``/api/auth/login`` as a mix of returning and first-time users. The
+auto-fulfill scenario times whole passes of ``fulfill_open_requests`` over a
+sample of open requests instead.
+
+Results can be saved with ``--save`` and checked against a saved baseline with
+``--compare``, which exits non-zero when p95 latency or throughput regresses by
+more than ``--max-regression``.
+
+Run from ``backend/`` (seed first with ``python -m bench.seed``)::
+
+    python -m bench.load --db /tmp/mediamanager-bench.db --scenario all --duration 10
+    python -m bench.load --base-url http://localhost:8000 --scenario search
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+import httpx
+import jwt
+
+from bench.seed import ADMIN_USER_ID, user_id_for
+from bench.stubs import StubConfig
+
+HTTP_SCENARIOS = ("search", "library", "admin_queue", "login")
+SCENARIOS = HTTP_SCENARIOS + ("fulfill",)
+
+
+@dataclass
+class Result:
+    scenario: str
+    requests: int
+    errors: int
+    seconds: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(scenario: str, latencies: list[float], errors: int, seconds: float) -> Result:
+    latencies.sort()
+    return Result(
+        scenario=scenario,
+        requests=len(latencies),
+        errors=errors,
+        seconds=seconds,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+    )
+
+
+class Tokens:
+    """Session JWTs shaped like the ones ``/api/auth/login`` issues."""
+
+    def __init__(self, secret_key: str, users: int):
+        self.secret_key = secret_key
+        self.users = users
+        self._cache: dict[str, dict] = {}
+
+    def headers(self, user_id: str, is_admin: bool = False) -> dict:
+        if user_id not in self._cache:
+            token = jwt.encode(
+                {
+                    "user_id": user_id,
+                    "username": user_id,
+                    "is_admin": is_admin,
+                    "jellyfin_token": f"token-{user_id}",
+                },
+                self.secret_key,
+                algorithm="HS256",
+            )
+            self._cache[user_id] = {"Authorization": f"Bearer {token}"}
+        return self._cache[user_id]
+
+    def random_user(self, rng: random.Random) -> dict:
+        return self.headers(user_id_for(rng.randrange(self.users)))
+
+    def admin(self) -> dict:
+        return self.headers(ADMIN_USER_ID, is_admin=True)
+
+
+# Each builder returns (method, url, headers) or (method, url, headers, json body) for one request
+def search_request(rng: random.Random, tokens: Tokens):
+    return "GET", f"/api/tmdb/search?query=title+{rng.randrange(2000)}", tokens.random_user(rng)
+
+
+def library_request(rng: random.Random, tokens: Tokens):
+    kind = rng.choice(("movies", "tvshows"))
+    return "GET", f"/api/library/{kind}?page={rng.randint(1, 40)}&limit=50", tokens.random_user(rng)
+
+
+def admin_queue_request(rng: random.Random, tokens: Tokens):
+    if rng.random() < 0.1:
+        return "GET", "/api/admin/stats", tokens.admin()
+    status = rng.choice(("pending", "approved", None))
+    url = f"/api/admin/requests?page={rng.randint(1, 100)}&limit=20"
+    return "GET", url + (f"&status={status}" if status else ""), tokens.admin()
+
+
+def login_request(rng: random.Random, tokens: Tokens):
+    # The stub accepts any password; a tenth of the logins are new users
+    n = rng.randrange(tokens.users * 10 if rng.random() < 0.1 else tokens.users)
+    return "POST", "/api/auth/login", {}, {"username": f"user{n}", "password": "bench"}
+
+
+BUILDERS = {
+    "search": search_request,
+    "library": library_request,
+    "admin_queue": admin_queue_request,
+    "login": login_request,
+}
+
+
+async def run_http_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    tokens: Tokens,
+    duration: float,
+    warmup: float,
+    concurrency: int,
+) -> Result:
+    build = BUILDERS[scenario]
+    latencies: list[float] = []
+    errors = 0
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+
+    async def worker(n: int) -> None:
+        nonlocal errors
+        rng = random.Random(n)
+        while (started := time.perf_counter()) < deadline:
+            method, url, headers, *body = build(rng, tokens)
+            try:
+                resp = await client.request(method, url, headers=headers, json=body[0] if body else None)
+                failed = resp.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            finished = time.perf_counter()
+            # Count by completion time, so calls slower than the warm-up still count
+            if finished >= measure_from:
+                latencies.append(finished - started)
+                errors += failed
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    # In-flight calls finish after the deadline, so use the real elapsed time
+    return summarize(scenario, latencies, errors, time.perf_counter() - measure_from)
+
+
+async def run_fulfill_scenario(db_path: str, sample: int, cycles: int) -> Result:
+    """Time auto-fulfill passes, each on a fresh copy of the database.
+
+    Fulfillment writes go through ``db_writer`` as in the app, so each pass
+    points the database (and a freshly started writer) at its copy.
+    """
+    from app import database
+    from app.main import fulfill_open_requests
+    from app.services.db_writer import db_writer
+
+    source = sqlite3.connect(db_path)
+    copy_path = f"{db_path}.fulfill"
+    original_path = database.DB_PATH
+    writer_was_running = db_writer.running
+    await db_writer.stop()
+    latencies: list[float] = []
+    checked = fulfilled = 0
+    try:
+        for _ in range(cycles):
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(copy_path + suffix):
+                    os.remove(copy_path + suffix)
+            copy = sqlite3.connect(copy_path)
+            source.backup(copy)
+            copy.close()
+            database.DB_PATH = copy_path
+            await db_writer.start()
+            conn = database.get_db_connection()
+            # Keep a fixed-size sample of open requests so a pass has a bounded cost
+            conn.execute(
+                """UPDATE requests SET status = 'denied'
+                   WHERE status IN ('pending', 'approved') AND id NOT IN (
+                       SELECT id FROM requests WHERE status IN ('pending', 'approved')
+                       ORDER BY id LIMIT ?)""",
+                (sample,),
+            )
+            conn.commit()
+            (open_requests,) = conn.execute(
+                "SELECT COUNT(*) FROM requests WHERE status IN ('pending', 'approved')"
+            ).fetchone()
+            started = time.perf_counter()
+            fulfilled += await fulfill_open_requests(conn)
+            latencies.append(time.perf_counter() - started)
+            checked += open_requests
+            conn.close()
+            await db_writer.stop()
+    finally:
+        source.close()
+        await db_writer.stop()
+        database.DB_PATH = original_path
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(copy_path + suffix):
+                os.remove(copy_path + suffix)
+        if writer_was_running:
+            await db_writer.start()
+
+    total = sum(latencies)
+    result = summarize("fulfill", latencies, 0, total)
+    # Throughput here is requests checked per second, not passes per second
+    result.requests = checked
+    print(f"  fulfill: {fulfilled} of {checked} sampled open requests fulfilled over {cycles} pass(es)")
+    return result
+
+
+def count_open_requests(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM requests WHERE status IN ('pending', 'approved')").fetchone()[0]
+    except sqlite3.Error:
+        return 0
+    finally:
+        conn.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stubs(latency_ms: float, error_rate: float) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "bench.stubs", "--port", str(port),
+            "--latency-ms", str(latency_ms), "--error-rate", str(error_rate),
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(f"{url}/System/Info/Public", timeout=0.5)
+            return proc, url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("stub server did not start")
+
+
+def configure_backend(db_path: str, stub_url: str) -> None:
+    """Point the in-process backend at the seeded database and the stubs.
+
+    Must run before anything under ``app`` is imported, since settings and
+    clients are built at import time.
+    """
+    os.environ.update({
+        "MEDIAMANAGER_DB_PATH": db_path,
+        "JELLYFIN_URL": stub_url,
+        "TMDB_BASE_URL": stub_url,
+        "OPENLIBRARY_BASE_URL": stub_url,
+        "TMDB_API_KEY": "bench",
+        # Measure the endpoints, not the per-user request budget
+        "RATE_LIMIT_SEARCH_PER_MINUTE": "0",
+        "RATE_LIMIT_SUGGEST_PER_MINUTE": "0",
+        "RATE_LIMIT_REQUESTS_PER_MINUTE": "0",
+        "TMDB_RATE_LIMIT": "100000",
+        "TMDB_RATE_BURST": "100000",
+    })
+
+
+def print_results(results: list[Result]) -> None:
+    print(f"{'scenario':<12} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(
+            f"{r.scenario:<12} {r.requests:>9} {r.errors:>7} {r.throughput:>9.1f} "
+            f"{r.p50_ms:>9.2f} {r.p95_ms:>9.2f} {r.p99_ms:>9.2f}"
+        )
+
+
+def compare(results: list[Result], baseline_path: str, max_regression: float) -> list[str]:
+    with open(baseline_path) as f:
+        baseline = {r["scenario"]: r for r in json.load(f)}
+    regressions = []
+    for r in results:
+        base = baseline.get(r.scenario)
+        if not base:
+            continue
+        base_throughput = base["requests"] / base["seconds"] if base["seconds"] else 0
+        if base["p95_ms"] and r.p95_ms > base["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{r.scenario}: p95 {base['p95_ms']:.2f}ms -> {r.p95_ms:.2f}ms")
+        if base_throughput and r.throughput < base_throughput * (1 - max_regression):
+            regressions.append(f"{r.scenario}: throughput {base_throughput:.1f} -> {r.throughput:.1f} req/s")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results = []
+
+    if args.base_url:
+        from app.config import settings
+
+        tokens = Tokens(args.secret_key or settings.secret_key, args.users)
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        from app.config import settings
+        from app.main import app
+        from app.services.db_writer import db_writer
+
+        tokens = Tokens(settings.secret_key, args.users)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30
+        )
+        # ASGITransport skips the lifespan; writes should still be group-committed
+        await db_writer.start()
+
+    async with client:
+        for scenario in scenarios:
+            print(f"running {scenario}...")
+            if scenario == "fulfill":
+                if args.base_url:
+                    print("  skipped: fulfill runs in-process only")
+                    continue
+                results.append(await run_fulfill_scenario(args.db, args.fulfill_sample, args.fulfill_cycles))
+            else:
+                results.append(await run_http_scenario(
+                    client, scenario, tokens, args.duration, args.warmup, args.concurrency
+                ))
+    if not args.base_url:
+        await db_writer.stop()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load scenarios with p50/p95/p99 and throughput")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--db", default="/tmp/mediamanager-bench.db", help="seeded database (bench.seed)")
+    parser.add_argument("--users", type=int, default=1000, help="users seeded into --db")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms, help="stub upstream latency")
+    parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate, help="stub upstream 503 rate")
+    parser.add_argument("--stub-url", help="use an already running bench.stubs server")
+    parser.add_argument("--base-url", help="load a running backend instead of an in-process one")
+    parser.add_argument("--secret-key", help="JWT secret of the backend at --base-url")
+    parser.add_argument("--fulfill-sample", type=int, default=500, help="open requests per fulfill pass")
+    parser.add_argument("--fulfill-cycles", type=int, default=3)
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --save")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    stubs = None
+    if not args.base_url:
+        if not os.path.exists(args.db):
+            parser.error(f"{args.db} not found; run python -m bench.seed --path {args.db} first")
+        if args.scenario in ("fulfill", "all") and not count_open_requests(args.db):
+            # An empty pass would time nothing and still pass --compare
+            parser.error(f"{args.db} has no open requests to fulfill; re-run python -m bench.seed --path {args.db}")
+        stub_url = args.stub_url
+        if not stub_url:
+            stubs, stub_url = start_stubs(args.latency_ms, args.error_rate)
+        configure_backend(args.db, stub_url)
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if stubs:
+            stubs.terminate()
+            stubs.wait()
+
+    print_results(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Generate a seeded SQLite database for benchmarks and load tests.
+
+Rows are deterministic for a given ``--seed``. Requests use the same
+``Title <tmdb_id>`` scheme as ``bench.stubs``, so with the default stub catalogue
+roughly a third of the open requests are found in the library by the
+auto-fulfill pass. Like the database itself, each user has at most one
+non-denied request per title; a draw that would repeat one is seeded as denied.
+
+Run from ``backend/``::
+
+    python -m bench.seed --path /tmp/mediamanager-bench.db --requests 100000 --backlog 20000
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from bench.stubs import StubConfig, title_for
+
+STATUSES = ("pending", "approved", "denied", "fulfilled")
+STATUS_WEIGHTS = (40, 20, 10, 30)
+BACKLOG_STATUSES = ("reported", "triaged", "in_progress", "ready_for_test", "resolved", "wont_fix")
+PRIORITIES = ("low", "medium", "high", "critical")
+
+ADMIN_USER_ID = "bench-admin"
+
+
+def user_id_for(n: int) -> str:
+    return f"bench-user-{n}"
+
+
+def seed(
+    path: str,
+    requests: int = 100000,
+    backlog: int = 20000,
+    users: int = 1000,
+    catalog_size: int = StubConfig.catalog_size,
+    seed_value: int = 1,
+) -> None:
+    # Imported here so the caller can point DB_PATH at the target first
+    from app import database
+
+    # Built next to the target and moved into place, so a failed run keeps the old database
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    database.DB_PATH = tmp_path
+    database.init_db()
+
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+    conn = database.get_db_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO user_roles (user_id, username, role, granted_by, jellyfin_token) VALUES (?, ?, ?, ?, ?)",
+            [(ADMIN_USER_ID, "bench-admin", "admin", "system", "token-bench-admin")]
+            + [(user_id_for(n), f"user{n}", "user", None, f"token-user{n}") for n in range(users)],
+        )
+
+        request_rows = []
+        history_rows = []
+        active = set()  # (user, media_type, tmdb_id) of non-denied requests
+        for request_id in range(1, requests + 1):
+            tmdb_id = rng.randint(1, catalog_size)
+            media_type = "movie" if tmdb_id % 2 else "tv"
+            status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+            created = start + timedelta(minutes=request_id * 5)
+            user = rng.randrange(users)
+            if status != "denied":
+                key = (user, media_type, tmdb_id)
+                if key in active:
+                    status = "denied"
+                active.add(key)
+            request_rows.append((
+                request_id, user_id_for(user), f"user{user}", tmdb_id, media_type,
+                title_for(tmdb_id), f"/p{tmdb_id}.jpg", status, created.isoformat(" "),
+                created.isoformat(" "),
+            ))
+            if status != "pending":
+                history_rows.append((request_id, "pending", status, ADMIN_USER_ID, created.isoformat(" ")))
+
+        conn.executemany(
+            """INSERT INTO requests (id, user_id, username, tmdb_id, media_type, title, poster_path, status, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            request_rows,
+        )
+        conn.executemany(
+            """INSERT INTO request_history (request_id, old_status, new_status, changed_by, created_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            history_rows,
+        )
+        conn.executemany(
+            """INSERT INTO backlog (user_id, username, type, title, description, status, priority, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    user_id_for(n % users), f"user{n % users}", rng.choice(("bug", "feature")),
+                    f"Backlog item {n}", "Steps to reproduce: open the app and look around.",
+                    rng.choice(BACKLOG_STATUSES), rng.choice(PRIORITIES),
+                    (start + timedelta(minutes=n * 17)).isoformat(" "),
+                    (start + timedelta(minutes=n * 17)).isoformat(" "),
+                )
+                for n in range(backlog)
+            ],
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    database.DB_PATH = path
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    os.replace(tmp_path, path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a seeded benchmark database")
+    parser.add_argument("--path", default="/tmp/mediamanager-bench.db")
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--backlog", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--catalog-size", type=int, default=StubConfig.catalog_size)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed(args.path, args.requests, args.backlog, args.users, args.catalog_size, args.seed)
+    print(
+        f"Seeded {args.requests} requests, {args.backlog} backlog items, {args.users} users "
+        f"into {args.path} in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
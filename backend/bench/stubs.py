@@ -0,0 +1,361 @@
+"""Stub Jellyfin, TMDB and Open Library servers for benchmarks and load tests.
+
+One app serves all three APIs on distinct paths, so the backend can point
+``JELLYFIN_URL``, ``TMDB_BASE_URL`` and ``OPENLIBRARY_BASE_URL`` at the same
+port. Every response is delayed by ``latency_ms`` (with +/-50% jitter) and a
+fraction ``error_rate`` of calls fails with a 503.
+
+The fake library and catalogue are derived from ``tmdb_id``: every title is
+named ``Title <tmdb_id>``, and ids divisible by ``in_library_every`` are in the
+Jellyfin library. ``bench.seed`` uses the same scheme, so seeded requests can
+be auto-fulfilled. Like a real library, some items lack a TMDB provider id:
+every tenth only has its IMDb (movies) or TVDB (series) id and every twentieth
+has none, so they can only be matched by external id or by title and year.
+Series have ``1 + tmdb_id % 8`` seasons of ``episodes_in`` episodes each; the
+library holds every episode except, for every fourth series, its last season. Jellyfin item queries honour ``Fields``, ``EnableImages`` and
+``EnableUserData`` the way the real server does, so payload sizes are comparable.
+
+Run standalone (from ``backend/``)::
+
+    python -m bench.stubs --port 8901 --latency-ms 20 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 10.0
+    error_rate: float = 0.0
+    catalog_size: int = 50000
+    in_library_every: int = 3
+    seed: int = 1
+
+
+def title_for(tmdb_id: int) -> str:
+    return f"Title {tmdb_id}"
+
+
+def external_ids(tmdb_id: int) -> dict:
+    return {"imdb_id": f"tt{tmdb_id:07d}", "tvdb_id": tmdb_id + 100000 if tmdb_id % 2 == 0 else None}
+
+
+def season_count(tmdb_id: int) -> int:
+    return 1 + tmdb_id % 8
+
+
+def episodes_in(tmdb_id: int, season: int) -> int:
+    return 4 + (tmdb_id + season) % 5
+
+
+def library_seasons(tmdb_id: int) -> int:
+    """Seasons of a series present in the stub library."""
+    seasons = season_count(tmdb_id)
+    return seasons - 1 if tmdb_id % 4 == 0 and seasons > 1 else seasons
+
+
+def provider_ids(tmdb_id: int) -> dict:
+    ids = external_ids(tmdb_id)
+    if tmdb_id % 20 == 0:
+        return {}
+    if tmdb_id % 10 == 0:
+        return {"Tvdb": str(ids["tvdb_id"])} if ids["tvdb_id"] else {"Imdb": ids["imdb_id"]}
+    provider = {"Tmdb": str(tmdb_id), "Imdb": ids["imdb_id"]}
+    if ids["tvdb_id"]:
+        provider["Tvdb"] = str(ids["tvdb_id"])
+    return provider
+
+
+# Returned only when named in ``Fields``
+OPTIONAL_FIELDS = ("Overview", "Genres", "ProviderIds")
+
+
+def project_item(item: dict, fields: str | None, enable_images: str | None, enable_user_data: str | None) -> dict:
+    requested = set((fields or "").split(","))
+    projected = {k: v for k, v in item.items() if k not in OPTIONAL_FIELDS or k in requested}
+    if enable_images == "false":
+        projected.pop("ImageTags")
+        projected.pop("BackdropImageTags")
+    if enable_user_data == "false":
+        projected.pop("UserData")
+    return projected
+
+
+def build_app(config: StubConfig | None = None) -> FastAPI:
+    config = config or StubConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI()
+    app.state.config = config
+    app.state.calls = {}
+
+    library = [
+        {
+            "Id": f"jf{tmdb_id}",
+            "Name": title_for(tmdb_id),
+            "ProductionYear": 1950 + tmdb_id % 75,
+            "Type": "Movie" if tmdb_id % 2 else "Series",
+            "ProviderIds": provider_ids(tmdb_id),
+            "ServerId": "bench-stub",
+            "IsFolder": tmdb_id % 2 == 0,
+            "CommunityRating": round(5 + tmdb_id % 50 / 10, 1),
+            "Overview": f"{title_for(tmdb_id)} follows a cast of characters through " * 6,
+            "Genres": ["Drama", "Adventure"],
+            "ImageTags": {"Primary": f"{tmdb_id:032x}"},
+            "BackdropImageTags": [f"{tmdb_id * 7:032x}"],
+            "UserData": {"PlaybackPositionTicks": 0, "PlayCount": 0, "IsFavorite": False, "Played": False, "Key": str(tmdb_id)},
+        }
+        for tmdb_id in range(config.in_library_every, config.catalog_size + 1, config.in_library_every)
+    ]
+    by_type = {
+        kind: [item for item in library if item["Type"] == kind] for kind in ("Movie", "Series")
+    }
+    # (series item, season, episode); item dicts are built per page
+    episodes = [
+        (series, season, episode)
+        for series in by_type["Series"]
+        for season in range(1, library_seasons(int(series["Id"][2:])) + 1)
+        for episode in range(1, episodes_in(int(series["Id"][2:]), season) + 1)
+    ]
+
+    def episode_item(series: dict, season: int, episode: int) -> dict:
+        return {
+            "Id": f"{series['Id']}s{season}e{episode}",
+            "Name": f"Episode {episode}",
+            "Type": "Episode",
+            "SeriesId": series["Id"],
+            "SeriesName": series["Name"],
+            "ParentIndexNumber": season,
+            "IndexNumber": episode,
+            "ServerId": "bench-stub",
+            "ImageTags": {"Primary": f"{series['Id']}{season:02d}{episode:02d}"},
+            "BackdropImageTags": [],
+            "UserData": {"PlaybackPositionTicks": 0, "PlayCount": 0, "IsFavorite": False, "Played": False},
+        }
+
+    @app.middleware("http")
+    async def latency_and_errors(request: Request, call_next):
+        group = request.url.path.strip("/").split("/")[0]
+        app.state.calls[group] = app.state.calls.get(group, 0) + 1
+        if config.latency_ms > 0:
+            await asyncio.sleep(config.latency_ms * rng.uniform(0.5, 1.5) / 1000)
+        if rng.random() < config.error_rate:
+            return JSONResponse({"detail": "stub failure"}, status_code=503)
+        return await call_next(request)
+
+    @app.get("/_calls")
+    async def calls():
+        return app.state.calls
+
+    # --- Jellyfin ---
+
+    @app.get("/System/Info/Public")
+    async def system_info():
+        return {"ServerName": "bench-stub", "Version": "10.9.0"}
+
+    @app.get("/System/Info")
+    async def system_info_private():
+        return {"ServerName": "bench-stub", "Version": "10.9.0", "Id": "bench-stub"}
+
+    @app.post("/Users/AuthenticateByName")
+    async def authenticate(request: Request):
+        body = await request.json()
+        username = body.get("Username", "user")
+        return {
+            "AccessToken": f"token-{username}",
+            "User": {
+                "Id": f"uid-{username}",
+                "Name": username,
+                "Policy": {"IsAdministrator": username.startswith("admin")},
+            },
+        }
+
+    @app.get("/Users/{user_id}/Views")
+    async def views(user_id: str):
+        return {"Items": [{"Id": "movies", "Name": "Movies"}, {"Id": "tv", "Name": "Shows"}]}
+
+    @app.get("/Users/{user_id}/Items/Latest")
+    async def latest(
+        user_id: str,
+        Limit: int = 20,
+        Fields: str | None = None,
+        EnableImages: str | None = None,
+        EnableUserData: str | None = None,
+    ):
+        return [project_item(i, Fields, EnableImages, EnableUserData) for i in library[-Limit:]]
+
+    @app.get("/Users/{user_id}/Items")
+    async def items(
+        user_id: str,
+        IncludeItemTypes: str | None = None,
+        SearchTerm: str | None = None,
+        StartIndex: int = 0,
+        Limit: int | None = None,
+        Fields: str | None = None,
+        EnableImages: str | None = None,
+        EnableUserData: str | None = None,
+    ):
+        if IncludeItemTypes == "Episode":
+            end = len(episodes) if Limit is None else StartIndex + Limit
+            return {
+                "Items": [
+                    project_item(episode_item(*e), Fields, EnableImages, EnableUserData)
+                    for e in episodes[StartIndex:end]
+                ],
+                "TotalRecordCount": len(episodes),
+            }
+        pool = library
+        if IncludeItemTypes:
+            pool = [i for kind in IncludeItemTypes.split(",") for i in by_type.get(kind, [])]
+        if SearchTerm:
+            term = SearchTerm.lower()
+            pool = [i for i in pool if i["Name"].lower().startswith(term)]
+        end = len(pool) if Limit is None else StartIndex + Limit
+        return {
+            "Items": [project_item(i, Fields, EnableImages, EnableUserData) for i in pool[StartIndex:end]],
+            "TotalRecordCount": len(pool),
+        }
+
+    # --- TMDB ---
+
+    @app.get("/configuration")
+    async def tmdb_configuration():
+        return {"images": {"base_url": "http://image.tmdb.org/t/p/"}}
+
+    def tmdb_result(tmdb_id: int) -> dict:
+        result = {
+            "id": tmdb_id,
+            "media_type": "movie" if tmdb_id % 2 else "tv",
+            "overview": f"Overview for {title_for(tmdb_id)}",
+            "poster_path": f"/p{tmdb_id}.jpg",
+            "vote_average": round(5 + tmdb_id % 50 / 10, 1),
+        }
+        year = 1950 + tmdb_id % 75
+        if result["media_type"] == "movie":
+            result.update(title=title_for(tmdb_id), release_date=f"{year}-01-01")
+        else:
+            result.update(name=title_for(tmdb_id), first_air_date=f"{year}-01-01")
+        return result
+
+    @app.get("/search/multi")
+    async def search_multi(query: str, page: int = 1):
+        # Deterministic per query so repeated searches hit the same titles
+        start = sum(map(ord, query)) * 97 % config.catalog_size + 1
+        ids = [(start + i * 7) % config.catalog_size + 1 for i in range(20)]
+        return {
+            "page": page,
+            "total_pages": 5,
+            "total_results": 100,
+            "results": [tmdb_result(i) for i in ids],
+        }
+
+    @app.get("/search/movie")
+    async def search_movie(query: str, page: int = 1):
+        data = await search_multi(query, page)
+        data["results"] = [r for r in data["results"] if r["media_type"] == "movie"]
+        return data
+
+    @app.get("/search/tv")
+    async def search_tv(query: str, page: int = 1):
+        data = await search_multi(query, page)
+        data["results"] = [r for r in data["results"] if r["media_type"] == "tv"]
+        return data
+
+    def details(tmdb_id: int) -> dict:
+        if tmdb_id > config.catalog_size:
+            raise HTTPException(status_code=404)
+        data = tmdb_result(tmdb_id)
+        data.update(
+            genres=[{"id": 18, "name": "Drama"}],
+            backdrop_path=f"/b{tmdb_id}.jpg",
+            vote_count=100 + tmdb_id % 900,
+            credits={"cast": [
+                {"name": f"Actor {n}", "character": f"Role {n}", "profile_path": None}
+                for n in range(10)
+            ]},
+        )
+        return data
+
+    @app.get("/movie/{tmdb_id}")
+    async def movie(tmdb_id: int):
+        data = details(tmdb_id)
+        data.update(title=title_for(tmdb_id), runtime=90 + tmdb_id % 60, imdb_id=external_ids(tmdb_id)["imdb_id"])
+        return data
+
+    @app.get("/tv/{tmdb_id}")
+    async def tv(tmdb_id: int):
+        data = details(tmdb_id)
+        seasons = [
+            {"season_number": n, "name": f"Season {n}", "episode_count": episodes_in(tmdb_id, n)}
+            for n in range(1, season_count(tmdb_id) + 1)
+        ]
+        data.update(
+            name=title_for(tmdb_id),
+            number_of_seasons=len(seasons),
+            number_of_episodes=sum(s["episode_count"] for s in seasons),
+            seasons=seasons,
+            last_episode_to_air={"season_number": len(seasons), "episode_number": seasons[-1]["episode_count"]},
+            external_ids=external_ids(tmdb_id),
+        )
+        return data
+
+    # --- Open Library ---
+
+    @app.get("/search.json")
+    async def openlibrary_search(q: str, page: int = 1, limit: int = 20):
+        start = sum(map(ord, q)) * 31 % 100000
+        return {
+            "numFound": 200,
+            "docs": [
+                {
+                    "key": f"/works/OL{start + n}W",
+                    "title": f"Book {start + n}",
+                    "author_name": [f"Author {(start + n) % 500}"],
+                    "author_key": [f"OL{(start + n) % 500}A"],
+                    "first_publish_year": 1900 + n,
+                    "cover_i": start + n,
+                    "edition_count": 1 + n,
+                }
+                for n in range(limit)
+            ],
+        }
+
+    @app.get("/works/{work_key}.json")
+    async def openlibrary_work(work_key: str):
+        work_id = int(work_key.removeprefix("OL").removesuffix("W"))
+        return {
+            "title": f"Book {work_id}",
+            "description": "A stub book.",
+            "covers": [work_id],
+            "subjects": ["Fiction"],
+            "authors": [{"author": {"key": f"/authors/OL{work_id % 500}A"}}],
+        }
+
+    @app.get("/authors/{author_key}.json")
+    async def openlibrary_author(author_key: str):
+        return {"name": f"Author {author_key}"}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub Jellyfin/TMDB/Open Library server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms)
+    parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate)
+    parser.add_argument("--catalog-size", type=int, default=StubConfig.catalog_size)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, args.error_rate, args.catalog_size)
+    uvicorn.run(build_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import asyncio
+
+import pytest
+
+from app.services.bulk_import import ImportEntry, UnresolvableEntry, _pick_match, resolve
+
+RESULTS = [
+    {"id": 1, "media_type": "movie", "title": "???", "release_date": "2001-01-01"},
+    {"id": 2, "media_type": "movie", "title": "千と千尋の神隠し", "release_date": "2001-07-20"},
+]
+
+
+def test_pick_match_compares_non_latin_titles():
+    assert _pick_match(RESULTS, ImportEntry(1, "千と千尋の神隠し", 2001))["id"] == 2
+
+
+def test_empty_normalized_title_never_matches():
+    assert _pick_match(RESULTS, ImportEntry(1, "...", 2001)) is None
+    with pytest.raises(UnresolvableEntry):
+        asyncio.run(resolve(ImportEntry(1, "!!!")))
@@ -0,0 +1,41 @@
+import asyncio
+import sqlite3
+
+import httpx
+
+from app.config import settings
+from app.services import jellyfin_credentials
+from app.services.jellyfin_credentials import CredentialManager
+
+
+def _rejected() -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://jellyfin/System/Info")
+    return httpx.HTTPStatusError("401", request=request, response=httpx.Response(401, request=request))
+
+
+def test_rejected_api_key_recovers_after_check_interval(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE user_roles (user_id TEXT, username TEXT, role TEXT, jellyfin_token TEXT, updated_at TEXT)")
+    monkeypatch.setattr(settings, "jellyfin_api_key", "key")
+    monkeypatch.setattr(settings, "jellyfin_service_user_id", "svc")
+    responses = [_rejected(), None]
+
+    async def validate_token(token):
+        outcome = responses.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    monkeypatch.setattr(jellyfin_credentials.jellyfin_client, "validate_token", validate_token)
+    now = [1000.0]
+    monkeypatch.setattr(jellyfin_credentials.time, "monotonic", lambda: now[0])
+    manager = CredentialManager(check_interval=60)
+
+    assert asyncio.run(manager.acquire(conn)) is None
+    now[0] += 30
+    assert asyncio.run(manager.acquire(conn)) is None  # still within the interval, not re-checked
+    assert responses == [None]
+    now[0] += 60
+    credential = asyncio.run(manager.acquire(conn))
+    assert credential is not None and credential.source == "api_key"
+    assert manager.stats()["tokens"][0]["status"] == "valid"
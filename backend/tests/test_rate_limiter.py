@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from app.services.rate_limiter import PRIORITY_BACKGROUND, TokenBucketLimiter
+
+
+def test_cancelled_waiter_returns_its_token():
+    async def scenario():
+        limiter = TokenBucketLimiter("test", rate=0.001, burst=1)
+        await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        assert limiter.queue_depth() == 2
+
+        # A token is handed to the first waiter, which is cancelled before it resumes
+        limiter.tokens = 1.0
+        limiter._dispatch()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, timeout=1)
+        assert limiter.acquired == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,31 @@
+from app.services.suggest_index import SuggestIndex, normalize_title
+
+
+def test_normalize_title_keeps_non_latin_scripts():
+    assert normalize_title("千と千尋の神隠し") == "千と千尋の神隠し"
+    assert normalize_title("Брат 2") == "брат 2"
+    assert normalize_title("Amélie: Le Fabuleux_Destin") == "amelie le fabuleux destin"
+
+
+def test_non_latin_titles_get_their_own_keys():
+    index = SuggestIndex()
+    index.add(129, "movie", "千と千尋の神隠し", 2001)
+    index.add(20992, "movie", "Брат", 1997)
+
+    assert [r["tmdb_id"] for r in index.search("千と")] == [129]
+    assert [r["tmdb_id"] for r in index.search("бра")] == [20992]
+    assert index.search("!!") == []
+
+
+def test_full_index_evicts_least_recently_seen():
+    index = SuggestIndex(max_entries=2)
+    index.add(1, "movie", "The Matrix")
+    index.add(2, "movie", "Heat")
+    index.add(1, "movie", "The Matrix")  # seen again: Heat is now the oldest
+    index.add(3, "movie", "Alien")
+
+    assert len(index) == 2
+    assert index.search("heat") == []
+    assert [r["tmdb_id"] for r in index.search("matrix")] == [1]
+    assert [r["tmdb_id"] for r in index.search("alien")] == [3]
+    assert len(index._keys) == 3  # "the matrix", "matrix", "alien"
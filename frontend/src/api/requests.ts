@@ -1,3 +1,4 @@
+import axios from 'axios'
 import client from './client'
 
 export interface CreateRequestBody {
@@ -7,8 +8,31 @@ export interface CreateRequestBody {
   poster_path?: string | null
 }
 
-export async function createRequest(body: CreateRequestBody) {
-  const { data } = await client.post('/requests', body)
+// One key per request intent: retries and double submits with the same key
+// return the request the first attempt created
+export function newIdempotencyKey() {
+  if (typeof crypto !== 'undefined' && 'randomUUID' in crypto) return crypto.randomUUID()
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
+}
+
+// Retry only when the request may not have reached the server
+export function retryUnanswered(failureCount: number, error: unknown) {
+  return failureCount < 2 && axios.isAxiosError(error) && !error.response
+}
+
+export async function createRequest(body: CreateRequestBody, idempotencyKey?: string) {
+  const headers = idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined
+  const { data } = await client.post('/requests', body, { headers })
+  return data
+}
+
+export async function startImport(format: 'csv' | 'json', content: string) {
+  const { data } = await client.post('/requests/import', { format, content })
+  return data
+}
+
+export async function getImport(jobId: string) {
+  const { data } = await client.get(`/requests/import/${jobId}`)
   return data
 }
 
@@ -36,13 +60,25 @@ export async function updateRequest(id: number, status: string, admin_note?: str
   return data
 }
 
+export async function getTitleQueue(page = 1, limit = 50, status = 'open') {
+  const { data } = await client.get('/admin/titles', { params: { page, limit, status } })
+  return data
+}
+
+export async function updateTitle(id: number, status: string, admin_note?: string) {
+  const { data } = await client.patch(`/admin/titles/${id}`, { status, admin_note })
+  return data
+}
+
 export async function getAdminStats() {
   const { data } = await client.get('/admin/stats')
   return data
 }
 
-export async function getUsers() {
-  const { data } = await client.get('/admin/users')
+export async function getUsers(page = 1, limit = 50, search?: string, sort = 'username') {
+  const params: Record<string, string | number> = { page, limit, sort }
+  if (search) params.search = search
+  const { data } = await client.get('/admin/users', { params })
   return data
 }
 
@@ -51,8 +87,8 @@ export async function updateUserRole(userId: string, role: string) {
   return data
 }
 
-export async function getHealthCheck() {
-  const { data } = await client.get('/admin/health')
+export async function getHealthCheck(refresh = false) {
+  const { data } = await client.get('/admin/health', { params: refresh ? { refresh: true } : {} })
   return data
 }
 
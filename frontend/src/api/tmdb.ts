@@ -16,3 +16,16 @@ export async function getTvDetails(tmdbId: number) {
   const { data } = await client.get(`/tmdb/tv/${tmdbId}`)
   return data
 }
+
+export interface Suggestion {
+  tmdb_id: number
+  media_type: 'movie' | 'tv'
+  title: string
+  year: number | null
+  poster_path: string | null
+}
+
+export async function suggestMedia(query: string, signal?: AbortSignal): Promise<Suggestion[]> {
+  const { data } = await client.get('/tmdb/suggest', { params: { query }, signal })
+  return data
+}
@@ -0,0 +1,130 @@
+import { useEffect, useState } from 'react'
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
+import { startImport, getImport } from '../api/requests'
+
+const OUTCOME_LABELS: Record<string, string> = {
+  created: 'requested',
+  already_requested: 'already requested',
+  in_library: 'in library',
+  duplicate: 'duplicates',
+  not_found: 'not found',
+  error: 'failed',
+}
+
+export default function ImportPanel({ onClose }: { onClose: () => void }) {
+  const [format, setFormat] = useState<'csv' | 'json'>('csv')
+  const [content, setContent] = useState('')
+  const [jobId, setJobId] = useState<string | null>(null)
+  const queryClient = useQueryClient()
+
+  const startMutation = useMutation({
+    mutationFn: () => startImport(format, content),
+    onSuccess: (job) => setJobId(job.id),
+  })
+
+  const { data: job } = useQuery({
+    queryKey: ['import', jobId],
+    queryFn: () => getImport(jobId!),
+    enabled: !!jobId,
+    refetchInterval: (query) => {
+      const status = query.state.data?.status
+      return status === 'done' || status === 'failed' ? false : 500
+    },
+  })
+
+  const finished = job?.status === 'done' || job?.status === 'failed'
+  useEffect(() => {
+    if (job?.status === 'done') queryClient.invalidateQueries({ queryKey: ['myRequests'] })
+  }, [job?.status, queryClient])
+
+  const readFile = (file: File) => {
+    setFormat(file.name.toLowerCase().endsWith('.json') ? 'json' : 'csv')
+    file.text().then(setContent)
+  }
+
+  return (
+    <div className="bg-slate-800 rounded-lg p-4 mb-6 space-y-3">
+      <div className="flex items-center justify-between">
+        <h3 className="text-white font-medium">Import a list</h3>
+        <button onClick={onClose} className="text-slate-400 hover:text-white text-sm">Close</button>
+      </div>
+
+      {!jobId && (
+        <>
+          <p className="text-xs text-slate-400">
+            CSV with a <code>title</code> column (optional <code>year</code>, <code>type</code>, <code>tmdb_id</code>),
+            one title per line, or a JSON list of titles or objects.
+          </p>
+          <div className="flex flex-wrap gap-2 items-center">
+            <select
+              value={format}
+              onChange={(e) => setFormat(e.target.value as 'csv' | 'json')}
+              className="bg-slate-700 text-white text-sm rounded px-2 py-1.5"
+            >
+              <option value="csv">CSV</option>
+              <option value="json">JSON</option>
+            </select>
+            <input
+              type="file"
+              accept=".csv,.json,.txt"
+              onChange={(e) => e.target.files?.[0] && readFile(e.target.files[0])}
+              className="text-sm text-slate-300"
+            />
+          </div>
+          <textarea
+            value={content}
+            onChange={(e) => setContent(e.target.value)}
+            rows={6}
+            placeholder={'title,year\nThe Matrix,1999\nSeverance,2022'}
+            className="w-full bg-slate-900 text-white text-sm rounded p-2 font-mono"
+          />
+          {startMutation.isError && (
+            <p className="text-red-400 text-sm">
+              {(startMutation.error as any)?.response?.data?.detail || 'Import failed to start'}
+            </p>
+          )}
+          <button
+            onClick={() => startMutation.mutate()}
+            disabled={!content.trim() || startMutation.isPending}
+            className="bg-blue-600 hover:bg-blue-700 disabled:opacity-50 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
+          >
+            Import
+          </button>
+        </>
+      )}
+
+      {job && (
+        <div className="space-y-2">
+          <div className="w-full bg-slate-700 rounded h-2 overflow-hidden">
+            <div
+              className="bg-blue-500 h-2 transition-all"
+              style={{ width: `${job.total ? (100 * job.resolved) / job.total : 0}%` }}
+            />
+          </div>
+          <p className="text-sm text-slate-300">
+            {finished ? (job.status === 'failed' ? `Import failed: ${job.error}` : 'Import finished') : 'Importing'}
+            {' '}&middot; {job.resolved}/{job.total} titles looked up
+          </p>
+          {finished && (
+            <p className="text-sm text-slate-400">
+              {Object.entries(job.counts as Record<string, number>)
+                .map(([status, count]) => `${count} ${OUTCOME_LABELS[status] || status}`)
+                .join(', ')}
+            </p>
+          )}
+          {finished && job.items.some((i: any) => i.status === 'not_found' || i.status === 'error') && (
+            <ul className="text-xs text-slate-400 max-h-40 overflow-y-auto">
+              {job.items
+                .filter((i: any) => i.status === 'not_found' || i.status === 'error')
+                .map((i: any) => (
+                  <li key={i.line}>
+                    Line {i.line}: {i.input || '(no title)'} &mdash; {i.detail || OUTCOME_LABELS[i.status]}
+                  </li>
+                ))}
+            </ul>
+          )}
+        </div>
+      )}
+    </div>
+  )
+}
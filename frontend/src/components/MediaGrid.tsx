@@ -8,7 +8,7 @@ interface MediaItem {
   release_date?: string | null
   vote_average?: number | null
   existing_request?: string | null
-  already_in_library?: boolean
+  already_in_library?: boolean | null
 }
 
 interface Props {
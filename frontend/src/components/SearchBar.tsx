@@ -1,17 +1,47 @@
+import { useState } from 'react'
+import { Link } from 'react-router-dom'
+import type { Suggestion } from '../api/tmdb'
+
 interface Props {
   value: string
   onChange: (value: string) => void
   placeholder?: string
+  suggestions?: Suggestion[]
 }
 
-export default function SearchBar({ value, onChange, placeholder = 'Search movies, TV shows, and books...' }: Props) {
+export default function SearchBar({ value, onChange, placeholder = 'Search movies, TV shows, and books...', suggestions }: Props) {
+  const [focused, setFocused] = useState(false)
+  const showSuggestions = focused && value.length >= 2 && suggestions && suggestions.length > 0
+
   return (
-    <input
-      type="text"
-      value={value}
-      onChange={(e) => onChange(e.target.value)}
-      placeholder={placeholder}
-      className="w-full px-4 py-3 bg-slate-800 border border-slate-600 rounded-lg text-white placeholder-slate-400 focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-transparent"
-    />
+    <div className="relative">
+      <input
+        type="text"
+        value={value}
+        onChange={(e) => onChange(e.target.value)}
+        onFocus={() => setFocused(true)}
+        onBlur={() => setTimeout(() => setFocused(false), 150)}
+        placeholder={placeholder}
+        className="w-full px-4 py-3 bg-slate-800 border border-slate-600 rounded-lg text-white placeholder-slate-400 focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+      />
+      {showSuggestions && suggestions && (
+        <ul className="absolute z-10 mt-1 w-full bg-slate-800 border border-slate-600 rounded-lg shadow-lg overflow-hidden">
+          {suggestions.map((s) => (
+            <li key={`${s.media_type}-${s.tmdb_id}`}>
+              <Link
+                to={`/${s.media_type}/${s.tmdb_id}`}
+                className="flex items-center justify-between px-4 py-2 text-sm text-white hover:bg-slate-700"
+              >
+                <span className="truncate">
+                  {s.title}
+                  {s.year && <span className="text-slate-400"> ({s.year})</span>}
+                </span>
+                <span className="text-xs text-slate-500 uppercase ml-2">{s.media_type}</span>
+              </Link>
+            </li>
+          ))}
+        </ul>
+      )}
+    </div>
   )
 }
@@ -1,9 +1,10 @@
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { getAllRequests, updateRequest, getAdminStats, getUsers, updateUserRole, getHealthCheck, triggerJellyfinScan } from '../api/requests'
+import { getAllRequests, updateRequest, getTitleQueue, updateTitle, getAdminStats, getUsers, updateUserRole, getHealthCheck, triggerJellyfinScan } from '../api/requests'
 import { getAllBacklog, updateBacklogItem, deleteBacklogItem, getBacklogStats } from '../api/backlog'
 import { getTunnelStatus, startTunnel, stopTunnel } from '../api/tunnel'
 import { useAuth } from '../context/AuthContext'
+import { useDebounce } from '../hooks/useDebounce'
 import RequestBadge from '../components/RequestBadge'
 import StatsCard from '../components/StatsCard'
 
@@ -77,7 +78,7 @@ type Tab = 'requests' | 'backlog' | 'users' | 'tunnel' | 'health'
 
 export default function AdminPage() {
   const [tab, setTab] = useState<Tab>('requests')
-  const [view, setView] = useState<'board' | 'table'>('board')
+  const [view, setView] = useState<'board' | 'table' | 'demand'>('board')
   const [noteModal, setNoteModal] = useState<{ id: number; status: string } | null>(null)
   const [noteText, setNoteText] = useState('')
   const queryClient = useQueryClient()
@@ -91,14 +92,28 @@ export default function AdminPage() {
   const { data, isLoading } = useQuery({
     queryKey: ['adminRequests', ''],
     queryFn: () => getAllRequests(1, 500),
-    enabled: tab === 'requests',
+    enabled: tab === 'requests' && view !== 'demand',
   })
 
-  const { data: users, isLoading: usersLoading } = useQuery({
-    queryKey: ['adminUsers'],
-    queryFn: getUsers,
+  const { data: titleData, isLoading: titlesLoading } = useQuery({
+    queryKey: ['adminTitles'],
+    queryFn: () => getTitleQueue(1, 100),
+    enabled: tab === 'requests' && view === 'demand',
+  })
+  const titles: any[] = titleData?.items || []
+
+  const [userSearch, setUserSearch] = useState('')
+  const [userSort, setUserSort] = useState('username')
+  const [userPage, setUserPage] = useState(1)
+  const debouncedUserSearch = useDebounce(userSearch, 300)
+
+  const { data: usersData, isLoading: usersLoading } = useQuery({
+    queryKey: ['adminUsers', debouncedUserSearch, userSort, userPage],
+    queryFn: () => getUsers(userPage, 50, debouncedUserSearch, userSort),
     enabled: tab === 'users',
+    placeholderData: (previous) => previous,
   })
+  const users: any[] | undefined = usersData?.items
 
   const { data: blStats } = useQuery({
     queryKey: ['backlogStats'],
@@ -151,6 +166,16 @@ export default function AdminPage() {
     mutationFn: ({ id, status, note }: { id: number; status: string; note?: string }) =>
       updateRequest(id, status, note),
     onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['adminRequests'] })
+      queryClient.invalidateQueries({ queryKey: ['adminTitles'] })
+      queryClient.invalidateQueries({ queryKey: ['adminStats'] })
+    },
+  })
+
+  const titleMutation = useMutation({
+    mutationFn: ({ id, status }: { id: number; status: string }) => updateTitle(id, status),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['adminTitles'] })
       queryClient.invalidateQueries({ queryKey: ['adminRequests'] })
       queryClient.invalidateQueries({ queryKey: ['adminStats'] })
     },
@@ -181,9 +206,9 @@ export default function AdminPage() {
     onSuccess: () => queryClient.invalidateQueries({ queryKey: ['tunnelStatus'] }),
   })
 
-  const { data: healthData, isLoading: healthLoading, refetch: refetchHealth } = useQuery({
+  const { data: healthData, isLoading: healthLoading } = useQuery({
     queryKey: ['healthCheck'],
-    queryFn: getHealthCheck,
+    queryFn: () => getHealthCheck(),
     enabled: tab === 'health',
     refetchInterval: tab === 'health' ? 30000 : false,
   })
@@ -234,6 +259,14 @@ export default function AdminPage() {
               >
                 Table
               </button>
+              <button
+                onClick={() => setView('demand')}
+                className={`px-3 py-1.5 rounded text-sm transition-colors ${
+                  view === 'demand' ? 'bg-blue-600 text-white' : 'bg-slate-800 text-slate-300 hover:bg-slate-700'
+                }`}
+              >
+                Demand
+              </button>
             </>
           )}
         </div>
@@ -306,7 +339,7 @@ export default function AdminPage() {
             </div>
           )}
 
-          {isLoading && <p className="text-slate-400">Loading...</p>}
+          {(view === 'demand' ? titlesLoading : isLoading) && <p className="text-slate-400">Loading...</p>}
 
           {/* Board View */}
           {!isLoading && view === 'board' && (
@@ -423,6 +456,66 @@ export default function AdminPage() {
         </>
       )}
 
+      {/* Demand View: open requests grouped by title, most requested first */}
+      {tab === 'requests' && !titlesLoading && view === 'demand' && (
+        <div className="bg-slate-800 rounded-lg overflow-hidden overflow-x-auto">
+          <table className="w-full min-w-[700px]">
+            <thead>
+              <tr className="border-b border-slate-700">
+                <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Title</th>
+                <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Type</th>
+                <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Votes</th>
+                <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Status</th>
+                <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">First Requested</th>
+                <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Apply to all</th>
+              </tr>
+            </thead>
+            <tbody>
+              {titles.length === 0 && (
+                <tr>
+                  <td colSpan={6} className="text-slate-500 text-sm text-center py-8">No open requests</td>
+                </tr>
+              )}
+              {titles.map((t: any) => {
+                const transitions = TRANSITIONS[t.status] || []
+                return (
+                  <tr key={t.id} className="border-b border-slate-700/50 hover:bg-slate-700/30">
+                    <td className="px-4 py-3 text-white text-sm">{t.title}</td>
+                    <td className="px-4 py-3 text-slate-400 text-sm uppercase">{t.media_type}</td>
+                    <td className="px-4 py-3 text-sm">
+                      <span className="text-white font-medium">{t.vote_count}</span>
+                      <span className="ml-2 text-xs text-slate-400">
+                        {t.pending} pending · {t.approved} approved
+                      </span>
+                    </td>
+                    <td className="px-4 py-3">
+                      <RequestBadge status={t.status} />
+                    </td>
+                    <td className="px-4 py-3 text-slate-400 text-sm">
+                      {t.first_requested_at ? new Date(t.first_requested_at).toLocaleDateString() : '-'}
+                    </td>
+                    <td className="px-4 py-3">
+                      <div className="flex gap-1.5">
+                        {transitions.map((tr) => (
+                          <button
+                            key={tr.status}
+                            onClick={() => titleMutation.mutate({ id: t.id, status: tr.status })}
+                            disabled={titleMutation.isPending}
+                            className={`px-2 py-1 rounded text-xs font-medium transition-colors disabled:opacity-50 ${tr.style}`}
+                          >
+                            {tr.label}
+                          </button>
+                        ))}
+                      </div>
+                    </td>
+                  </tr>
+                )
+              })}
+            </tbody>
+          </table>
+        </div>
+      )}
+
       {/* ========== BACKLOG TAB ========== */}
       {tab === 'backlog' && (
         <>
@@ -546,10 +639,37 @@ export default function AdminPage() {
             Manage user roles. Admins can manage requests and other users. Users who have logged in at least once appear here.
           </p>
 
+          <div className="flex flex-col sm:flex-row gap-3 mb-4">
+            <input
+              type="text"
+              value={userSearch}
+              onChange={(e) => {
+                setUserSearch(e.target.value)
+                setUserPage(1)
+              }}
+              placeholder="Search users..."
+              className="flex-1 bg-slate-800 border border-slate-700 rounded-lg px-3 py-2 text-sm text-white placeholder-slate-500 focus:outline-none focus:border-blue-500"
+            />
+            <select
+              value={userSort}
+              onChange={(e) => {
+                setUserSort(e.target.value)
+                setUserPage(1)
+              }}
+              className="bg-slate-800 border border-slate-700 rounded-lg px-3 py-2 text-sm text-white focus:outline-none focus:border-blue-500"
+            >
+              <option value="username">Sort by name</option>
+              <option value="recent">Most recent request</option>
+              <option value="requests">Most requests</option>
+            </select>
+          </div>
+
           {usersLoading && <p className="text-slate-400">Loading...</p>}
 
           {!usersLoading && users && users.length === 0 && (
-            <p className="text-slate-500 text-center py-12">No users have logged in yet.</p>
+            <p className="text-slate-500 text-center py-12">
+              {debouncedUserSearch ? 'No users match your search.' : 'No users have logged in yet.'}
+            </p>
           )}
 
           {/* Mobile card view */}
@@ -568,6 +688,9 @@ export default function AdminPage() {
                         <p className="text-xs text-slate-400 mt-0.5">
                           Joined {new Date(u.created_at).toLocaleDateString()}
                         </p>
+                        <p className="text-xs text-slate-400 mt-0.5">
+                          {u.total_requests} requests ({u.pending} pending, {u.approved} approved, {u.fulfilled} fulfilled)
+                        </p>
                       </div>
                       <span
                         className={`text-xs px-2 py-1 rounded font-medium ${
@@ -606,8 +729,9 @@ export default function AdminPage() {
                   <tr className="border-b border-slate-700">
                     <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Username</th>
                     <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Role</th>
+                    <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Requests</th>
+                    <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Last Request</th>
                     <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">First Login</th>
-                    <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Last Updated</th>
                     <th className="text-left px-4 py-3 text-sm text-slate-400 font-medium">Actions</th>
                   </tr>
                 </thead>
@@ -634,10 +758,16 @@ export default function AdminPage() {
                           </span>
                         </td>
                         <td className="px-4 py-3 text-slate-400 text-sm">
-                          {new Date(u.created_at).toLocaleDateString()}
+                          <span className="text-white">{u.total_requests}</span>
+                          <span className="ml-2 text-xs">
+                            {u.pending} pending · {u.approved} approved · {u.fulfilled} fulfilled
+                          </span>
+                        </td>
+                        <td className="px-4 py-3 text-slate-400 text-sm">
+                          {u.last_request_at ? new Date(u.last_request_at).toLocaleDateString() : '-'}
                         </td>
                         <td className="px-4 py-3 text-slate-400 text-sm">
-                          {new Date(u.updated_at).toLocaleDateString()}
+                          {new Date(u.created_at).toLocaleDateString()}
                         </td>
                         <td className="px-4 py-3">
                           {isSelf ? (
@@ -668,6 +798,30 @@ export default function AdminPage() {
             </div>
           )}
 
+          {usersData && usersData.total_pages > 1 && (
+            <div className="flex items-center justify-between mt-4 text-sm text-slate-400">
+              <span>
+                {usersData.total} users · page {usersData.page} of {usersData.total_pages}
+              </span>
+              <div className="flex gap-2">
+                <button
+                  onClick={() => setUserPage((p) => Math.max(1, p - 1))}
+                  disabled={userPage <= 1}
+                  className="px-3 py-1 rounded bg-slate-700 hover:bg-slate-600 disabled:opacity-50 text-white"
+                >
+                  Previous
+                </button>
+                <button
+                  onClick={() => setUserPage((p) => p + 1)}
+                  disabled={userPage >= usersData.total_pages}
+                  className="px-3 py-1 rounded bg-slate-700 hover:bg-slate-600 disabled:opacity-50 text-white"
+                >
+                  Next
+                </button>
+              </div>
+            </div>
+          )}
+
           {roleMutation.isError && (
             <p className="text-red-400 text-sm mt-4">
               {(roleMutation.error as any)?.response?.data?.detail || 'Failed to update role'}
@@ -682,7 +836,9 @@ export default function AdminPage() {
           <div className="flex items-center justify-between">
             <p className="text-slate-400 text-sm">Service connectivity status. Auto-refreshes every 30s.</p>
             <button
-              onClick={() => refetchHealth()}
+              onClick={async () => {
+                queryClient.setQueryData(['healthCheck'], await getHealthCheck(true))
+              }}
               className="text-sm text-blue-400 hover:text-blue-300 transition-colors"
             >
               Refresh
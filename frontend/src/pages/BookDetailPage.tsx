@@ -1,7 +1,8 @@
+import { useMemo } from 'react'
 import { useParams } from 'react-router-dom'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { getBookDetails } from '../api/books'
-import { createRequest } from '../api/requests'
+import { createRequest, newIdempotencyKey, retryUnanswered } from '../api/requests'
 import RequestBadge from '../components/RequestBadge'
 import Spinner from '../components/Spinner'
 
@@ -15,6 +16,8 @@ export default function BookDetailPage() {
     queryFn: () => getBookDetails(id),
   })
 
+  const idempotencyKey = useMemo(() => newIdempotencyKey(), [id])
+
   const requestMutation = useMutation({
     mutationFn: () =>
       createRequest({
@@ -22,7 +25,9 @@ export default function BookDetailPage() {
         media_type: 'book',
         title: data?.title || '',
         poster_path: data?.cover_url,
-      }),
+      }, idempotencyKey),
+    // Safe to retry: the key makes a repeated submit return the first request
+    retry: retryUnanswered,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['book', id] })
     },
@@ -1,12 +1,20 @@
+import { useMemo } from 'react'
 import { useParams } from 'react-router-dom'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { getMovieDetails, getTvDetails } from '../api/tmdb'
-import { createRequest } from '../api/requests'
+import { createRequest, newIdempotencyKey, retryUnanswered } from '../api/requests'
 import RequestBadge from '../components/RequestBadge'
 import Spinner from '../components/Spinner'
 
 const TMDB_IMG = 'https://image.tmdb.org/t/p'
 
+const SEASON_STATUS: Record<string, { label: string; className: string }> = {
+  available: { label: 'In Library', className: 'text-green-400' },
+  partial: { label: 'Partial', className: 'text-yellow-400' },
+  missing: { label: 'Missing', className: 'text-slate-400' },
+  unaired: { label: 'Not Aired', className: 'text-slate-500' },
+}
+
 interface Props {
   mediaType: 'movie' | 'tv'
 }
@@ -21,6 +29,8 @@ export default function MediaDetailPage({ mediaType }: Props) {
     queryFn: () => (mediaType === 'movie' ? getMovieDetails(id) : getTvDetails(id)),
   })
 
+  const idempotencyKey = useMemo(() => newIdempotencyKey(), [mediaType, id])
+
   const requestMutation = useMutation({
     mutationFn: () =>
       createRequest({
@@ -28,7 +38,9 @@ export default function MediaDetailPage({ mediaType }: Props) {
         media_type: mediaType,
         title: data?.title || '',
         poster_path: data?.poster_path,
-      }),
+      }, idempotencyKey),
+    // Safe to retry: the key makes a repeated submit return the first request
+    retry: retryUnanswered,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: [mediaType, id] })
     },
@@ -96,6 +108,11 @@ export default function MediaDetailPage({ mediaType }: Props) {
                 Already in Library
               </span>
             )}
+            {data.library_status === 'partial' && (
+              <span className="bg-yellow-600 text-white px-4 py-2 rounded-lg text-sm font-medium">
+                Partially in Library
+              </span>
+            )}
             {data.existing_request && (
               <div className="flex items-center gap-2">
                 <span className="text-sm text-slate-400">Request status:</span>
@@ -121,6 +138,29 @@ export default function MediaDetailPage({ mediaType }: Props) {
             )}
           </div>
 
+          {/* Seasons */}
+          {data.seasons && data.seasons.length > 0 && (
+            <div className="mt-8">
+              <h3 className="text-lg font-semibold text-white mb-3">Seasons</h3>
+              <div className="divide-y divide-slate-700 bg-slate-800 rounded-lg">
+                {data.seasons.map((season: any) => {
+                  const status = SEASON_STATUS[season.status] ?? SEASON_STATUS.missing
+                  return (
+                    <div key={season.season_number} className="flex items-center justify-between px-4 py-2 text-sm">
+                      <span className="text-white">{season.name || `Season ${season.season_number}`}</span>
+                      <span className="flex items-center gap-3">
+                        <span className="text-slate-400">
+                          {season.available_episodes} / {season.aired_episodes || season.episode_count} episodes
+                        </span>
+                        <span className={`font-medium ${status.className}`}>{status.label}</span>
+                      </span>
+                    </div>
+                  )
+                })}
+              </div>
+            </div>
+          )}
+
           {/* Cast */}
           {data.cast && data.cast.length > 0 && (
             <div className="mt-8">
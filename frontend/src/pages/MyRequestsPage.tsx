@@ -2,10 +2,12 @@ import { useState } from 'react'
 import { Link } from 'react-router-dom'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { getMyRequests, deleteRequest } from '../api/requests'
+import ImportPanel from '../components/ImportPanel'
 import RequestBadge from '../components/RequestBadge'
 
 export default function MyRequestsPage() {
   const [statusFilter, setStatusFilter] = useState<string>('')
+  const [showImport, setShowImport] = useState(false)
   const queryClient = useQueryClient()
 
   const { data, isLoading } = useQuery({
@@ -24,14 +26,24 @@ export default function MyRequestsPage() {
     <div>
       <div className="flex items-center justify-between mb-6">
         <h2 className="text-2xl font-bold text-white">My Requests</h2>
-        <Link
-          to="/search"
-          className="bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
-        >
-          + New Request
-        </Link>
+        <div className="flex gap-2">
+          <button
+            onClick={() => setShowImport(true)}
+            className="bg-slate-700 hover:bg-slate-600 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
+          >
+            Import List
+          </button>
+          <Link
+            to="/search"
+            className="bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded-lg text-sm font-medium transition-colors"
+          >
+            + New Request
+          </Link>
+        </div>
       </div>
 
+      {showImport && <ImportPanel onClose={() => setShowImport(false)} />}
+
       <div className="flex flex-wrap gap-2 mb-6">
         {['', 'pending', 'approved', 'fulfilled', 'denied'].map((s) => (
           <button
@@ -1,6 +1,6 @@
 import { useState } from 'react'
 import { useQuery } from '@tanstack/react-query'
-import { searchMedia } from '../api/tmdb'
+import { searchMedia, suggestMedia } from '../api/tmdb'
 import { searchBooks } from '../api/books'
 import { useDebounce } from '../hooks/useDebounce'
 import SearchBar from '../components/SearchBar'
@@ -33,6 +33,7 @@ export default function SearchPage() {
   const [page, setPage] = useState(1)
   const [filter, setFilter] = useState<FilterValue>('all')
   const debouncedQuery = useDebounce(query, 400)
+  const suggestQuery = useDebounce(query, 120)
 
   const tmdbType = filter === 'movie' || filter === 'tv' ? filter : undefined
 
@@ -42,6 +43,14 @@ export default function SearchPage() {
     enabled: debouncedQuery.length >= 2 && filter !== 'book',
   })
 
+  // Superseded suggest calls are aborted, which lets the server cancel its upstream lookup
+  const { data: suggestions } = useQuery({
+    queryKey: ['suggest', suggestQuery],
+    queryFn: ({ signal }) => suggestMedia(suggestQuery, signal),
+    enabled: suggestQuery.length >= 2 && filter !== 'book',
+    staleTime: 60000,
+  })
+
   const { data: bookData, isLoading: bookLoading } = useQuery({
     queryKey: ['search-books', debouncedQuery, page],
     queryFn: () => searchBooks(debouncedQuery, page),
@@ -75,7 +84,11 @@ export default function SearchPage() {
   return (
     <div>
       <h2 className="text-2xl font-bold text-white mb-6">Search</h2>
-      <SearchBar value={query} onChange={(v) => { setQuery(v); setPage(1) }} />
+      <SearchBar
+        value={query}
+        onChange={(v) => { setQuery(v); setPage(1) }}
+        suggestions={filter !== 'book' ? suggestions : undefined}
+      />
 
       <div className="flex gap-2 mt-4">
         {FILTER_OPTIONS.map((opt) => (